@@ -0,0 +1,30 @@
+"""add image column to places
+
+Revision ID: 0003_add_place_image
+Revises: 0002_add_place_country
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_add_place_image"
+down_revision = "0002_add_place_country"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("places")}
+    if "image" not in columns:
+        op.add_column("places", sa.Column("image", sa.String(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("places")}
+    if "image" in columns:
+        op.drop_column("places", "image")
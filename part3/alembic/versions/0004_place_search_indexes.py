@@ -0,0 +1,39 @@
+"""add indexes used by the place search endpoint
+
+Revision ID: 0004_place_search_indexes
+Revises: 0003_add_place_image
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_place_search_indexes"
+down_revision = "0003_add_place_image"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_places_country_price", "places", ["country", "price_by_night"]),
+    ("ix_places_price_by_night", "places", ["price_by_night"]),
+    ("ix_places_max_guest", "places", ["max_guest"]),
+    ("ix_place_amenity_amenity_id", "place_amenity", ["amenity_id", "place_id"]),
+)
+
+
+def _existing(inspector, table):
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in _existing(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""add (latitude, longitude) index for nearby-place queries
+
+Revision ID: 0005_place_location_index
+Revises: 0004_place_search_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_place_location_index"
+down_revision = "0004_place_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _existing(bind):
+    return {index["name"] for index in sa.inspect(bind).get_indexes("places")}
+
+
+def upgrade():
+    if "ix_places_location" not in _existing(op.get_bind()):
+        op.create_index("ix_places_location", "places", ["latitude", "longitude"])
+
+
+def downgrade():
+    if "ix_places_location" in _existing(op.get_bind()):
+        op.drop_index("ix_places_location", table_name="places")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Load test: the ASGI app against the threaded WSGI server under slow clients.
+
+Starts the same app twice on a temporary SQLite database, each as a single
+process with `--threads` request threads:
+
+- ``wsgi``: `serve.py` (gunicorn ``gthread`` workers);
+- ``asgi``: `create_asgi_app` under uvicorn, with ``ASGI_THREADS``.
+
+Against each server it first opens `--slow-clients` connections that send
+their request headers one line per second and never finish them. Then it
+measures `--requests` ordinary ``GET /api/v1/places?limit=20`` requests,
+`--concurrency` at a time. A thread-per-connection server spends its
+threads on the slow clients, while the event loop only hands complete
+requests to its pool. Requires gunicorn and uvicorn.
+
+Examples:
+
+    python benchmarks/bench_async.py
+    python benchmarks/bench_async.py --slow-clients 2000 --json async.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from hbnb import create_app  # noqa: E402
+from hbnb.persistence.engine import dispose_engines  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(uri: str, places: int) -> None:
+    app = create_app({"SQLALCHEMY_DATABASE_URI": uri})
+    facade = app.extensions["hbnb_facade"]
+    with facade.unit_of_work():
+        facade.create_many(
+            "Place",
+            [{"name": f"Place {i}", "price_by_night": i} for i in range(places)],
+        )
+    dispose_engines()
+
+
+def server_command(kind: str, port: int, threads: int):
+    if kind == "wsgi":
+        return [
+            sys.executable,
+            os.path.join(ROOT, "serve.py"),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            "1",
+            "--threads",
+            str(threads),
+        ]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "--factory",
+        "hbnb:create_asgi_app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+    ]
+
+
+async def wait_ready(port: int, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _ = await fetch(port, "/health", timeout=1)
+            if status == 200:
+                return
+        except (OSError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def fetch(port: int, path: str, timeout: float):
+    async def go():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n".encode()
+        )
+        data = await reader.read()
+        writer.close()
+        return int(data.split(b" ", 2)[1]), len(data)
+
+    return await asyncio.wait_for(go(), timeout)
+
+
+async def slow_client(port: int, stop: asyncio.Event) -> None:
+    """Hold a connection open by sending one header line per second."""
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /api/v1/places HTTP/1.1\r\nHost: bench\r\n")
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), 1)
+            except asyncio.TimeoutError:
+                writer.write(b"X-Slow: 1\r\n")
+                await writer.drain()
+        writer.close()
+    except OSError:
+        pass
+
+
+async def load(port: int, args) -> dict:
+    stop = asyncio.Event()
+    slow = [
+        asyncio.create_task(slow_client(port, stop)) for _ in range(args.slow_clients)
+    ]
+    await asyncio.sleep(2)  # let the slow clients connect
+
+    latencies, errors = [], 0
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                status, _ = await fetch(port, "/api/v1/places?limit=20", args.timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                errors += 1
+                return
+            if status != 200:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await asyncio.gather(*slow)
+
+    latencies.sort()
+
+    def pct(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1)
+
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": pct(0.5),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run_server(kind: str, args, uri: str) -> dict:
+    port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        SQLALCHEMY_DATABASE_URI=uri,
+        SEED_DEMO_DATA="false",
+        PASSWORD_HASH_WORKERS="0",
+        ASGI_THREADS=str(args.threads),
+    )
+    proc = subprocess.Popen(
+        server_command(kind, port, args.threads),
+        env=env,
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_ready(port))
+        return asyncio.run(load(port, args))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slow-clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--places", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--json", dest="json_path", help="Write results to a file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = "sqlite:///" + os.path.join(tmp, "bench.db")
+        seed(uri, args.places)
+        results = {
+            "params": {
+                "slow_clients": args.slow_clients,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "threads": args.threads,
+            },
+            "servers": {kind: run_server(kind, args, uri) for kind in ("wsgi", "asgi")},
+        }
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Benchmark `GET /api/v1/places` serialization on large synthetic datasets.
+
+Compares the batched place serializer used by the API against the previous
+per-place strategy (one owner lookup per place, one lookup per amenity id and
+a full review scan per place). The legacy strategy is quadratic, so it is
+timed on a sample of places and extrapolated to the full page.
+
+Examples:
+
+    python benchmarks/bench_place_serialization.py
+    python benchmarks/bench_place_serialization.py --backend sqlalchemy \\
+        --places 2000 --reviews 20000 --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import event  # noqa: E402
+
+from hbnb import create_app  # noqa: E402
+from hbnb.business.facade import NotFoundError  # noqa: E402
+from hbnb.persistence.sqlalchemy_repository import ObjectStore  # noqa: E402
+
+
+class CountingRepository:
+    """Proxy that counts repository method calls by name."""
+
+    def __init__(self, repo):
+        self._repo = repo
+        self.calls: dict = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return attr(*args, **kwargs)
+
+        return wrapper
+
+    def reset(self):
+        self.calls = {}
+
+
+def _hex(i: int, prefix: str) -> str:
+    return f"{prefix}{i:030x}"
+
+
+def build_dataset(args):
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    users = [
+        {
+            "id": _hex(i, "u"),
+            "email": f"user{i}@example.com",
+            "password": "x",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(args.users)
+    ]
+    amenities = [
+        {"id": _hex(i, "a"), "name": f"Amenity {i}", "created_at": now}
+        for i in range(args.amenities)
+    ]
+    places = []
+    for i in range(args.places):
+        places.append(
+            {
+                "id": _hex(i, "p"),
+                "name": f"Place {i}",
+                "user_id": rng.choice(users)["id"],
+                "amenity_ids": [
+                    a["id"] for a in rng.sample(amenities, min(3, len(amenities)))
+                ],
+                "price_by_night": rng.randint(10, 500),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    reviews = [
+        {
+            "id": _hex(i, "r"),
+            "user_id": rng.choice(users)["id"],
+            "place_id": rng.choice(places)["id"],
+            "text": "Nice stay",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(args.reviews)
+    ]
+    return {"User": users, "Amenity": amenities, "Place": places, "Review": reviews}
+
+
+def load_memory(repo, dataset):
+    # Bypass `create` so the synthetic ids are kept; indexes stay in sync.
+    for cls_name, items in dataset.items():
+        for item in items:
+            repo._insert(cls_name, dict(item))
+
+
+def load_sqlalchemy(repo, dataset):
+    now = datetime.now(timezone.utc)
+    session = repo._ensure_session()
+    try:
+        for cls_name, items in dataset.items():
+            session.execute(
+                ObjectStore.__table__.insert(),
+                [
+                    {
+                        "id": item["id"],
+                        "cls_name": cls_name,
+                        "data": item,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for item in items
+                ],
+            )
+        session.commit()
+    finally:
+        session.close()
+
+
+def legacy_sanitize_place(facade, obj):
+    """The per-place serializer this benchmark measures against."""
+    out = dict(obj)
+    owner_id = out.get("user_id")
+    if owner_id:
+        try:
+            owner = facade.get("User", owner_id)
+            out["owner"] = {"id": owner.get("id"), "email": owner.get("email")}
+        except NotFoundError:
+            out["owner"] = {"id": owner_id}
+    amenities = []
+    for aid in out.get("amenity_ids") or []:
+        try:
+            amenities.append(facade.get("Amenity", aid))
+        except NotFoundError:
+            pass
+    out["amenities"] = amenities
+    out["reviews"] = [
+        r for r in facade.list("Review") if r.get("place_id") == out.get("id")
+    ]
+    return out
+
+
+def run_backend(backend, dataset, args):
+    tmpdir = tempfile.mkdtemp(prefix="hbnb-bench-")
+    if backend == "memory":
+        app = create_app({"USE_IN_MEMORY": True})
+    else:
+        uri = "sqlite:///" + os.path.join(tmpdir, "bench.db")
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri})
+    facade = app.extensions["hbnb_facade"]
+    repo = facade._repo
+
+    t0 = time.perf_counter()
+    if backend == "memory":
+        load_memory(repo, dataset)
+    else:
+        load_sqlalchemy(repo, dataset)
+    load_s = time.perf_counter() - t0
+
+    queries = {"n": 0}
+    engine = getattr(repo, "_engine", None)
+    if engine is not None:
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(*_a, **_kw):
+            queries["n"] += 1
+
+    counting = CountingRepository(repo)
+    facade._repo = counting
+    client = app.test_client()
+
+    batched_ms = []
+    for _ in range(args.repeat):
+        counting.reset()
+        queries["n"] = 0
+        t0 = time.perf_counter()
+        resp = client.get("/api/v1/places")
+        batched_ms.append((time.perf_counter() - t0) * 1000)
+        assert resp.status_code == 200, resp.status_code
+    batched = {
+        "latency_ms_min": round(min(batched_ms), 2),
+        "latency_ms_median": round(sorted(batched_ms)[len(batched_ms) // 2], 2),
+        "repository_calls": dict(counting.calls),
+        "sql_queries": queries["n"] if engine is not None else None,
+        "payload_places": len(resp.get_json()),
+    }
+
+    sample = dataset["Place"][: args.legacy_sample]
+    counting.reset()
+    queries["n"] = 0
+    t0 = time.perf_counter()
+    for place in sample:
+        legacy_sanitize_place(facade, place)
+    legacy_s = time.perf_counter() - t0
+    scale = len(dataset["Place"]) / max(len(sample), 1)
+    legacy = {
+        "sampled_places": len(sample),
+        "latency_ms_extrapolated": round(legacy_s * scale * 1000, 2),
+        "repository_calls_extrapolated": {
+            k: int(v * scale) for k, v in counting.calls.items()
+        },
+        "sql_queries_extrapolated": (
+            int(queries["n"] * scale) if engine is not None else None
+        ),
+    }
+    return {"load_seconds": round(load_s, 2), "batched": batched, "legacy": legacy}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "sqlalchemy", "all"])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--amenities", type=int, default=50)
+    parser.add_argument("--places", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-sample",
+        type=int,
+        default=20,
+        help="Places serialized with the legacy strategy before extrapolating",
+    )
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", help="Write results to a file")
+    args = parser.parse_args(argv)
+
+    backends = ["memory", "sqlalchemy"]
+    if args.backend and args.backend != "all":
+        backends = [args.backend]
+
+    dataset = build_dataset(args)
+    results = {
+        "params": {
+            "users": args.users,
+            "amenities": args.amenities,
+            "places": args.places,
+            "reviews": args.reviews,
+        },
+        "backends": {},
+    }
+    for backend in backends:
+        results["backends"][backend] = run_backend(backend, dataset, args)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark repository reads with frozen records against deep copies.
+
+Loads a synthetic set of places into `InMemoryRepository` and times full
+`list`, `get` and `search_places` reads as the repository now serves them
+(shared read-only records) next to the previous behaviour, which
+deep-copied every object handed out. The `GET /api/v1/places` latency is
+reported as well, for a page of `--page-size` places.
+
+Examples:
+
+    python benchmarks/bench_snapshots.py
+    python benchmarks/bench_snapshots.py --objects 20000 --json snapshots.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from copy import deepcopy
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from hbnb import create_app  # noqa: E402
+from hbnb.persistence.place_search import PlaceSearch  # noqa: E402
+
+
+def build_places(args):
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    amenity_ids = [f"a{i:031x}" for i in range(50)]
+    return [
+        {
+            "id": f"p{i:031x}",
+            "name": f"Place {i}",
+            "description": "A quiet place close to everything.",
+            "user_id": f"u{rng.randrange(1000):031x}",
+            "country": rng.choice(["FR", "US", "JP", "BR"]),
+            "price_by_night": rng.randint(10, 500),
+            "max_guest": rng.randint(1, 8),
+            "latitude": rng.uniform(-60, 60),
+            "longitude": rng.uniform(-180, 180),
+            "amenity_ids": rng.sample(amenity_ids, 3),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(args.objects)
+    ]
+
+
+def timed(fn, repeat):
+    """Return (best milliseconds, result of the last call)."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100_000)
+    parser.add_argument("--gets", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", help="Write results to a file")
+    args = parser.parse_args(argv)
+
+    places = build_places(args)
+    app = create_app({"USE_IN_MEMORY": True})
+    repo = app.extensions["hbnb_facade"]._repo
+    t0 = time.perf_counter()
+    for place in places:
+        repo._insert("Place", place)
+    load_s = time.perf_counter() - t0
+
+    plain = {p["id"]: p for p in places}
+    ids = [p["id"] for p in random.Random(args.seed).sample(places, args.gets)]
+    query = PlaceSearch(country="FR", min_price=100, max_price=300, sort="price")
+    reads = {
+        "list": lambda: repo.list("Place"),
+        "get": lambda: [repo.get("Place", obj_id) for obj_id in ids],
+        "search_places": lambda: repo.search_places(query),
+    }
+    results = {
+        "params": {"objects": args.objects, "gets": args.gets},
+        "load_seconds": round(load_s, 2),
+        "reads": {},
+    }
+    for name, read in reads.items():
+        frozen_ms, rows = timed(read, args.repeat)
+        # the previous repository deep-copied every object it returned
+        copy_ms, _ = timed(
+            lambda: [deepcopy(plain[r["id"]]) for r in read()], args.repeat
+        )
+        results["reads"][name] = {
+            "rows": len(rows),
+            "frozen_ms": frozen_ms,
+            "deepcopy_ms": copy_ms,
+            "speedup": round(copy_ms / frozen_ms, 1) if frozen_ms else None,
+        }
+
+    client = app.test_client()
+    url = f"/api/v1/places?limit={args.page_size}"
+    api_ms, resp = timed(lambda: client.get(url), args.repeat)
+    assert resp.status_code == 200, resp.status_code
+    results["api_list_page_ms"] = api_ms
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the API and the repository backends.
+
+For every backend (``memory``: `InMemoryRepository`, ``objects``:
+`SQLAlchemyRepository`, ``tables``: `CompositeRepository` over the ORM
+repositories) it:
+
+1. generates a synthetic dataset through the facade (`create_many`), with
+   the sizes given by ``--users``, ``--places``, ``--amenities`` and
+   ``--reviews``, from a fixed ``--seed``;
+2. times the repository methods the facade uses;
+3. times every ``/api/v1`` endpoint through the Flask test client;
+4. runs a multi-threaded load generator against a local threaded server.
+
+Each timing records the SQL statements it ran. The results are written as
+JSON. ``--compare`` checks them against an earlier file and exits with
+status 1 when any timing regressed by more than ``--threshold``.
+
+Examples:
+
+    python benchmarks/bench_suite.py --json baseline.json
+    python benchmarks/bench_suite.py --backends objects,tables \\
+        --places 5000 --reviews 50000 --json current.json \\
+        --compare baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from hbnb import create_app  # noqa: E402
+from hbnb.persistence.engine import dispose_engines, on_statement  # noqa: E402
+from hbnb.persistence.geo import bounding_box  # noqa: E402
+from hbnb.persistence.place_search import PlaceSearch  # noqa: E402
+
+BACKENDS = ("memory", "objects", "tables")
+COUNTRIES = ("FR", "US", "JP", "BR", "DE")
+CHUNK = 1000
+
+_statements = [0]
+
+
+def _count_statement(statement):
+    _statements[0] += 1
+
+
+on_statement(_count_statement)
+
+
+# dataset
+
+
+def _chunks(items, size=CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def generate(facade, args) -> dict:
+    """Create the synthetic dataset; return the ids of what was created."""
+    rng = random.Random(args.seed)
+
+    def create(cls_name, payloads):
+        ids = []
+        for chunk in _chunks(payloads):
+            with facade.unit_of_work():
+                ids.extend(o["id"] for o in facade.create_many(cls_name, chunk))
+        return ids
+
+    users = create(
+        "User",
+        [
+            {
+                "first_name": f"User{i}",
+                "last_name": "Bench",
+                "email": f"user{i}@bench.example",
+                "password": "bench-pass",
+            }
+            for i in range(args.users)
+        ],
+    )
+    amenities = create(
+        "Amenity", [{"name": f"Amenity {i}"} for i in range(args.amenities)]
+    )
+    places = create(
+        "Place",
+        [
+            {
+                "name": f"Place {i}",
+                "description": "A quiet place close to everything.",
+                "user_id": rng.choice(users),
+                "country": rng.choice(COUNTRIES),
+                "price_by_night": rng.randint(10, 500),
+                "max_guest": rng.randint(1, 8),
+                "latitude": rng.uniform(40, 50),
+                "longitude": rng.uniform(-5, 10),
+                "amenity_ids": rng.sample(amenities, min(3, len(amenities))),
+            }
+            for i in range(args.places)
+        ],
+    )
+    reviews = create(
+        "Review",
+        [
+            {
+                "text": "Nice stay",
+                "user_id": rng.choice(users),
+                "place_id": rng.choice(places),
+            }
+            for _ in range(args.reviews)
+        ],
+    )
+    return {"User": users, "Amenity": amenities, "Place": places, "Review": reviews}
+
+
+# measurement
+
+
+def _summary(samples_ms, statements, calls) -> dict:
+    samples_ms = sorted(samples_ms)
+    return {
+        "runs": len(samples_ms),
+        "min_ms": round(samples_ms[0], 3),
+        "p50_ms": round(statistics.median(samples_ms), 3),
+        "p95_ms": round(
+            samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))], 3
+        ),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "sql_per_call": round(statements / calls, 2),
+    }
+
+
+def measure(fn, runs: int) -> dict:
+    fn()  # warm up caches and prepared statements
+    samples, statements = [], 0
+    for _ in range(runs):
+        before = _statements[0]
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+        statements += _statements[0] - before
+    return _summary(samples, statements, runs)
+
+
+def repository_benchmarks(facade, ids, args) -> dict:
+    """Time repository methods, each call in its own unit of work (a request)."""
+    repo = facade._repo
+    rng = random.Random(args.seed + 1)
+    place_ids = ids["Place"]
+    sample = rng.sample(place_ids, min(100, len(place_ids)))
+    email = f"user{rng.randrange(args.users)}@bench.example"
+    search = PlaceSearch(country="FR", min_price=100, max_price=300, limit=21)
+    box = bounding_box(45.0, 2.0, 100)
+
+    ops = {
+        "get": lambda: repo.get("Place", rng.choice(place_ids)),
+        "get_many_100": lambda: repo.get_many("Place", sample),
+        "list_page_100": lambda: repo.list("Place", limit=100),
+        "list_amenities": lambda: repo.list("Amenity"),
+        "find_by_email": lambda: repo.find_by("User", email=email),
+        "count_reviews_by_place": lambda: repo.count(
+            "Review", place_id=rng.choice(place_ids)
+        ),
+        "search_places": lambda: repo.search_places(search),
+        "find_in_box": lambda: repo.find_in_box(box),
+    }
+
+    def in_unit_of_work(op):
+        def call():
+            with facade.unit_of_work():
+                op()
+
+        return call
+
+    return {name: measure(in_unit_of_work(op), args.runs) for name, op in ops.items()}
+
+
+def endpoints(ids, rng) -> dict:
+    """Endpoint name -> (method, url factory, json factory, expected status)."""
+
+    def one(cls_name):
+        return lambda: rng.choice(ids[cls_name])
+
+    user, place, review, amenity = (
+        one(c) for c in ("User", "Place", "Review", "Amenity")
+    )
+    return {
+        "GET /users?limit=50": ("GET", lambda: "/api/v1/users?limit=50", None, 200),
+        "GET /users/<id>": ("GET", lambda: f"/api/v1/users/{user()}", None, 200),
+        "GET /amenities": ("GET", lambda: "/api/v1/amenities", None, 200),
+        "GET /amenities/<id>": (
+            "GET",
+            lambda: f"/api/v1/amenities/{amenity()}",
+            None,
+            200,
+        ),
+        "GET /places?limit=20": ("GET", lambda: "/api/v1/places?limit=20", None, 200),
+        "GET /places?limit=100&fields=summary": (
+            "GET",
+            lambda: "/api/v1/places?limit=100&fields=name,price_by_night,review_count",
+            None,
+            200,
+        ),
+        "GET /places/<id>": ("GET", lambda: f"/api/v1/places/{place()}", None, 200),
+        "GET /places/search": (
+            "GET",
+            lambda: "/api/v1/places/search?country=FR&max_price=300&limit=20",
+            None,
+            200,
+        ),
+        "GET /places/nearby": (
+            "GET",
+            lambda: "/api/v1/places/nearby?lat=45&lon=2&radius_km=100&limit=20",
+            None,
+            200,
+        ),
+        "GET /reviews?limit=50": ("GET", lambda: "/api/v1/reviews?limit=50", None, 200),
+        "GET /reviews/<id>": ("GET", lambda: f"/api/v1/reviews/{review()}", None, 200),
+        "POST /amenities": (
+            "POST",
+            lambda: "/api/v1/amenities",
+            lambda: {"name": f"Bench {rng.random()}"},
+            201,
+        ),
+        "PUT /amenities/<id>": (
+            "PUT",
+            lambda: f"/api/v1/amenities/{amenity()}",
+            lambda: {"name": f"Bench {rng.random()}"},
+            200,
+        ),
+        "POST /reviews": (
+            "POST",
+            lambda: "/api/v1/reviews",
+            lambda: {"text": "Bench", "user_id": user(), "place_id": place()},
+            201,
+        ),
+    }
+
+
+def api_benchmarks(app, ids, args) -> dict:
+    client = app.test_client()
+    rng = random.Random(args.seed + 2)
+    results = {}
+    for name, (method, url, body, status) in endpoints(ids, rng).items():
+
+        def call():
+            resp = client.open(url(), method=method, json=body() if body else None)
+            if resp.status_code != status:
+                raise RuntimeError(f"{name}: {resp.status_code} {resp.get_data()!r}")
+
+        results[name] = measure(call, args.runs)
+    return results
+
+
+def load_benchmark(app, ids, args) -> dict:
+    """Hit the GET endpoints from `--load-threads` clients for a while."""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no access log
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    base = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    rng = random.Random(args.seed + 3)
+    gets = [
+        url for method, url, _, _ in endpoints(ids, rng).values() if method == "GET"
+    ]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.load_seconds
+
+    def client(i):
+        local = random.Random(args.seed + 10 + i)
+        mine = []
+        while time.perf_counter() < deadline:
+            url = local.choice(gets)()
+            t0 = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base + url, timeout=30) as resp:
+                    resp.read()
+            except (urllib.error.URLError, OSError):
+                with lock:
+                    errors[0] += 1
+                continue
+            mine.append((time.perf_counter() - t0) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    t0 = time.perf_counter()
+    workers = [
+        threading.Thread(target=client, args=(i,)) for i in range(args.load_threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+
+    latencies.sort()
+    return {
+        "threads": args.load_threads,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+        "p99_ms": (
+            round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3)
+            if latencies
+            else None
+        ),
+    }
+
+
+def run_backend(backend: str, args) -> dict:
+    tmpdir = tempfile.TemporaryDirectory(prefix="hbnb-bench-")
+    config = {
+        "BCRYPT_ROUNDS": 4,
+        "PASSWORD_HASH_WORKERS": 0,
+        "RESPONSE_CACHE_SIZE": args.response_cache,
+    }
+    if backend == "memory":
+        config["USE_IN_MEMORY"] = True
+    else:
+        config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(
+            tmpdir.name, "bench.db"
+        )
+        config["STORAGE_MODE"] = backend
+    try:
+        app = create_app(config)
+        facade = app.extensions["hbnb_facade"]
+        t0 = time.perf_counter()
+        ids = generate(facade, args)
+        result = {"generate_seconds": round(time.perf_counter() - t0, 2)}
+        print(
+            f"[{backend}] dataset ready in {result['generate_seconds']}s",
+            file=sys.stderr,
+        )
+        result["repository"] = repository_benchmarks(facade, ids, args)
+        result["api"] = api_benchmarks(app, ids, args)
+        if args.load_seconds > 0:
+            result["load"] = load_benchmark(app, ids, args)
+        return result
+    finally:
+        dispose_engines()
+        tmpdir.cleanup()
+
+
+# regression check
+
+
+def _timings(results: dict):
+    """Yield (key, value, higher_is_better) for every comparable number."""
+    for backend, sections in results["backends"].items():
+        for section in ("repository", "api"):
+            for name, stats in sections.get(section, {}).items():
+                yield f"{backend}/{section}/{name}", stats["p50_ms"], False
+        if "load" in sections:
+            yield f"{backend}/load/req_per_s", sections["load"]["req_per_s"], True
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Return a description of each timing worse than `threshold` allows."""
+    before = {key: value for key, value, _ in _timings(baseline)}
+    regressions = []
+    for key, value, higher_is_better in _timings(current):
+        old = before.get(key)
+        if not old or value is None:
+            continue
+        change = (old - value) / old if higher_is_better else (value - old) / old
+        if change > threshold:
+            regressions.append(f"{key}: {old} -> {value} ({change:+.0%} worse)")
+    return regressions
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--places", type=int, default=2000)
+    parser.add_argument("--amenities", type=int, default=30)
+    parser.add_argument("--reviews", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=30, help="Timed calls per item")
+    parser.add_argument("--load-seconds", type=float, default=5.0)
+    parser.add_argument("--load-threads", type=int, default=8)
+    parser.add_argument(
+        "--response-cache",
+        type=int,
+        default=0,
+        help="RESPONSE_CACHE_SIZE (default 0: measure full serialization)",
+    )
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_path", help="Write results to a file")
+    parser.add_argument("--compare", help="Baseline results file to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown against --compare (default 0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(sorted(unknown))}")
+
+    results = {
+        "params": {
+            "users": args.users,
+            "places": args.places,
+            "amenities": args.amenities,
+            "reviews": args.reviews,
+            "runs": args.runs,
+            "load_seconds": args.load_seconds,
+            "load_threads": args.load_threads,
+            "response_cache": args.response_cache,
+            "seed": args.seed,
+        },
+        "environment": environment(),
+        "backends": {backend: run_backend(backend, args) for backend in backends},
+    }
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            fh.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """hbnb package initializer."""
 
 from .presentation.app import create_app
+from .presentation.asgi import create_asgi_app
 
-__all__ = ["create_app"]
+__all__ = ["create_app", "create_asgi_app"]
@@ -4,10 +4,17 @@ This facade uses the concrete business models when available to validate
 create/update payloads while keeping repository storage decoupled.
 """
 
-from typing import Any, Dict, List, Optional
-from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from sqlalchemy.exc import IntegrityError
+
+from . import passwords
 from .models import User, Place, Review, Amenity
+from .ownership import OWNER_FIELDS
+from .review_stats import STATS_CLASS, ReviewStats
+from ..persistence.geo import bounding_box, haversine_km
+from ..persistence.place_search import PlaceSearch
+from ..persistence.unit_of_work import unit_of_work as _unit_of_work
 
 
 class NotFoundError(Exception):
@@ -27,8 +34,28 @@ _MODEL_MAP = {
 
 
 class HBNBFacade:
-    def __init__(self, repository):
+    def __init__(self, repository, hasher: Optional[passwords.PasswordHasher] = None):
         self._repo = repository
+        # hashes the passwords of users created or updated through the facade
+        self._hasher = passwords.get_hasher() if hasher is None else hasher
+        self._review_stats = ReviewStats(repository)
+        self._write_listeners: List[Callable[[str, str], None]] = []
+
+    def add_write_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call ``listener(cls_name, obj_id)`` after every create/update/delete."""
+        self._write_listeners.append(listener)
+
+    def _written(self, cls_name: str, obj_id: str) -> None:
+        for listener in self._write_listeners:
+            listener(cls_name, obj_id)
+
+    def unit_of_work(self):
+        """Context manager running several calls in one transaction.
+
+        SQL repositories share one session (and identity map) inside the
+        block and commit once at the end; nested blocks join the outer one.
+        """
+        return _unit_of_work()
 
     def _as_model(self, cls_name: str, data: Optional[dict]) -> Optional[object]:
         if data is None:
@@ -36,7 +63,7 @@ class HBNBFacade:
         model_cls = _MODEL_MAP.get(cls_name)
         if model_cls is None:
             return data
-        return model_cls.from_dict(data)
+        return model_cls.from_record(data)
 
     def _to_dict(self, instance_or_dict: Any) -> Dict[str, Any]:
         if hasattr(instance_or_dict, "to_dict"):
@@ -48,17 +75,26 @@ class HBNBFacade:
             raise ValidationError("payload must be a dict")
         model_cls = _MODEL_MAP.get(cls_name)
         if model_cls:
-            inst = model_cls.from_dict(payload)
-            # Use dataclasses.asdict to include internal fields (for example
-            # hashed password) when preparing storage data. Presentation
-            # layer will sanitize returned objects.
-            try:
-                data = asdict(inst)
-            except Exception:
-                data = inst.to_dict()
+            with passwords.using(self._hasher):
+                inst = model_cls.from_dict(payload)
+            # Store internal fields too (for example the hashed password);
+            # the presentation layer sanitizes returned objects.
+            data = inst.to_storage_dict()
         else:
             data = payload
-        return self._repo.create(cls_name, data)
+        # the review aggregates commit together with the write they count
+        with _unit_of_work():
+            try:
+                obj = self._repo.create(cls_name, data)
+            except (ValueError, IntegrityError) as e:
+                # a unique index or constraint violation, e.g. a taken email
+                raise ValidationError(str(e)) from e
+            if cls_name == "Place":
+                self._review_stats.place_created(obj)
+            elif cls_name == "Review":
+                self._review_stats.review_added(obj)
+        self._written(cls_name, obj.get("id"))
+        return obj
 
     def get(self, cls_name: str, obj_id: str) -> dict:
         obj = self._repo.get(cls_name, obj_id)
@@ -66,37 +102,280 @@ class HBNBFacade:
             raise NotFoundError(f"{cls_name} {obj_id} not found")
         return obj
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
-        return self._repo.list(cls_name)
+    def is_owner(self, cls_name: str, obj_id: str, user_id: Optional[str]) -> bool:
+        """Return whether `user_id` owns the place or review `obj_id`.
+
+        The owner is read from the repository, never from a process-local
+        cache that another worker's ownership change would leave stale.
+        Inside a unit of work the write that follows reuses the loaded row.
+        Raises `NotFoundError` if the object does not exist.
+        """
+        if cls_name not in OWNER_FIELDS:
+            raise ValueError(f"{cls_name} objects have no owner")
+        return self.get(cls_name, obj_id).get(OWNER_FIELDS[cls_name]) == user_id
+
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return all objects, or one keyset page when `limit`/`after` is set."""
+        if limit is None and after is None:
+            return self._repo.list(cls_name)
+        return self._repo.list(cls_name, limit=limit, after=after)
+
+    def list_page(
+        self, cls_name: str, limit: int, after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return up to `limit` objects with id > `after`, plus the next cursor.
+
+        The cursor is the id of the last item returned, or None on the last
+        page. One extra row is fetched to tell whether another page exists.
+        """
+        if limit < 1:
+            raise ValidationError("limit must be a positive integer")
+        items = self.list(cls_name, limit=limit + 1, after=after)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, items[-1].get("id")
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Iterate over every object of `cls_name` in id order.
+
+        SQL repositories fetch `batch_size` rows at a time from a
+        server-side cursor, so memory does not grow with the collection.
+        """
+        return self._repo.stream(cls_name, batch_size)
+
+    def search_places(
+        self, limit: int, **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return up to `limit` places matching `filters` and the next cursor.
+
+        `filters` are the `PlaceSearch` fields (country, min_price,
+        max_price, max_guest, amenity_ids, sort, after).
+        """
+        try:
+            query = PlaceSearch(limit=limit + 1, **filters)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(str(e)) from e
+        items = self._repo.search_places(query)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, query.cursor_for(items[-1])
+
+    def nearby_places(
+        self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return places within `radius_km` of (lat, lon), nearest first.
+
+        The repository returns the candidates inside the enclosing bounding
+        box from its spatial index; the exact haversine distance then drops
+        the box corners. Each place gets a `distance_km` key.
+        """
+        if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+            raise ValidationError("lat must be in [-90, 90] and lon in [-180, 180]")
+        if not radius_km > 0:
+            raise ValidationError("radius_km must be positive")
+        out = []
+        for place in self._repo.find_in_box(bounding_box(lat, lon, radius_km)):
+            distance = haversine_km(lat, lon, place["latitude"], place["longitude"])
+            if distance <= radius_km:
+                # repository records are read-only; annotate a copy
+                out.append(dict(place, distance_km=round(distance, 3)))
+        out.sort(key=lambda p: (p["distance_km"], p.get("id")))
+        return out if limit is None else out[:limit]
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Return the objects for `ids` in a single repository call.
+
+        Unknown ids are skipped rather than raising `NotFoundError`.
+        """
+        return self._repo.get_many(cls_name, ids)
+
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """Return objects whose `field` matches any of `values`."""
+        return self._repo.find_in(cls_name, field, values)
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        """Return objects whose fields equal all of `criteria`.
+
+        Repositories answer this from an index where one exists.
+        """
+        return self._repo.find_by(cls_name, **criteria)
+
+    def review_stats(self, place_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return ``{place id: review aggregates}`` for `place_ids`.
+
+        The aggregate records are kept current by review writes made
+        through the facade (see `review_stats.ReviewStats`); fields are
+        ``review_count``, ``last_review_at``, ``rating_count``,
+        ``rating_sum`` and ``place_id``.
+        """
+        return self._review_stats.for_places(place_ids)
+
+    def rebuild_review_stats(self) -> int:
+        """Recompute the review aggregates of every place from the reviews."""
+        with _unit_of_work():
+            return self._review_stats.rebuild_all()
+
+    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return the stored user (including its password hash) or None.
+
+        Served by the repository's email index: the unique `users.email`
+        column, the `objects` JSON expression index or the in-memory hash
+        index.
+        """
+        if not email:
+            return None
+        matches = self._repo.find_by("User", email=email)
+        return matches[0] if matches else None
 
     def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        return self._repo.list_all()
+        # the review aggregates are internal bookkeeping, not resources
+        out = self._repo.list_all()
+        out.pop(STATS_CLASS, None)
+        return out
 
-    def count(self, cls_name: str) -> int:
-        return self._repo.count(cls_name)
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return how many objects match `criteria`, counted by the backend."""
+        return self._repo.count(cls_name, **criteria)
 
     def update(self, cls_name: str, obj_id: str, updates: dict) -> dict:
         if not isinstance(updates, dict):
             raise ValidationError("updates must be a dict")
         model_cls = _MODEL_MAP.get(cls_name)
-        if model_cls:
-            existing = self._repo.get(cls_name, obj_id)
-            if existing is None:
-                raise NotFoundError(f"{cls_name} {obj_id} not found")
-            inst = model_cls.from_dict(existing)
-            inst.update_from_dict(updates)
+        with _unit_of_work():
+            existing = None
+            if model_cls:
+                existing = self._repo.get(cls_name, obj_id)
+                if existing is None:
+                    raise NotFoundError(f"{cls_name} {obj_id} not found")
+            if model_cls:
+                # the stored password is already a hash: do not hash it again
+                inst = model_cls.from_record(existing)
+                with passwords.using(self._hasher):
+                    inst.update_from_dict(updates)
+                updates = inst.to_storage_dict()
             try:
-                validated = asdict(inst)
-            except Exception:
-                validated = inst.to_dict()
-            obj = self._repo.update(cls_name, obj_id, validated)
-        else:
-            obj = self._repo.update(cls_name, obj_id, updates)
-        if obj is None:
-            raise NotFoundError(f"{cls_name} {obj_id} not found")
+                obj = self._repo.update(cls_name, obj_id, updates)
+            except (ValueError, IntegrityError) as e:
+                raise ValidationError(str(e)) from e
+            if obj is None:
+                raise NotFoundError(f"{cls_name} {obj_id} not found")
+            if cls_name == "Review":
+                self._review_stats.review_changed(existing, obj)
+        self._written(cls_name, obj_id)
         return obj
 
     def delete(self, cls_name: str, obj_id: str) -> None:
-        res = self._repo.delete(cls_name, obj_id)
-        if not res:
-            raise NotFoundError(f"{cls_name} {obj_id} not found")
+        with _unit_of_work():
+            # a deleted review is needed to take it out of the aggregates
+            review = self._repo.get(cls_name, obj_id) if cls_name == "Review" else None
+            res = self._repo.delete(cls_name, obj_id)
+            if not res:
+                raise NotFoundError(f"{cls_name} {obj_id} not found")
+            if cls_name == "Place":
+                self._review_stats.place_deleted(obj_id)
+            elif review is not None:
+                self._review_stats.review_removed(review)
+        self._written(cls_name, obj_id)
+
+    def create_many(self, cls_name: str, payloads: Iterable[dict]) -> List[dict]:
+        """Create several objects in one repository call and transaction.
+
+        Every payload is validated before anything is written, so either
+        all objects are created or a `ValidationError` naming the first
+        bad item is raised and none are. A unique constraint violation
+        (e.g. a taken email) is a `ValidationError` as well.
+        """
+        model_cls = _MODEL_MAP.get(cls_name)
+        data = []
+        for i, payload in enumerate(payloads):
+            if not isinstance(payload, dict):
+                raise ValidationError(f"item {i}: payload must be a dict")
+            if model_cls is None:
+                data.append(payload)
+                continue
+            try:
+                with passwords.using(self._hasher):
+                    data.append(model_cls.from_dict(payload).to_storage_dict())
+            except (TypeError, ValueError) as e:
+                raise ValidationError(f"item {i}: {e}") from e
+        if not data:
+            return []
+        with _unit_of_work():
+            try:
+                objs = self._repo.create_many(cls_name, data)
+            except (ValueError, IntegrityError) as e:
+                raise ValidationError(str(e)) from e
+            if cls_name == "Place":
+                self._review_stats.places_created(objs)
+            elif cls_name == "Review":
+                self._review_stats.reviews_changed(added=objs)
+        for obj in objs:
+            self._written(cls_name, obj.get("id"))
+        return objs
+
+    def update_many(self, cls_name: str, updates: Dict[str, dict]) -> List[dict]:
+        """Apply ``{id: changes}`` in one repository call and transaction.
+
+        Raises `NotFoundError` naming the missing ids, before writing, if
+        any object does not exist.
+        """
+        if not isinstance(updates, dict) or not all(
+            isinstance(u, dict) for u in updates.values()
+        ):
+            raise ValidationError("updates must map ids to dicts")
+        if not updates:
+            return []
+        model_cls = _MODEL_MAP.get(cls_name)
+        with _unit_of_work():
+            existing = {o["id"]: o for o in self._repo.get_many(cls_name, updates)}
+            missing = [obj_id for obj_id in updates if obj_id not in existing]
+            if missing:
+                raise NotFoundError(f"{cls_name} {', '.join(missing)} not found")
+            changes = {}
+            for obj_id, upd in updates.items():
+                if model_cls:
+                    inst = model_cls.from_record(existing[obj_id])
+                    with passwords.using(self._hasher):
+                        inst.update_from_dict(upd)
+                    upd = inst.to_storage_dict()
+                changes[obj_id] = upd
+            try:
+                objs = self._repo.update_many(cls_name, changes)
+            except (ValueError, IntegrityError) as e:
+                raise ValidationError(str(e)) from e
+            if cls_name == "Review":
+                self._review_stats.reviews_changed(
+                    [existing[o["id"]] for o in objs], objs
+                )
+        for obj in objs:
+            self._written(cls_name, obj["id"])
+        return objs
+
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> None:
+        """Delete several objects in one repository call and transaction.
+
+        Raises `NotFoundError` naming the missing ids, before deleting
+        anything, if any object does not exist.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return
+        with _unit_of_work():
+            existing = self._repo.get_many(cls_name, ids)
+            found = {o["id"] for o in existing}
+            missing = [obj_id for obj_id in ids if obj_id not in found]
+            if missing:
+                raise NotFoundError(f"{cls_name} {', '.join(missing)} not found")
+            self._repo.delete_many(cls_name, ids)
+            if cls_name == "Place":
+                self._review_stats.places_deleted(ids)
+            elif cls_name == "Review":
+                self._review_stats.reviews_changed(removed=existing)
+        for obj_id in ids:
+            self._written(cls_name, obj_id)
@@ -8,10 +8,10 @@ from typing import Any, Dict
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Amenity(BaseModel):
     name: str = ""
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Amenity":
-        return super().from_dict(data)
+        return super(Amenity, cls).from_dict(data)
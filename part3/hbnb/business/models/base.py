@@ -1,10 +1,17 @@
-"""Base model for HBNB business entities."""
+"""Base model for HBNB business entities.
+
+Models are slotted dataclasses: instances carry no per-object `__dict__`,
+and `to_dict` / `from_dict` work from a per-class tuple of field names
+computed once, instead of `dataclasses.asdict` and `__dataclass_fields__`
+on every call. Because the slotted classes are rebuilt by `dataclass`,
+subclasses call the base methods with an explicit ``super(Class, ...)``.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 import uuid
 
 
@@ -13,27 +20,49 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-@dataclass
+# {model class: its dataclass field names, in declaration order}
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+@dataclass(slots=True)
 class BaseModel:
     id: str = field(default_factory=lambda: uuid.uuid4().hex)
     created_at: str = field(default_factory=_now_iso)
     updated_at: str = field(default_factory=_now_iso)
 
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+        return names
+
+    def to_storage_dict(self) -> Dict[str, Any]:
+        """Every field, including internal ones such as the password hash.
+
+        Lists are copied; other values are immutable scalars.
+        """
+        out = {}
+        for name in self.field_names():
+            value = getattr(self, name)
+            out[name] = list(value) if isinstance(value, list) else value
+        return out
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return self.to_storage_dict()
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "BaseModel":
-        # Allow subclasses to pass through unknown fields via dataclass
+    def from_record(cls, data: Dict[str, Any]) -> "BaseModel":
+        """Rebuild a model from a stored object, taking its values as they are."""
         # Construct with only known fields
-        fields = (
-            {f.name for f in cls.__dataclass_fields__.values()}
-            if hasattr(cls, "__dataclass_fields__")
-            else set()
-        )
-        kw = {k: v for k, v in data.items() if k in fields}
+        kw = {k: data[k] for k in cls.field_names() if k in data}
         return cls(**kw)
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BaseModel":
+        """Build a model from client input (see `User` for raw passwords)."""
+        return cls.from_record(data)
+
     def update_from_dict(self, updates: Dict[str, Any]) -> None:
         for k, v in updates.items():
             if k in ("id", "created_at"):
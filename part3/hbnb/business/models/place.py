@@ -8,7 +8,7 @@ from typing import Any, Dict, List
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Place(BaseModel):
     name: str = ""
     description: str = ""
@@ -39,4 +39,4 @@ class Place(BaseModel):
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Place":
-        return super().from_dict(data)
+        return super(Place, cls).from_dict(data)
@@ -8,7 +8,7 @@ from typing import Any, Dict
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Review(BaseModel):
     user_id: str = ""
     place_id: str = ""
@@ -22,4 +22,4 @@ class Review(BaseModel):
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Review":
-        return super().from_dict(data)
+        return super(Review, cls).from_dict(data)
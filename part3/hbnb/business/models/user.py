@@ -6,12 +6,18 @@ from dataclasses import dataclass
 from typing import Any, Dict
 
 from .base import BaseModel
+from ..passwords import hash_password
 
-import bcrypt
 
-
-@dataclass
+@dataclass(slots=True)
 class User(BaseModel):
+    """A user; `password` always holds a bcrypt hash.
+
+    `from_dict` and `update_from_dict` receive client input, so a password
+    there is a raw credential and is hashed. `from_record` rebuilds a user
+    from storage, where the password is already a hash and is kept as is.
+    """
+
     email: str = ""
     password: str = ""
     first_name: str = ""
@@ -29,13 +35,12 @@ class User(BaseModel):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "User":
         # Create instance from known fields
-        inst = super().from_dict(data)
+        inst = super(User, cls).from_dict(data)
         # If a raw password was provided in data, hash it before storing
         if isinstance(data, dict) and data.get("password"):
             raw = data.get("password")
             if isinstance(raw, str) and raw:
-                hashed = bcrypt.hashpw(raw.encode("utf-8"), bcrypt.gensalt())
-                inst.password = hashed.decode("utf-8")
+                inst.password = hash_password(raw)
         # copy is_admin if provided
         if isinstance(data, dict) and "is_admin" in data:
             try:
@@ -46,7 +51,7 @@ class User(BaseModel):
 
     def to_dict(self) -> Dict[str, Any]:
         # Exclude password from serialized representation
-        d = super().to_dict()
+        d = super(User, self).to_dict()
         d.pop("password", None)
         return d
 
@@ -54,7 +59,6 @@ class User(BaseModel):
         # Ensure password is hashed when updated
         pwd = updates.get("password")
         if isinstance(pwd, str) and pwd:
-            hashed = bcrypt.hashpw(pwd.encode("utf-8"), bcrypt.gensalt())
             updates = dict(updates)
-            updates["password"] = hashed.decode("utf-8")
-        super().update_from_dict(updates)
+            updates["password"] = hash_password(pwd)
+        super(User, self).update_from_dict(updates)
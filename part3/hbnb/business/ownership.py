@@ -0,0 +1,12 @@
+"""Owned classes for owner-only writes.
+
+PUT and DELETE on places and reviews are allowed only for the owner (or an
+admin). The facade's `is_owner` reads the owner from the repository on
+every check: a process-local copy could be left stale by an ownership
+change made in another worker.
+"""
+
+from typing import Dict
+
+# owned classes and the field holding the owner's user id
+OWNER_FIELDS: Dict[str, str] = {"Place": "user_id", "Review": "user_id"}
@@ -0,0 +1,156 @@
+"""Password hashing service.
+
+bcrypt is deliberately slow (about 250 ms per hash at the default cost of
+12), so hashing and verification run in a bounded process pool instead of
+on the request thread. The pool accepts at most ``workers + max_pending``
+jobs at a time; past that `hash_password` / `check_password` raise
+`PasswordHasherBusy` straight away and the API answers 429, so a burst of
+signups or logins cannot queue up behind itself and starve other requests.
+
+Each application builds its own `PasswordHasher` from its
+``BCRYPT_ROUNDS`` / ``PASSWORD_HASH_*`` settings, keeps it in
+``app.extensions`` and hands it to its facade, which makes it the current
+hasher (see `using`) while the models hash passwords. Outside of that the
+default hasher is used: inline at the default cost. With ``workers=0``
+hashing runs inline, which is what tests use together with a low cost
+factor. The pool is started lazily, after any server fork.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+import bcrypt
+
+from .. import metrics
+
+DEFAULT_ROUNDS = 12
+MIN_ROUNDS, MAX_ROUNDS = 4, 31
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool has no free capacity."""
+
+
+def _hash(raw: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(raw, bcrypt.gensalt(rounds))
+
+
+def _check(raw: bytes, hashed: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(raw, hashed)
+    except ValueError:
+        # not a bcrypt hash
+        return False
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification on a bounded worker pool."""
+
+    def __init__(
+        self,
+        rounds: int = DEFAULT_ROUNDS,
+        workers: int = 0,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+            raise ValueError(
+                f"bcrypt rounds must be between {MIN_ROUNDS} and {MAX_ROUNDS}"
+            )
+        if workers < 0:
+            raise ValueError("workers must not be negative")
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = workers if max_pending is None else max_pending
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # a pool inherited through fork() has no live workers
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.workers == 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("password hashing is saturated; retry later")
+        try:
+            future: Future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _f: self._slots.release())
+        return future.result()
+
+    def hash(self, password: str) -> str:
+        start = time.perf_counter()
+        hashed = self._run(_hash, password.encode("utf-8"), self.rounds)
+        metrics.PASSWORD_SECONDS.observe(time.perf_counter() - start, "hash")
+        return hashed.decode("utf-8")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        if not password or not hashed:
+            return False
+        start = time.perf_counter()
+        ok = self._run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+        metrics.PASSWORD_SECONDS.observe(time.perf_counter() - start, "verify")
+        return ok
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def default_workers(server_processes: int = 1) -> int:
+    """Pool size giving each of `server_processes` its share of the CPUs.
+
+    Every server process (e.g. gunicorn worker) starts its own pool, so the
+    host's cores are divided between them.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, server_processes))
+
+
+_default = PasswordHasher()
+_current: ContextVar[Optional[PasswordHasher]] = ContextVar(
+    "hbnb_password_hasher", default=None
+)
+
+
+@contextmanager
+def using(hasher: PasswordHasher) -> Iterator[PasswordHasher]:
+    """Make `hasher` the current hasher inside the block."""
+    token = _current.set(hasher)
+    try:
+        yield hasher
+    finally:
+        _current.reset(token)
+
+
+def get_hasher() -> PasswordHasher:
+    """Return the current hasher, or the default inline one."""
+    hasher = _current.get()
+    return _default if hasher is None else hasher
+
+
+def hash_password(password: str) -> str:
+    """Return the bcrypt hash of `password` with the current hasher."""
+    return get_hasher().hash(password)
+
+
+def check_password(password: str, hashed: str) -> bool:
+    """Return whether `password` matches the stored bcrypt `hashed`."""
+    return get_hasher().verify(password, hashed)
@@ -0,0 +1,271 @@
+"""Precomputed review aggregates per place.
+
+Place payloads carry a review count, the time of the latest review and
+the average rating. Rather than loading every review of every place on a
+page, `ReviewStats` keeps one ``PlaceReviewStats`` record per place in
+the repository and the facade adjusts it on every review create, update
+and delete. A page of places then needs one bulk lookup of small records,
+served by the ``place_id`` index of each backend. Adjustments lock the
+record while they read and write it (see `ReviewStats._update`), so
+concurrent review writes are all counted.
+
+A stored record holds::
+
+    place_id, review_count, last_review_at, rating_count, rating_sum
+
+Reviews have no rating field yet; any numeric ``rating`` a review carries
+is counted, so `rating_avg` stays None until ratings exist.
+
+Places whose record is missing (data written before the aggregates
+existed, or by other tools) are computed from their reviews on read;
+`rebuild` recomputes and stores records, see ``flask rebuild-review-stats``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+STATS_CLASS = "PlaceReviewStats"
+
+# aggregate fields exposed on place payloads
+PUBLIC_FIELDS = ("review_count", "last_review_at", "rating_avg")
+
+
+def _rating(review: Mapping[str, Any]) -> Optional[float]:
+    value = review.get("rating")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+_STORED_FIELDS = (
+    "place_id",
+    "review_count",
+    "last_review_at",
+    "rating_count",
+    "rating_sum",
+)
+
+
+def _empty(place_id: str) -> Dict[str, Any]:
+    return {
+        "place_id": place_id,
+        "review_count": 0,
+        "last_review_at": None,
+        "rating_count": 0,
+        "rating_sum": 0.0,
+    }
+
+
+def _values(stored: Mapping[str, Any]) -> Dict[str, Any]:
+    # a writable copy of the aggregate fields of a stored record
+    return {name: stored.get(name) for name in _STORED_FIELDS}
+
+
+def _add(stats: Dict[str, Any], review: Mapping[str, Any]) -> None:
+    stats["review_count"] += 1
+    created = review.get("created_at")
+    if created and (
+        stats["last_review_at"] is None or created > stats["last_review_at"]
+    ):
+        stats["last_review_at"] = created
+    rating = _rating(review)
+    if rating is not None:
+        stats["rating_count"] += 1
+        stats["rating_sum"] += rating
+
+
+def _compute(place_id: str, reviews: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    stats = _empty(place_id)
+    for review in reviews:
+        _add(stats, review)
+    return stats
+
+
+def summary(stats: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """The public aggregate fields for a stored (or computed) record."""
+    if stats is None:
+        return {"review_count": 0, "last_review_at": None, "rating_avg": None}
+    rating_count = stats.get("rating_count") or 0
+    return {
+        "review_count": stats.get("review_count") or 0,
+        "last_review_at": stats.get("last_review_at"),
+        "rating_avg": (
+            round(stats["rating_sum"] / rating_count, 2) if rating_count else None
+        ),
+    }
+
+
+class ReviewStats:
+    """Per-place review aggregates kept in the repository."""
+
+    def __init__(self, repository) -> None:
+        self._repo = repository
+
+    def _update(
+        self,
+        place_ids: Iterable[str],
+        change: Callable[[Dict[str, Dict[str, Any]]], None],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Apply `change` to the records of `place_ids` under a lock.
+
+        The records are locked and re-read through the repository's
+        `update_locked`, and `change` edits ``{place id: fields}`` in place.
+        Concurrent review writes (other threads or worker processes) wait
+        for the lock instead of overwriting each other's counts. Missing
+        records are computed from the reviews and created.
+        """
+        wanted = [pid for pid in dict.fromkeys(place_ids) if pid]
+        if not wanted:
+            return {}
+        record_ids = [
+            s["id"] for s in self._repo.find_in(STATS_CLASS, "place_id", wanted)
+        ]
+        out: Dict[str, Dict[str, Any]] = {}
+
+        def compute(current):
+            stats = {r.get("place_id"): _values(r) for r in current.values()}
+            change(stats)
+            out.update(stats)
+            return {obj_id: stats[r.get("place_id")] for obj_id, r in current.items()}
+
+        if record_ids:
+            self._repo.update_locked(STATS_CLASS, record_ids, compute)
+        missing = [pid for pid in wanted if pid not in out]
+        if missing:
+            created = {pid: _empty(pid) for pid in missing}
+            self._recompute(created)
+            self._repo.create_many(STATS_CLASS, list(created.values()))
+            out.update(created)
+        return out
+
+    def _recompute(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        # reset the records in `stats` and count the reviews of their places
+        for pid in stats:
+            stats[pid] = _empty(pid)
+        for review in self._repo.find_in("Review", "place_id", list(stats)):
+            _add(stats[review.get("place_id")], review)
+
+    def for_places(self, place_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return ``{place id: stored or computed record}`` for `place_ids`."""
+        wanted = [pid for pid in dict.fromkeys(place_ids) if pid]
+        if not wanted:
+            return {}
+        out = {
+            s.get("place_id"): s
+            for s in self._repo.find_in(STATS_CLASS, "place_id", wanted)
+        }
+        missing = [pid for pid in wanted if pid not in out]
+        if missing:
+            by_place: Dict[str, List[Mapping[str, Any]]] = {pid: [] for pid in missing}
+            for review in self._repo.find_in("Review", "place_id", missing):
+                by_place[review.get("place_id")].append(review)
+            for pid, reviews in by_place.items():
+                out[pid] = _compute(pid, reviews)
+        return out
+
+    def rebuild(self, place_id: str) -> Dict[str, Any]:
+        """Recompute the record of `place_id` from its reviews and store it."""
+        return self._update([place_id], self._recompute)[place_id]
+
+    def place_created(self, place: Mapping[str, Any]) -> None:
+        self._repo.create(STATS_CLASS, _empty(place["id"]))
+
+    def place_deleted(self, place_id: str) -> None:
+        for stored in self._repo.find_by(STATS_CLASS, place_id=place_id):
+            self._repo.delete(STATS_CLASS, stored["id"])
+
+    def _apply(
+        self,
+        stats: Dict[str, Dict[str, Any]],
+        removed: Iterable[Mapping[str, Any]],
+        added: Iterable[Mapping[str, Any]],
+    ) -> None:
+        # Adjust the records incrementally. Only the latest review time of a
+        # place whose latest review went away is looked up again, as the
+        # maximum of what is stored: unlike a recount, that gives the same
+        # result whichever concurrent write was applied first.
+        rescan = set()
+        for review in removed:
+            current = stats.get(review.get("place_id"))
+            if current is None:
+                continue
+            current["review_count"] -= 1
+            rating = _rating(review)
+            if rating is not None:
+                current["rating_count"] -= 1
+                current["rating_sum"] -= rating
+            if review.get("created_at") == current["last_review_at"]:
+                rescan.add(current["place_id"])
+        for review in added:
+            current = stats.get(review.get("place_id"))
+            if current is None:
+                continue
+            _add(current, review)
+            if review.get("created_at") == current["last_review_at"]:
+                rescan.discard(current["place_id"])
+        if not rescan:
+            return
+        latest: Dict[str, Any] = dict.fromkeys(rescan)
+        for review in self._repo.find_in("Review", "place_id", list(rescan)):
+            pid, created = review.get("place_id"), review.get("created_at")
+            if created and (latest[pid] is None or created > latest[pid]):
+                latest[pid] = created
+        for pid, created in latest.items():
+            stats[pid]["last_review_at"] = created
+
+    def reviews_changed(
+        self,
+        removed: Iterable[Mapping[str, Any]] = (),
+        added: Iterable[Mapping[str, Any]] = (),
+    ) -> None:
+        """Take `removed` reviews out of the records and count `added` ones.
+
+        An updated review is passed as removed (before) and added (after).
+        All affected records are locked and written in one repository call.
+        """
+        removed, added = list(removed), list(added)
+        self._update(
+            [r.get("place_id") for r in removed + added],
+            lambda stats: self._apply(stats, removed, added),
+        )
+
+    def review_added(self, review: Mapping[str, Any]) -> None:
+        self.reviews_changed(added=[review])
+
+    def review_removed(self, review: Mapping[str, Any]) -> None:
+        self.reviews_changed(removed=[review])
+
+    def review_changed(
+        self, before: Mapping[str, Any], after: Mapping[str, Any]
+    ) -> None:
+        moved = before.get("place_id") != after.get("place_id")
+        if moved or _rating(before) != _rating(after):
+            self.reviews_changed([before], [after])
+
+    def rebuild_places(self, place_ids: Iterable[str]) -> int:
+        """Recompute and store the records of `place_ids` with bulk calls.
+
+        Used after bulk review writes and by `rebuild_all`; returns how
+        many records were written.
+        """
+        return len(self._update(place_ids, self._recompute))
+
+    def places_created(self, places: Iterable[Mapping[str, Any]]) -> None:
+        self._repo.create_many(STATS_CLASS, [_empty(p["id"]) for p in places])
+
+    def places_deleted(self, place_ids: Iterable[str]) -> None:
+        stored = self._repo.find_in(STATS_CLASS, "place_id", place_ids)
+        self._repo.delete_many(STATS_CLASS, [s["id"] for s in stored])
+
+    def rebuild_all(self) -> int:
+        """Recompute the records of every place; return how many were written."""
+        place_ids = {p["id"] for p in self._repo.list("Place")}
+        orphans = [
+            s["id"]
+            for s in self._repo.list(STATS_CLASS)
+            if s.get("place_id") not in place_ids
+        ]
+        if orphans:
+            self._repo.delete_many(STATS_CLASS, orphans)
+        return self.rebuild_places(sorted(place_ids))
@@ -9,7 +9,7 @@ Commands:
     destroy <ClassName> <id>             Delete instance
     all [ClassName]                      List instances
     update <ClassName> <id> <json|key=value>  Update instance
-    count <ClassName>                    Count instances
+    count <ClassName> [key=value ...]    Count (matching) instances
     quit / EOF                           Exit
 """
 
@@ -24,6 +24,15 @@ from .persistence.in_memory_repository import InMemoryRepository
 from .business.facade import HBNBFacade, NotFoundError, ValidationError
 
 
+def _scalar(value: str) -> Any:
+    """Read a ``key=value`` value as a JSON scalar, else keep the string."""
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return value
+    return value if isinstance(parsed, (dict, list)) else parsed
+
+
 class HBNBCommand(cmd.Cmd):
     intro = "Welcome to HBNB console. Type help or ? to list commands."
     prompt = "(hbnb) "
@@ -120,12 +129,19 @@ class HBNBCommand(cmd.Cmd):
             print(f"** {e} **")
 
     def do_count(self, arg: str) -> None:
-        """count <ClassName> -- return number of instances for ClassName"""
+        """count <ClassName> [key=value ...] -- number of matching instances"""
         parts = shlex.split(arg)
         if not parts:
             print("** class name missing **")
             return
-        print(self._facade.count(parts[0]))
+        criteria: dict[str, Any] = {}
+        for token in parts[1:]:
+            if "=" not in token:
+                print("** filters must be key=value pairs **")
+                return
+            k, v = token.split("=", 1)
+            criteria[k] = _scalar(v)
+        print(self._facade.count(parts[0], **criteria))
 
     def do_quit(self, arg: str) -> bool:
         """Quit the console."""
@@ -19,18 +19,18 @@ def seed_demo_data(app) -> Dict[str, Any]:
     if facade is None:
         raise RuntimeError("The app does not expose an HBNB facade for seeding.")
 
-    for user in facade.list("User"):
-        if user.get("email") == DEMO_USER_EMAIL:
-            place = _find_first_place_for_user(facade, user.get("id"))
-            return {
-                "seeded": False,
-                "user": _sanitize_user(user),
-                "place": place,
-                "credentials": {
-                    "email": DEMO_USER_EMAIL,
-                    "password": DEMO_USER_PASSWORD,
-                },
-            }
+    user = facade.get_user_by_email(DEMO_USER_EMAIL)
+    if user is not None:
+        place = _find_first_place_for_user(facade, user.get("id"))
+        return {
+            "seeded": False,
+            "user": _sanitize_user(user),
+            "place": place,
+            "credentials": {
+                "email": DEMO_USER_EMAIL,
+                "password": DEMO_USER_PASSWORD,
+            },
+        }
 
     user = facade.create(
         "User",
@@ -42,141 +42,149 @@ def seed_demo_data(app) -> Dict[str, Any]:
         },
     )
 
-    wifi = facade.create("Amenity", {"name": "Fast Wi-Fi"})
-    coffee = facade.create("Amenity", {"name": "Coffee station"})
-    pool = facade.create("Amenity", {"name": "Swimming Pool"})
-    parking = facade.create("Amenity", {"name": "Free Parking"})
-    kitchen = facade.create("Amenity", {"name": "Full Kitchen"})
-    ac = facade.create("Amenity", {"name": "Air Conditioning"})
-
-    place1 = facade.create(
-        "Place",
-        {
-            "user_id": user["id"],
-            "name": "Sunny Beach House",
-            "description": "A bright and airy beach house just steps from the sand. "
-            "Perfect for a relaxing getaway with ocean views from every room.",
-            "country": "Uruguay",
-            "price_by_night": 120,
-            "number_rooms": 3,
-            "number_bathrooms": 2,
-            "max_guest": 6,
-            "amenity_ids": [wifi["id"], pool["id"], parking["id"], kitchen["id"]],
-            "image": "images/place_beach.jpg",
-        },
-    )
-
-    place2 = facade.create(
-        "Place",
-        {
-            "user_id": user["id"],
-            "name": "Downtown Loft",
-            "description": "Modern loft in the heart of the city with exposed brick walls, "
-            "high ceilings, and walking distance to restaurants and nightlife.",
-            "country": "Argentina",
-            "price_by_night": 85,
-            "number_rooms": 1,
-            "number_bathrooms": 1,
-            "max_guest": 2,
-            "amenity_ids": [wifi["id"], coffee["id"], ac["id"]],
-            "image": "images/place_loft.jpg",
-        },
-    )
-
-    place3 = facade.create(
-        "Place",
-        {
-            "user_id": user["id"],
-            "name": "Mountain Cabin Retreat",
-            "description": "Cozy wooden cabin surrounded by pine trees with a fireplace, "
-            "hiking trails nearby, and stunning mountain views.",
-            "country": "Chile",
-            "price_by_night": 95,
-            "number_rooms": 2,
-            "number_bathrooms": 1,
-            "max_guest": 4,
-            "amenity_ids": [wifi["id"], parking["id"], kitchen["id"]],
-            "image": "images/place_cabin.jpg",
-        },
+    # one bulk insert per class instead of one round trip per object
+    wifi, coffee, pool, parking, kitchen, ac = facade.create_many(
+        "Amenity",
+        [
+            {"name": "Fast Wi-Fi"},
+            {"name": "Coffee station"},
+            {"name": "Swimming Pool"},
+            {"name": "Free Parking"},
+            {"name": "Full Kitchen"},
+            {"name": "Air Conditioning"},
+        ],
     )
 
-    place4 = facade.create(
+    place1, place2, place3, place4, place5 = facade.create_many(
         "Place",
-        {
-            "user_id": user["id"],
-            "name": "Colonial Garden Suite",
-            "description": "Charming suite in a restored colonial home with a private garden, "
-            "hammock, and traditional tile floors.",
-            "country": "Colombia",
-            "price_by_night": 70,
-            "number_rooms": 1,
-            "number_bathrooms": 1,
-            "max_guest": 2,
-            "amenity_ids": [wifi["id"], coffee["id"], ac["id"]],
-            "image": "images/place_colonial.jpg",
-        },
+        [
+            {
+                "user_id": user["id"],
+                "name": "Sunny Beach House",
+                "description": (
+                    "A bright and airy beach house just steps from the sand. "
+                    "Perfect for a relaxing getaway with ocean views from every room."
+                ),
+                "country": "Uruguay",
+                "price_by_night": 120,
+                "number_rooms": 3,
+                "number_bathrooms": 2,
+                "max_guest": 6,
+                "amenity_ids": [wifi["id"], pool["id"], parking["id"], kitchen["id"]],
+                "image": "images/place_beach.jpg",
+            },
+            {
+                "user_id": user["id"],
+                "name": "Downtown Loft",
+                "description": (
+                    "Modern loft in the heart of the city with exposed brick walls, "
+                    "high ceilings, and walking distance to restaurants and nightlife."
+                ),
+                "country": "Argentina",
+                "price_by_night": 85,
+                "number_rooms": 1,
+                "number_bathrooms": 1,
+                "max_guest": 2,
+                "amenity_ids": [wifi["id"], coffee["id"], ac["id"]],
+                "image": "images/place_loft.jpg",
+            },
+            {
+                "user_id": user["id"],
+                "name": "Mountain Cabin Retreat",
+                "description": (
+                    "Cozy wooden cabin surrounded by pine trees with a fireplace, "
+                    "hiking trails nearby, and stunning mountain views."
+                ),
+                "country": "Chile",
+                "price_by_night": 95,
+                "number_rooms": 2,
+                "number_bathrooms": 1,
+                "max_guest": 4,
+                "amenity_ids": [wifi["id"], parking["id"], kitchen["id"]],
+                "image": "images/place_cabin.jpg",
+            },
+            {
+                "user_id": user["id"],
+                "name": "Colonial Garden Suite",
+                "description": (
+                    "Charming suite in a restored colonial home with a private "
+                    "garden, hammock, and traditional tile floors."
+                ),
+                "country": "Colombia",
+                "price_by_night": 70,
+                "number_rooms": 1,
+                "number_bathrooms": 1,
+                "max_guest": 2,
+                "amenity_ids": [wifi["id"], coffee["id"], ac["id"]],
+                "image": "images/place_colonial.jpg",
+            },
+            {
+                "user_id": user["id"],
+                "name": "Lakefront Villa",
+                "description": (
+                    "Spacious villa on the lake with a private dock, kayaks "
+                    "included, and panoramic sunset views from the terrace."
+                ),
+                "country": "Uruguay",
+                "price_by_night": 200,
+                "number_rooms": 4,
+                "number_bathrooms": 3,
+                "max_guest": 8,
+                "amenity_ids": [
+                    wifi["id"],
+                    pool["id"],
+                    parking["id"],
+                    kitchen["id"],
+                    ac["id"],
+                ],
+                "image": "images/place_lake.jpg",
+            },
+        ],
     )
 
-    place5 = facade.create(
-        "Place",
-        {
-            "user_id": user["id"],
-            "name": "Lakefront Villa",
-            "description": "Spacious villa on the lake with a private dock, kayaks included, "
-            "and panoramic sunset views from the terrace.",
-            "country": "Uruguay",
-            "price_by_night": 200,
-            "number_rooms": 4,
-            "number_bathrooms": 3,
-            "max_guest": 8,
-            "amenity_ids": [wifi["id"], pool["id"], parking["id"], kitchen["id"], ac["id"]],
-            "image": "images/place_lake.jpg",
-        },
-    )
-
-    review = facade.create(
+    review, *_ = facade.create_many(
         "Review",
-        {
-            "user_id": user["id"],
-            "place_id": place1["id"],
-            "text": "Amazing stay! The beach was gorgeous and the house was spotless.",
-        },
-    )
-
-    facade.create(
-        "Review",
-        {
-            "user_id": user["id"],
-            "place_id": place2["id"],
-            "text": "Great location right in the city center. Loved the brick walls and the coffee shops nearby.",
-        },
-    )
-
-    facade.create(
-        "Review",
-        {
-            "user_id": user["id"],
-            "place_id": place3["id"],
-            "text": "So peaceful and quiet. Woke up to birds singing and had coffee on the porch with mountain views.",
-        },
-    )
-
-    facade.create(
-        "Review",
-        {
-            "user_id": user["id"],
-            "place_id": place4["id"],
-            "text": "Beautiful colonial charm. The garden was a lovely surprise and the hammock was perfect for afternoon naps.",
-        },
-    )
-
-    facade.create(
-        "Review",
-        {
-            "user_id": user["id"],
-            "place_id": place5["id"],
-            "text": "Incredible sunsets from the terrace. We used the kayaks every morning. Worth every penny.",
-        },
+        [
+            {
+                "user_id": user["id"],
+                "place_id": place1["id"],
+                "text": (
+                    "Amazing stay! The beach was gorgeous and the house was spotless."
+                ),
+            },
+            {
+                "user_id": user["id"],
+                "place_id": place2["id"],
+                "text": (
+                    "Great location right in the city center. Loved the brick walls "
+                    "and the coffee shops nearby."
+                ),
+            },
+            {
+                "user_id": user["id"],
+                "place_id": place3["id"],
+                "text": (
+                    "So peaceful and quiet. Woke up to birds singing and had coffee "
+                    "on the porch with mountain views."
+                ),
+            },
+            {
+                "user_id": user["id"],
+                "place_id": place4["id"],
+                "text": (
+                    "Beautiful colonial charm. The garden was a lovely surprise and "
+                    "the hammock was perfect for afternoon naps."
+                ),
+            },
+            {
+                "user_id": user["id"],
+                "place_id": place5["id"],
+                "text": (
+                    "Incredible sunsets from the terrace. We used the kayaks every "
+                    "morning. Worth every penny."
+                ),
+            },
+        ],
     )
 
     return {
@@ -194,10 +202,8 @@ def seed_demo_data(app) -> Dict[str, Any]:
 def _find_first_place_for_user(facade, user_id: str | None):
     if not user_id:
         return None
-    for place in facade.list("Place"):
-        if place.get("user_id") == user_id:
-            return place
-    return None
+    places = facade.find_by("Place", user_id=user_id)
+    return places[0] if places else None
 
 
 def _sanitize_user(user: Dict[str, Any] | None):
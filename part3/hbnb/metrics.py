@@ -0,0 +1,267 @@
+"""In-process metrics rendered in the Prometheus text format.
+
+`Counter` and `Histogram` keep one set of values per label combination
+behind a lock, so recording is a dict lookup and a few additions. Each
+process keeps its own values. Under a pre-fork server, scrape every worker
+(or accept per-worker samples). The metrics the app records are defined at
+the bottom of this module, and ``GET /metrics`` serves `render()`.
+"""
+
+from __future__ import annotations
+
+import abc
+from bisect import bisect_left
+from contextvars import ContextVar, Token
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# seconds; from sub-millisecond repository reads to slow requests
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# statements per request
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labels: Tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """Return the exposition lines for this metric."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every recorded value."""
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames=()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            try:
+                self._values[labels] += amount
+            except KeyError:
+                self._check(labels)
+                self._values[labels] = amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in values:
+            lines.append(
+                f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            )
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (cumulative on render) per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (+Inf last)..., sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                self._check(labels)
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[slot] += 1
+            row[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            row = self._values.get(labels)
+            return int(sum(row[:-1])) if row else 0
+
+    def total(self, *labels: str) -> float:
+        with self._lock:
+            row = self._values.get(labels)
+            return row[-1] if row else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self._header()
+        names = self.labelnames
+        for labels, row in values:
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (math.inf,), row[:-1]):
+                cumulative += hits
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(names, labels, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(names, labels)} {row[-1]!r}")
+            lines.append(f"{self.name}_count{_labels(names, labels)} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """The metrics served together by one endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Forget every recorded value (tests and benchmarks)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "hbnb_http_request_duration_seconds",
+        "Time spent in the view and its before/after request handlers.",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_QUERIES = REGISTRY.register(
+    Histogram(
+        "hbnb_http_request_sql_queries",
+        "SQL statements executed per request.",
+        ("method", "route"),
+        buckets=QUERY_BUCKETS,
+    )
+)
+REPOSITORY_SECONDS = REGISTRY.register(
+    Histogram(
+        "hbnb_repository_call_duration_seconds",
+        "Repository calls made by the facade, by class and method.",
+        ("cls_name", "method"),
+    )
+)
+SQL_QUERIES = REGISTRY.register(
+    Counter("hbnb_sql_queries_total", "SQL statements executed by all engines.")
+)
+PASSWORD_SECONDS = REGISTRY.register(
+    Histogram(
+        "hbnb_password_hash_duration_seconds",
+        "bcrypt hashing and verification, including the wait for a worker.",
+        ("op",),
+    )
+)
+
+# statements run so far by the current request, while one is tracked
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar(
+    "hbnb_request_queries", default=None
+)
+
+
+def statement_executed(statement: str) -> None:
+    """SQL engine hook: count a statement globally and for the request."""
+    SQL_QUERIES.inc()
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def track_queries() -> Token:
+    """Start counting the statements of the current request."""
+    return _request_queries.set([0])
+
+
+def tracked_queries(token: Token) -> int:
+    """Stop counting and return the statements seen since `track_queries`."""
+    counter = _request_queries.get()
+    _request_queries.reset(token)
+    return counter[0] if counter else 0
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -5,6 +5,7 @@ for fast in-memory testing, or `SQLAlchemyRepository` for persistence
 once the database schema is initialized.
 """
 
+from .indexes import IndexSpec, DuplicateKeyError
 from .in_memory_repository import InMemoryRepository
 from .sqlalchemy_repository import SQLAlchemyRepository
 from .user_repository import UserRepository
@@ -12,8 +13,11 @@ from .place_repository import PlaceRepository
 from .review_repository import ReviewRepository
 from .amenity_repository import AmenityRepository
 from .composite_repository import CompositeRepository
+from .caching_repository import CachingRepository
 
 __all__ = [
+    "IndexSpec",
+    "DuplicateKeyError",
     "InMemoryRepository",
     "SQLAlchemyRepository",
     "UserRepository",
@@ -21,4 +25,5 @@ __all__ = [
     "ReviewRepository",
     "AmenityRepository",
     "CompositeRepository",
+    "CachingRepository",
 ]
@@ -0,0 +1,275 @@
+"""Read cache in front of any repository.
+
+`CachingRepository` wraps a repository and implements the same interface.
+`get` results and per-class `list` results are kept in one size-bounded
+LRU with a time-to-live; `get_many` is answered from cached objects where
+it can and fetches only the missing ids. Writes go straight through to the
+wrapped repository and invalidate what they affect: the object's `get`
+entry and every cached `list` of its class. Everything else (searches,
+`find_*`, `count`) is passed through uncached.
+
+Cached values are the read-only records the repositories return (see
+`records`), so they are shared with callers without copying.
+
+Inside a unit of work a write is not visible to other requests until the
+unit commits, and may still be rolled back. Reads made by a unit of work
+after it wrote are therefore not cached, and the written keys are
+invalidated again when the unit commits or rolls back. Writes made by
+other processes are only seen once entries expire, after `ttl` seconds.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from . import unit_of_work
+
+_MISSING = object()
+
+
+class CachingRepository:
+    def __init__(
+        self,
+        repo,
+        max_entries: int = 10_000,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.repo = repo
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        # {("get", cls, id) | ("list", cls, limit, after): (expires, value)}
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # {cls: cached list keys}, so writes drop a class's lists quickly
+        self._list_keys: Dict[str, set] = {}
+        # bumped by every invalidation of a class; a read that raced with a
+        # write does not store what it fetched
+        self._generations: Dict[str, int] = {}
+        # units of work that wrote through this cache; their reads may see
+        # uncommitted rows and are not stored
+        self._writing_units: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name):
+        # engine handles and backend-specific helpers of the wrapped repository
+        return getattr(self.repo, name)
+
+    # cache primitives
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return _MISSING
+
+    def _generation(self, cls_name: str) -> int:
+        return self._generations.get(cls_name, 0)
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.max_entries <= 0:
+            return
+        uow = unit_of_work.current()
+        if uow is not None and uow in self._writing_units:
+            return
+        with self._lock:
+            if self._generations.get(key[1], 0) != generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if key[0] == "list":
+                self._list_keys.setdefault(key[1], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        # caller holds the lock
+        self._entries.pop(key, None)
+        if key[0] == "list":
+            self._list_keys.get(key[1], set()).discard(key)
+
+    def _invalidate(self, cls_name: str, obj_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._generations[cls_name] = self._generations.get(cls_name, 0) + 1
+            if obj_id is not None:
+                self._drop(("get", cls_name, obj_id))
+            for key in self._list_keys.pop(cls_name, ()):
+                self._entries.pop(key, None)
+
+    def _written(self, cls_name: str, obj_id: Optional[str]) -> None:
+        self._invalidate(cls_name, obj_id)
+        uow = unit_of_work.current()
+        if uow is not None:
+            self._writing_units.add(uow)
+            # other requests may have cached the old row before the unit ends
+            uow.on_commit(lambda: self._invalidate(cls_name, obj_id))
+            uow.on_rollback(lambda: self._invalidate(cls_name, obj_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._list_keys.clear()
+
+    # cached reads
+
+    def get(self, cls_name: str, obj_id: str) -> Optional[Dict[str, Any]]:
+        key = ("get", cls_name, obj_id)
+        obj = self._lookup(key)
+        if obj is _MISSING:
+            generation = self._generation(cls_name)
+            obj = self.repo.get(cls_name, obj_id)
+            if obj is not None:
+                self._store(key, obj, generation)
+        return obj
+
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        key = ("list", cls_name, limit, after)
+        items = self._lookup(key)
+        if items is _MISSING:
+            generation = self._generation(cls_name)
+            if limit is None and after is None:
+                items = self.repo.list(cls_name)
+            else:
+                items = self.repo.list(cls_name, limit=limit, after=after)
+            self._store(key, items, generation)
+        return list(items)
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        wanted = list(dict.fromkeys(ids))
+        missing = []
+        for obj_id in wanted:
+            obj = self._lookup(("get", cls_name, obj_id))
+            if obj is _MISSING:
+                missing.append(obj_id)
+            else:
+                found[obj_id] = obj
+        if missing:
+            generation = self._generation(cls_name)
+            for obj in self.repo.get_many(cls_name, missing):
+                found[obj["id"]] = obj
+                self._store(("get", cls_name, obj["id"]), obj, generation)
+        return [found[obj_id] for obj_id in wanted if obj_id in found]
+
+    # writes go through and invalidate
+
+    def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        obj = self.repo.create(cls_name, payload)
+        self._written(cls_name, obj.get("id"))
+        return obj
+
+    def update(
+        self, cls_name: str, obj_id: str, updates: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return self.repo.update(cls_name, obj_id, updates)
+        finally:
+            self._written(cls_name, obj_id)
+
+    def delete(self, cls_name: str, obj_id: str) -> bool:
+        try:
+            return self.repo.delete(cls_name, obj_id)
+        finally:
+            self._written(cls_name, obj_id)
+
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        created = self.repo.create_many(cls_name, payloads)
+        for obj in created:
+            self._written(cls_name, obj.get("id"))
+        return created
+
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        try:
+            return self.repo.update_many(cls_name, updates)
+        finally:
+            for obj_id in updates:
+                self._written(cls_name, obj_id)
+
+    def update_locked(
+        self,
+        cls_name: str,
+        ids: Iterable[str],
+        compute: Callable[[Dict[str, Dict[str, Any]]], Dict[str, Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        ids = list(ids)
+        try:
+            return self.repo.update_locked(cls_name, ids, compute)
+        finally:
+            for obj_id in ids:
+                self._written(cls_name, obj_id)
+
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        try:
+            return self.repo.delete_many(cls_name, ids)
+        finally:
+            for obj_id in ids:
+                self._written(cls_name, obj_id)
+
+    def clear(self) -> None:
+        self.repo.clear()
+        self.invalidate_all()
+
+    # uncached pass-through
+
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        return self.repo.find_in(cls_name, field, values)
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        return self.repo.find_by(cls_name, **criteria)
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        return self.repo.stream(cls_name, batch_size)
+
+    def search_places(self, query):
+        return self.repo.search_places(query)
+
+    def find_in_box(self, box):
+        return self.repo.find_in_box(box)
+
+    def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.repo.list_all()
+
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        return self.repo.count(cls_name, **criteria)
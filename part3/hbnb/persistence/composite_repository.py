@@ -4,7 +4,7 @@ falls back to a generic repository for other classes.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 
 class CompositeRepository:
@@ -22,6 +22,17 @@ class CompositeRepository:
         self.review_repo = review_repo
         self.amenity_repo = amenity_repo
 
+    def _repo_for(self, cls_name: str):
+        if cls_name == "User":
+            return self.user_repo
+        if cls_name == "Place" and self.place_repo is not None:
+            return self.place_repo
+        if cls_name == "Review" and self.review_repo is not None:
+            return self.review_repo
+        if cls_name == "Amenity" and self.amenity_repo is not None:
+            return self.amenity_repo
+        return self.generic_repo
+
     def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         if cls_name == "User":
             return self.user_repo.create(cls_name, payload)
@@ -44,16 +55,26 @@ class CompositeRepository:
             return self.amenity_repo.get(cls_name, obj_id)
         return self.generic_repo.get(cls_name, obj_id)
 
-    def list(self, cls_name: str):
-        if cls_name == "User":
-            return self.user_repo.list(cls_name)
-        if cls_name == "Place" and self.place_repo is not None:
-            return self.place_repo.list(cls_name)
-        if cls_name == "Review" and self.review_repo is not None:
-            return self.review_repo.list(cls_name)
-        if cls_name == "Amenity" and self.amenity_repo is not None:
-            return self.amenity_repo.list(cls_name)
-        return self.generic_repo.list(cls_name)
+    def list(self, cls_name: str, limit=None, after=None):
+        return self._repo_for(cls_name).list(cls_name, limit=limit, after=after)
+
+    def stream(self, cls_name: str, batch_size: int = 500):
+        return self._repo_for(cls_name).stream(cls_name, batch_size)
+
+    def search_places(self, query):
+        return self._repo_for("Place").search_places(query)
+
+    def find_in_box(self, box):
+        return self._repo_for("Place").find_in_box(box)
+
+    def get_many(self, cls_name: str, ids: Iterable[str]):
+        return self._repo_for(cls_name).get_many(cls_name, ids)
+
+    def find_in(self, cls_name: str, field: str, values: Iterable[Any]):
+        return self._repo_for(cls_name).find_in(cls_name, field, values)
+
+    def find_by(self, cls_name: str, **criteria: Any):
+        return self._repo_for(cls_name).find_by(cls_name, **criteria)
 
     def update(self, cls_name: str, obj_id: str, updates: Dict[str, Any]):
         if cls_name == "User":
@@ -77,15 +98,32 @@ class CompositeRepository:
             return self.amenity_repo.delete(cls_name, obj_id)
         return self.generic_repo.delete(cls_name, obj_id)
 
+    def create_many(self, cls_name: str, payloads: Iterable[Dict[str, Any]]):
+        return self._repo_for(cls_name).create_many(cls_name, payloads)
+
+    def update_many(self, cls_name: str, updates: Dict[str, Dict[str, Any]]):
+        return self._repo_for(cls_name).update_many(cls_name, updates)
+
+    def update_locked(self, cls_name: str, ids: Iterable[str], compute):
+        return self._repo_for(cls_name).update_locked(cls_name, ids, compute)
+
+    def delete_many(self, cls_name: str, ids: Iterable[str]):
+        return self._repo_for(cls_name).delete_many(cls_name, ids)
+
     def clear(self):
-        try:
-            self.user_repo.clear()
-        except Exception:
-            pass
-        try:
-            self.generic_repo.clear()
-        except Exception:
-            pass
+        for repo in (
+            self.review_repo,
+            self.place_repo,
+            self.amenity_repo,
+            self.user_repo,
+            self.generic_repo,
+        ):
+            if repo is None:
+                continue
+            try:
+                repo.clear()
+            except Exception:
+                pass
 
     def list_all(self):
         out = {}
@@ -114,13 +152,5 @@ class CompositeRepository:
             pass
         return out
 
-    def count(self, cls_name: str):
-        if cls_name == "User":
-            return self.user_repo.count(cls_name)
-        if cls_name == "Place" and self.place_repo is not None:
-            return self.place_repo.count(cls_name)
-        if cls_name == "Review" and self.review_repo is not None:
-            return self.review_repo.count(cls_name)
-        if cls_name == "Amenity" and self.amenity_repo is not None:
-            return self.amenity_repo.count(cls_name)
-        return self.generic_repo.count(cls_name)
+    def count(self, cls_name: str, **criteria: Any):
+        return self._repo_for(cls_name).count(cls_name, **criteria)
@@ -0,0 +1,155 @@
+"""Process-wide registry of SQLAlchemy engines.
+
+Every SQL repository asks `get_engine` for its engine instead of calling
+`create_engine` itself, so repositories pointed at the same database share
+one engine and one connection pool. Pool behaviour is configured with
+`PoolSettings` the first time an engine is requested for a URI.
+
+In-memory SQLite URIs are never cached: each request gets a fresh engine
+and therefore a fresh, private database, which is what tests rely on.
+Pass that engine explicitly to repositories that must share it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool options; ``None`` keeps SQLAlchemy's default."""
+
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[float] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = False
+
+    @classmethod
+    def from_config(cls, config) -> "PoolSettings":
+        """Build settings from ``SQLALCHEMY_POOL_*`` keys of a mapping."""
+
+        def _opt(key, cast):
+            value = config.get(key)
+            return None if value in (None, "") else cast(value)
+
+        pre_ping = config.get("SQLALCHEMY_POOL_PRE_PING", False)
+        if isinstance(pre_ping, str):
+            pre_ping = pre_ping.strip().lower() in {"1", "true", "yes", "on"}
+        return cls(
+            pool_size=_opt("SQLALCHEMY_POOL_SIZE", int),
+            max_overflow=_opt("SQLALCHEMY_MAX_OVERFLOW", int),
+            pool_timeout=_opt("SQLALCHEMY_POOL_TIMEOUT", float),
+            pool_recycle=_opt("SQLALCHEMY_POOL_RECYCLE", int),
+            pool_pre_ping=bool(pre_ping),
+        )
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v not in (None, False)}
+
+
+_lock = threading.Lock()
+_engines: Dict[Tuple[str, bool], Engine] = {}
+# called with the text of every statement an engine from `get_engine` runs
+_statement_hooks: List[Callable[[str], None]] = []
+
+
+def on_statement(hook: Callable[[str], None]) -> None:
+    """Call ``hook(statement)`` before every SQL statement; added only once."""
+    with _lock:
+        if hook not in _statement_hooks:
+            _statement_hooks.append(hook)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    for hook in _statement_hooks:
+        hook(statement)
+
+
+def _is_memory_sqlite(database_uri: str) -> bool:
+    url = make_url(database_uri)
+    return url.get_backend_name() == "sqlite" and url.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def _create(database_uri: str, echo: bool, pool: Optional[PoolSettings]) -> Engine:
+    kwargs: Dict[str, Any] = {}
+    if pool is not None and not _is_memory_sqlite(database_uri):
+        # in-memory SQLite uses a singleton pool that rejects sizing options
+        kwargs = pool.engine_kwargs()
+    engine = create_engine(database_uri, echo=echo, future=True, **kwargs)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    return engine
+
+
+def get_engine(
+    database_uri: str, echo: bool = False, pool: Optional[PoolSettings] = None
+) -> Engine:
+    """Return the shared engine for `database_uri`, creating it on first use.
+
+    `pool` only applies when the engine is created; later callers share the
+    already configured pool.
+    """
+    if _is_memory_sqlite(database_uri):
+        return _create(database_uri, echo, pool)
+    key = (database_uri, echo)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = _create(database_uri, echo, pool)
+        return engine
+
+
+def pool_status() -> List[Dict[str, Any]]:
+    """Describe the pool of every registered engine."""
+    with _lock:
+        engines = list(_engines.values())
+    out: List[Dict[str, Any]] = []
+    for engine in engines:
+        pool = engine.pool
+        stats: Dict[str, Any] = {
+            "url": engine.url.render_as_string(hide_password=True),
+            "pool": type(pool).__name__,
+            "status": pool.status(),
+        }
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        out.append(stats)
+    return out
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection and forget all registered engines.
+
+    Call this after forking worker processes or between test runs.
+    """
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def after_fork() -> None:
+    """Give a freshly forked process its own connection pools.
+
+    Engines created before the fork (e.g. by a preloading server master)
+    stay registered, so repositories keep working, but the pooled
+    connections inherited from the parent are dropped without being closed:
+    the parent still owns those sockets. Call this first thing in every
+    worker process.
+    """
+    with _lock:
+        engines = list(_engines.values())
+    for engine in engines:
+        engine.dispose(close=False)
@@ -0,0 +1,77 @@
+"""Geographic helpers for nearby-place queries.
+
+A radius query is answered in two steps: repositories return the places
+inside a latitude/longitude `BoundingBox` using their indexes, then the
+exact great-circle distance (`haversine_km`) removes the box corners.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from typing import Any, List, Tuple
+
+from sqlalchemy import or_
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    min_lat: float
+    max_lat: float
+    # one range, or two when the box crosses the antimeridian
+    lon_ranges: Tuple[Tuple[float, float], ...]
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not self.min_lat <= lat <= self.max_lat:
+            return False
+        return any(lo <= lon <= hi for lo, hi in self.lon_ranges)
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> BoundingBox:
+    """Smallest lat/lon box containing every point within `radius_km`."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # the circle contains a pole: every longitude is reachable
+        return BoundingBox(max(min_lat, -90.0), min(max_lat, 90.0), ((-180.0, 180.0),))
+    # widest longitude span is at the latitude closest to a pole
+    dlon = math.degrees(
+        math.asin(
+            min(
+                1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+            )
+        )
+    )
+    lo, hi = lon - dlon, lon + dlon
+    if dlon >= 180 or hi - lo >= 360:
+        ranges: Tuple[Tuple[float, float], ...] = ((-180.0, 180.0),)
+    elif lo < -180:
+        ranges = ((lo + 360, 180.0), (-180.0, hi))
+    elif hi > 180:
+        ranges = ((lo, 180.0), (-180.0, hi - 360))
+    else:
+        ranges = ((lo, hi),)
+    return BoundingBox(min_lat, max_lat, ranges)
+
+
+def box_clauses(box: BoundingBox, latitude, longitude) -> List[Any]:
+    """SQL WHERE clauses selecting rows whose coordinates lie in `box`."""
+    lon_clauses = [longitude.between(lo, hi) for lo, hi in box.lon_ranges]
+    return [
+        latitude.between(box.min_lat, box.max_lat),
+        lon_clauses[0] if len(lon_clauses) == 1 else or_(*lon_clauses),
+    ]
@@ -3,14 +3,35 @@
 This repository stores objects as dicts keyed by class name and id.
 It is intentionally lightweight so it can be swapped for a DB-backed
 repository in Part 3 with minimal changes to the facade.
+
+Secondary indexes (see `indexes.IndexSpec`) are kept in sync on every
+write so `find_by`, `find_in` and `find_range` avoid full scans on the
+indexed fields.
+
+Objects are stored as read-only `records.FrozenRecord` values and handed
+out as they are, without copying; every write stores a new record.
+
+Every public method holds the repository's lock, so one instance can be
+shared by request threads.
+
+Inside a unit of work (see `unit_of_work`) every write registers a
+rollback hook that puts the previous record back, so a rolled back unit
+leaves the repository as it found it, as the SQL repositories do.
 """
 
 from __future__ import annotations
 
-from copy import deepcopy
 from datetime import datetime, timezone
+import functools
+import threading
 import uuid
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+
+from .geo import BoundingBox
+from .indexes import GeoGridIndex, HashIndex, IndexSpec, SortedIndex, build_index
+from .place_search import PlaceSearch
+from .records import freeze
+from .unit_of_work import current as _current_unit
 
 
 class NotFoundError(Exception):
@@ -21,23 +42,123 @@ class ValidationError(Exception):
     pass
 
 
+def _synchronized(method):
+    # run the method under the repository's lock
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
 def _now_iso() -> str:
     # Use timezone-aware UTC timestamps and keep the trailing Z for compatibility
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+# Lookups performed by the API: login/signup by email, reviews per place,
+# places per owner and the place search filters.
+DEFAULT_INDEXES = (
+    IndexSpec("User", "email", unique=True),
+    IndexSpec("Place", "user_id"),
+    IndexSpec("Place", "country"),
+    IndexSpec("Place", "price_by_night", kind="sorted"),
+    IndexSpec("Place", "max_guest", kind="sorted"),
+    IndexSpec("Place", "amenity_ids", kind="multi"),
+    IndexSpec("Place", "location", kind="geo"),
+    IndexSpec("Review", "place_id"),
+    IndexSpec("Review", "user_id"),
+)
+
+
 class InMemoryRepository:
-    def __init__(self) -> None:
+    def __init__(self, indexes: Optional[Iterable[IndexSpec]] = None) -> None:
         # storage: {cls_name: {id: obj_dict}}
         self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # secondary indexes: {cls_name: {field: index}}
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        # Every public method holds this lock: a write updates the objects
+        # and several indexes in steps that readers must not see half done,
+        # and `update_locked` reads and writes in one critical section.
+        self._lock = threading.RLock()
+        for spec in DEFAULT_INDEXES if indexes is None else indexes:
+            self.create_index(spec)
 
     def _ensure_cls(self, cls_name: str) -> None:
         if cls_name not in self._data:
             self._data[cls_name] = {}
+            # ordered id index backing keyset pagination in `list`
+            self._indexes.setdefault(cls_name, {}).setdefault(
+                "id", SortedIndex("id", unique=True)
+            )
 
     def _generate_id(self) -> str:
         return uuid.uuid4().hex
 
+    @_synchronized
+    def create_index(self, spec: IndexSpec) -> None:
+        """Declare a secondary index and build it over existing objects."""
+        index = build_index(spec)
+        self._ensure_cls(spec.cls_name)
+        for obj_id, obj in self._data[spec.cls_name].items():
+            index.check(obj_id, index.key(obj))
+            index.add(obj_id, index.key(obj))
+        self._indexes.setdefault(spec.cls_name, {})[spec.field] = index
+
+    def _index_check(self, cls_name: str, obj: Dict[str, Any]) -> None:
+        for index in self._indexes.get(cls_name, {}).values():
+            index.check(obj["id"], index.key(obj))
+
+    def _index_add(self, cls_name: str, obj: Dict[str, Any]) -> None:
+        for index in self._indexes.get(cls_name, {}).values():
+            index.add(obj["id"], index.key(obj))
+
+    def _index_remove(self, cls_name: str, obj: Dict[str, Any]) -> None:
+        for index in self._indexes.get(cls_name, {}).values():
+            index.remove(obj["id"], index.key(obj))
+
+    def _journal(
+        self,
+        cls_name: str,
+        obj_id: str,
+        old: Optional[Dict[str, Any]],
+        new: Optional[Dict[str, Any]],
+    ) -> None:
+        # undo the write if the current unit of work rolls back
+        uow = _current_unit()
+        if uow is not None:
+            uow.on_rollback(lambda: self._undo(cls_name, obj_id, old, new))
+
+    @_synchronized
+    def _undo(
+        self,
+        cls_name: str,
+        obj_id: str,
+        old: Optional[Dict[str, Any]],
+        new: Optional[Dict[str, Any]],
+    ) -> None:
+        store = self._data.get(cls_name, {})
+        if store.get(obj_id) is not new:
+            # written again since, by another thread; keep the later write
+            return
+        if new is not None:
+            del store[obj_id]
+            self._index_remove(cls_name, new)
+        if old is not None:
+            store[obj_id] = old
+            self._index_add(cls_name, old)
+
+    def _insert(self, cls_name: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a frozen `obj` under its own id, enforcing and updating indexes."""
+        obj = freeze(obj)
+        self._ensure_cls(cls_name)
+        self._index_check(cls_name, obj)
+        self._data[cls_name][obj["id"]] = obj
+        self._index_add(cls_name, obj)
+        return obj
+
+    @_synchronized
     def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(payload, dict):
             raise ValidationError("payload must be a dict")
@@ -45,23 +166,209 @@ class InMemoryRepository:
         self._ensure_cls(cls_name)
         obj_id = self._generate_id()
         now = _now_iso()
-        obj = deepcopy(payload)
+        obj = dict(payload)
         obj.pop("id", None)
         obj["id"] = obj_id
         obj["created_at"] = now
         obj["updated_at"] = now
-        self._data[cls_name][obj_id] = obj
-        return deepcopy(obj)
+        obj = self._insert(cls_name, obj)
+        self._journal(cls_name, obj_id, None, obj)
+        return obj
+
+    @_synchronized
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create several objects; none are stored if one of them is rejected."""
+        created: List[Dict[str, Any]] = []
+        try:
+            for payload in payloads:
+                created.append(self.create(cls_name, payload))
+        except Exception:
+            for obj in created:
+                self.delete(cls_name, obj["id"])
+            raise
+        return created
 
+    @_synchronized
     def get(self, cls_name: str, obj_id: str) -> Dict[str, Any] | None:
         self._ensure_cls(cls_name)
-        obj = self._data[cls_name].get(obj_id)
-        return deepcopy(obj) if obj is not None else None
+        return self._data[cls_name].get(obj_id)
+
+    @_synchronized
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return objects of `cls_name`.
+
+        With `limit` or `after`, return a page of objects in id order whose
+        id is greater than `after`, read from the id index.
+        """
+        self._ensure_cls(cls_name)
+        store = self._data[cls_name]
+        if limit is None and after is None:
+            return list(store.values())
+        ids = self._indexes[cls_name]["id"].after(after, limit)
+        return [store[obj_id] for obj_id in ids]
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every object of `cls_name` in id order, as `list` pages do."""
+        with self._lock:
+            self._ensure_cls(cls_name)
+            store = self._data[cls_name]
+            ids = list(self._indexes[cls_name]["id"].after())
+        for obj_id in ids:
+            obj = store.get(obj_id)
+            if obj is not None:
+                yield obj
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
+    @_synchronized
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Return the stored objects whose id is in `ids` (missing ids skipped)."""
         self._ensure_cls(cls_name)
-        return [deepcopy(v) for v in self._data[cls_name].values()]
+        store = self._data[cls_name]
+        out = []
+        for obj_id in dict.fromkeys(ids):
+            obj = store.get(obj_id)
+            if obj is not None:
+                out.append(obj)
+        return out
 
+    @_synchronized
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """Return objects whose `field` value is one of `values`.
+
+        Uses a hash index on `field` when one is declared, otherwise a
+        single pass over the class.
+        """
+        self._ensure_cls(cls_name)
+        wanted = dict.fromkeys(values)
+        if not wanted:
+            return []
+        store = self._data[cls_name]
+        index = self._indexes.get(cls_name, {}).get(field)
+        if isinstance(index, HashIndex):
+            return [store[obj_id] for value in wanted for obj_id in index.lookup(value)]
+        return [v for v in store.values() if v.get(field) in wanted]
+
+    def _candidates(self, cls_name: str, criteria: Dict[str, Any]):
+        """Stored objects that may match `criteria`, narrowed by an index."""
+        store = self._data[cls_name]
+        indexes = self._indexes.get(cls_name, {})
+        usable = [
+            (field, value)
+            for field, value in criteria.items()
+            if field in indexes and indexes[field].supports(value)
+        ]
+        if not usable:
+            return store.values()
+        field, value = min(usable, key=lambda fv: not indexes[fv[0]].unique)
+        return (store[obj_id] for obj_id in indexes[field].lookup(value))
+
+    @_synchronized
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        """Return objects whose fields equal all of `criteria`.
+
+        The most selective declared index (unique first) narrows the
+        candidates; remaining criteria are checked on those candidates only.
+        """
+        self._ensure_cls(cls_name)
+        return [
+            obj
+            for obj in self._candidates(cls_name, criteria)
+            if all(obj.get(k) == v for k, v in criteria.items())
+        ]
+
+    @_synchronized
+    def find_range(
+        self,
+        cls_name: str,
+        field: str,
+        low: Any = None,
+        high: Any = None,
+        reverse: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return objects with ``low <= field <= high`` ordered by `field`.
+
+        Requires a ``"sorted"`` index on `field`; without one the class is
+        scanned and sorted.
+        """
+        self._ensure_cls(cls_name)
+        store = self._data[cls_name]
+        index = self._indexes.get(cls_name, {}).get(field)
+        if index is not None and hasattr(index, "range"):
+            ids = index.range(low, high, reverse=reverse)
+            return [store[obj_id] for obj_id in ids]
+        matches = [
+            v
+            for v in store.values()
+            if v.get(field) is not None
+            and (low is None or v[field] >= low)
+            and (high is None or v[field] <= high)
+        ]
+        matches.sort(key=lambda v: v[field], reverse=reverse)
+        return matches
+
+    @_synchronized
+    def search_places(self, query: PlaceSearch) -> List[Dict[str, Any]]:
+        """Return one page of places matching `query`.
+
+        Each filter with an index yields a candidate id set; the smallest
+        set (or the intersection of the two smallest) is checked against
+        the full query, sorted and cut at the cursor and limit.
+        """
+        self._ensure_cls("Place")
+        store = self._data["Place"]
+        indexes = self._indexes.get("Place", {})
+        candidates: List[set] = []
+        if query.country is not None and "country" in indexes:
+            candidates.append(set(indexes["country"].lookup(query.country)))
+        if (
+            query.min_price is not None or query.max_price is not None
+        ) and "price_by_night" in indexes:
+            candidates.append(
+                set(indexes["price_by_night"].range(query.min_price, query.max_price))
+            )
+        if query.max_guest is not None and "max_guest" in indexes:
+            candidates.append(set(indexes["max_guest"].range(query.max_guest)))
+        if "amenity_ids" in indexes:
+            candidates.extend(
+                set(indexes["amenity_ids"].lookup(aid)) for aid in query.amenity_ids
+            )
+        if candidates:
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:2])
+            rows = (store[obj_id] for obj_id in ids)
+        else:
+            rows = store.values()
+        matches = [p for p in rows if query.matches(p) and query.is_after(p)]
+        if query.descending:
+            matches.sort(key=lambda p: p.get("id"))
+            matches.sort(key=lambda p: query.sort_key(p)[0], reverse=True)
+        else:
+            matches.sort(key=query.sort_key)
+        if query.limit is not None:
+            matches = matches[: query.limit]
+        return matches
+
+    @_synchronized
+    def find_in_box(self, box: BoundingBox) -> List[Dict[str, Any]]:
+        """Return places whose coordinates fall inside `box`."""
+        self._ensure_cls("Place")
+        store = self._data["Place"]
+        index = self._indexes["Place"].get("location")
+        if isinstance(index, GeoGridIndex):
+            return [store[obj_id] for obj_id in index.within(box)]
+        out = []
+        for place in store.values():
+            lat, lon = place.get("latitude"), place.get("longitude")
+            if lat is not None and lon is not None and box.contains(lat, lon):
+                out.append(place)
+        return out
+
+    @_synchronized
     def update(
         self, cls_name: str, obj_id: str, updates: Dict[str, Any]
     ) -> Dict[str, Any] | None:
@@ -70,31 +377,121 @@ class InMemoryRepository:
         self._ensure_cls(cls_name)
         if obj_id not in self._data[cls_name]:
             return None
-        obj = self._data[cls_name][obj_id]
+        old = self._data[cls_name][obj_id]
+        obj = dict(old)
         for k, v in updates.items():
             if k in ("id", "created_at"):
                 continue
-            obj[k] = deepcopy(v)
+            obj[k] = v
         obj["updated_at"] = _now_iso()
-        return deepcopy(obj)
+        obj = freeze(obj)
+        self._index_check(cls_name, obj)
+        self._index_remove(cls_name, old)
+        self._data[cls_name][obj_id] = obj
+        self._index_add(cls_name, obj)
+        self._journal(cls_name, obj_id, old, obj)
+        return obj
+
+    @_synchronized
+    def update_locked(
+        self,
+        cls_name: str,
+        ids: Iterable[str],
+        compute: Callable[[Dict[str, Dict[str, Any]]], Dict[str, Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Atomically read the objects with `ids` and apply ``compute(current)``.
+
+        `compute` gets ``{id: object}`` for the ids that exist and returns
+        ``{id: changes}``. Concurrent calls run one after the other, so
+        changes derived from the current values are never lost.
+        """
+        self._ensure_cls(cls_name)
+        store = self._data[cls_name]
+        current = {i: store[i] for i in dict.fromkeys(ids) if i in store}
+        changes = compute(current)
+        return [
+            self.update(cls_name, obj_id, updates)
+            for obj_id, updates in changes.items()
+            if obj_id in current
+        ]
+
+    def _restore(self, cls_name: str, obj_id: str, old: Dict[str, Any]) -> None:
+        current = self._data[cls_name].pop(obj_id, None)
+        if current is not None:
+            self._index_remove(cls_name, current)
+        self._data[cls_name][obj_id] = old
+        self._index_add(cls_name, old)
 
+    @_synchronized
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Apply ``{id: changes}``; unknown ids are skipped.
+
+        Either every update is applied or, if one is rejected, none is.
+        """
+        self._ensure_cls(cls_name)
+        previous: List[tuple] = []
+        out: List[Dict[str, Any]] = []
+        try:
+            for obj_id, changes in updates.items():
+                old = self._data[cls_name].get(obj_id)
+                obj = self.update(cls_name, obj_id, changes)
+                if obj is not None:
+                    previous.append((obj_id, old))
+                    out.append(obj)
+        except Exception:
+            for obj_id, old in reversed(previous):
+                self._restore(cls_name, obj_id, old)
+            raise
+        return out
+
+    @_synchronized
     def delete(self, cls_name: str, obj_id: str) -> bool:
         self._ensure_cls(cls_name)
-        if obj_id in self._data[cls_name]:
-            del self._data[cls_name][obj_id]
-            return True
-        return False
+        obj = self._data[cls_name].pop(obj_id, None)
+        if obj is None:
+            return False
+        self._index_remove(cls_name, obj)
+        self._journal(cls_name, obj_id, obj, None)
+        return True
 
+    @_synchronized
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        """Delete the objects with `ids`; return how many existed."""
+        return sum(self.delete(cls_name, obj_id) for obj_id in dict.fromkeys(ids))
+
+    @_synchronized
     def clear(self) -> None:
         self._data.clear()
+        for indexes in self._indexes.values():
+            for index in indexes.values():
+                index.clear()
 
+    @_synchronized
     def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
         """Return all stored objects grouped by class name."""
-        return {
-            k: [deepcopy(v) for v in vals.values()] for k, vals in self._data.items()
-        }
+        return {k: list(vals.values()) for k, vals in self._data.items()}
+
+    @_synchronized
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return number of instances for a given class matching `criteria`.
 
-    def count(self, cls_name: str) -> int:
-        """Return number of instances for a given class."""
+        Without criteria this is the size of the per-class dict, which is
+        kept current by every write. A single indexed criterion is answered
+        from the index; otherwise matches are counted without copying.
+        """
         self._ensure_cls(cls_name)
-        return len(self._data[cls_name])
+        store = self._data[cls_name]
+        if not criteria:
+            return len(store)
+        if len(criteria) == 1:
+            ((field, value),) = criteria.items()
+            index = self._indexes.get(cls_name, {}).get(field)
+            if index is not None and index.supports(value):
+                return index.count(value)
+        return sum(
+            1
+            for obj in self._candidates(cls_name, criteria)
+            if all(obj.get(k) == v for k, v in criteria.items())
+        )
@@ -0,0 +1,345 @@
+"""Secondary index structures used by `InMemoryRepository`.
+
+Indexes are declared with `IndexSpec` and map a field value to the ids of
+the objects holding it. Four kinds are available:
+
+- ``"hash"``: dict based, O(1) equality lookups.
+- ``"sorted"``: bisect based, O(log n) equality and range lookups.
+- ``"multi"``: for list fields; maps each element to the objects whose
+  list contains it (e.g. places per amenity id).
+- ``"geo"``: a latitude/longitude grid over the ``latitude`` and
+  ``longitude`` fields, answering bounding-box queries.
+
+Hash and sorted indexes can be declared ``unique``; inserting a second
+object with the same value then raises `DuplicateKeyError`. Multi-value
+and geo indexes cannot, and `build_index` rejects such a spec with
+`ValueError`. ``None`` values are never indexed, mirroring SQL where NULLs
+do not collide in unique indexes.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+import math
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class DuplicateKeyError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    cls_name: str
+    field: str
+    unique: bool = False
+    kind: str = "hash"
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class HashIndex:
+    """Equality index: value -> ordered set of object ids."""
+
+    def __init__(self, field: str, unique: bool = False) -> None:
+        self.field = field
+        self.unique = unique
+        # buckets keep insertion order so lookups are deterministic
+        self._buckets: Dict[Any, Dict[str, None]] = {}
+
+    def supports(self, value: Any) -> bool:
+        return value is not None and _is_hashable(value)
+
+    def key(self, obj: Dict[str, Any]) -> Any:
+        return obj.get(self.field)
+
+    def check(self, obj_id: str, value: Any) -> None:
+        if not self.unique or not self.supports(value):
+            return
+        bucket = self._buckets.get(value)
+        if bucket and obj_id not in bucket:
+            raise DuplicateKeyError(f"{self.field} {value!r} already exists")
+
+    def add(self, obj_id: str, value: Any) -> None:
+        if not self.supports(value):
+            return
+        self._buckets.setdefault(value, {})[obj_id] = None
+
+    def remove(self, obj_id: str, value: Any) -> None:
+        if not self.supports(value):
+            return
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.pop(obj_id, None)
+        if not bucket:
+            del self._buckets[value]
+
+    def lookup(self, value: Any) -> List[str]:
+        if not self.supports(value):
+            return []
+        return list(self._buckets.get(value, ()))
+
+    def count(self, value: Any) -> int:
+        if not self.supports(value):
+            return 0
+        return len(self._buckets.get(value, ()))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+_key = itemgetter(0)
+
+
+class SortedIndex:
+    """Ordered index over (value, id) pairs supporting range scans.
+
+    Values of a field must be mutually comparable (all numbers or all
+    strings); values that cannot be ordered against the index are skipped.
+    """
+
+    def __init__(self, field: str, unique: bool = False) -> None:
+        self.field = field
+        self.unique = unique
+        self._entries: List[Tuple[Any, str]] = []
+
+    def supports(self, value: Any) -> bool:
+        if value is None:
+            return False
+        if not self._entries:
+            return True
+        try:
+            value < self._entries[0][0]
+        except TypeError:
+            return False
+        return True
+
+    def _ids_between(self, lo: int, hi: int) -> List[str]:
+        return [obj_id for _, obj_id in self._entries[lo:hi]]
+
+    def key(self, obj: Dict[str, Any]) -> Any:
+        return obj.get(self.field)
+
+    def check(self, obj_id: str, value: Any) -> None:
+        if not self.unique or not self.supports(value):
+            return
+        ids = self.lookup(value)
+        if ids and ids != [obj_id]:
+            raise DuplicateKeyError(f"{self.field} {value!r} already exists")
+
+    def add(self, obj_id: str, value: Any) -> None:
+        if self.supports(value):
+            insort(self._entries, (value, obj_id))
+
+    def remove(self, obj_id: str, value: Any) -> None:
+        if not self.supports(value):
+            return
+        pos = bisect_left(self._entries, (value, obj_id))
+        if pos < len(self._entries) and self._entries[pos] == (value, obj_id):
+            del self._entries[pos]
+
+    def lookup(self, value: Any) -> List[str]:
+        if not self.supports(value):
+            return []
+        lo = bisect_left(self._entries, value, key=_key)
+        hi = bisect_right(self._entries, value, lo, key=_key)
+        return self._ids_between(lo, hi)
+
+    def count(self, value: Any) -> int:
+        if not self.supports(value):
+            return 0
+        lo = bisect_left(self._entries, value, key=_key)
+        return bisect_right(self._entries, value, lo, key=_key) - lo
+
+    def range(
+        self,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+        reverse: bool = False,
+    ) -> List[str]:
+        """Return ids with ``low <= value <= high`` in value order."""
+        if (low is not None and not self.supports(low)) or (
+            high is not None and not self.supports(high)
+        ):
+            return []
+        lo = 0 if low is None else bisect_left(self._entries, low, key=_key)
+        hi = (
+            len(self._entries)
+            if high is None
+            else bisect_right(self._entries, high, key=_key)
+        )
+        ids = self._ids_between(lo, hi)
+        if reverse:
+            ids.reverse()
+        return ids
+
+    def after(self, value: Optional[Any] = None, limit: Optional[int] = None):
+        """Return up to `limit` ids whose value is strictly above `value`."""
+        if value is not None and not self.supports(value):
+            return []
+        lo = 0 if value is None else bisect_right(self._entries, value, key=_key)
+        hi = len(self._entries) if limit is None else lo + limit
+        return self._ids_between(lo, hi)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class MultiValueIndex:
+    """Element index over a list field: element -> ids containing it.
+
+    `find_by` compares whole values, so this index never answers it
+    (`supports` is False); use `lookup` with a single element instead.
+    """
+
+    def __init__(self, field: str, unique: bool = False) -> None:
+        if unique:
+            raise ValueError("multi-value indexes cannot be unique")
+        self.field = field
+        self.unique = False
+        self._buckets: Dict[Any, Dict[str, None]] = {}
+
+    def supports(self, value: Any) -> bool:
+        return False
+
+    @staticmethod
+    def _elements(value: Any) -> List[Any]:
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return []
+        return [v for v in value if v is not None and _is_hashable(v)]
+
+    def key(self, obj: Dict[str, Any]) -> Any:
+        return obj.get(self.field)
+
+    def check(self, obj_id: str, value: Any) -> None:
+        return None
+
+    def add(self, obj_id: str, value: Any) -> None:
+        for element in self._elements(value):
+            self._buckets.setdefault(element, {})[obj_id] = None
+
+    def remove(self, obj_id: str, value: Any) -> None:
+        for element in self._elements(value):
+            bucket = self._buckets.get(element)
+            if bucket is None:
+                continue
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del self._buckets[element]
+
+    def lookup(self, value: Any) -> List[str]:
+        if value is None or not _is_hashable(value):
+            return []
+        return list(self._buckets.get(value, ()))
+
+    def count(self, value: Any) -> int:
+        return len(self.lookup(value))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class GeoGridIndex:
+    """Uniform grid over (latitude, longitude) for bounding-box lookups.
+
+    Objects are bucketed in `cell_deg` x `cell_deg` cells, so a box query
+    only visits the cells it overlaps. The spec field is a label; the
+    coordinates are always read from ``latitude`` and ``longitude``.
+    """
+
+    def __init__(self, field: str, unique: bool = False, cell_deg: float = 0.5):
+        if unique:
+            raise ValueError("geo indexes cannot be unique")
+        self.field = field
+        self.unique = False
+        self.cell_deg = cell_deg
+        self._cells: Dict[Tuple[int, int], Dict[str, Tuple[float, float]]] = {}
+
+    def supports(self, value: Any) -> bool:
+        return False
+
+    def key(self, obj: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        lat, lon = obj.get("latitude"), obj.get("longitude")
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            return None
+        return (float(lat), float(lon))
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def check(self, obj_id: str, value: Any) -> None:
+        return None
+
+    def add(self, obj_id: str, value: Any) -> None:
+        if value is None:
+            return
+        self._cells.setdefault(self._cell(*value), {})[obj_id] = value
+
+    def remove(self, obj_id: str, value: Any) -> None:
+        if value is None:
+            return
+        key = self._cell(*value)
+        cell = self._cells.get(key)
+        if cell is None:
+            return
+        cell.pop(obj_id, None)
+        if not cell:
+            del self._cells[key]
+
+    def lookup(self, value: Any) -> List[str]:
+        return []
+
+    def count(self, value: Any) -> int:
+        return 0
+
+    def within(self, box) -> List[str]:
+        """Return ids of indexed objects inside the `geo.BoundingBox` box."""
+        lat_lo, _ = self._cell(box.min_lat, 0.0)
+        lat_hi, _ = self._cell(box.max_lat, 0.0)
+        cells = []
+        for lon_min, lon_max in box.lon_ranges:
+            _, lon_lo = self._cell(0.0, lon_min)
+            _, lon_hi = self._cell(0.0, lon_max)
+            cells.append((lon_lo, lon_hi))
+        visits = sum(hi - lo + 1 for lo, hi in cells) * (lat_hi - lat_lo + 1)
+        if visits > len(self._cells):
+            # a huge box: walking the occupied cells is cheaper
+            buckets = self._cells.values()
+        else:
+            buckets = [
+                self._cells[(la, lo)]
+                for la in range(lat_lo, lat_hi + 1)
+                for lon_lo, lon_hi in cells
+                for lo in range(lon_lo, lon_hi + 1)
+                if (la, lo) in self._cells
+            ]
+        return [
+            obj_id
+            for bucket in buckets
+            for obj_id, (lat, lon) in bucket.items()
+            if box.contains(lat, lon)
+        ]
+
+    def clear(self) -> None:
+        self._cells.clear()
+
+
+def build_index(spec: IndexSpec):
+    if spec.kind == "hash":
+        return HashIndex(spec.field, unique=spec.unique)
+    if spec.kind == "sorted":
+        return SortedIndex(spec.field, unique=spec.unique)
+    if spec.kind == "multi":
+        return MultiValueIndex(spec.field, unique=spec.unique)
+    if spec.kind == "geo":
+        return GeoGridIndex(spec.field, unique=spec.unique)
+    raise ValueError(f"unknown index kind: {spec.kind!r}")
@@ -0,0 +1,71 @@
+"""Timing wrapper around any repository.
+
+`InstrumentedRepository` passes every call through to the wrapped
+repository and reports how long the repository methods took, labelled with
+the class name and method, to an ``observe(seconds, cls_name, method)``
+callback (the app passes a metrics histogram). Methods without a class
+argument that only serve places (`search_places`, `find_in_box`) are
+reported as ``Place``. `list_all` and `clear` use an empty label.
+`stream` is lazy and is passed through untimed.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+_TIMED = frozenset(
+    {
+        "create",
+        "get",
+        "list",
+        "update",
+        "delete",
+        "clear",
+        "list_all",
+        "count",
+        "get_many",
+        "find_in",
+        "find_by",
+        "search_places",
+        "find_in_box",
+        "create_many",
+        "update_many",
+        "update_locked",
+        "delete_many",
+    }
+)
+_PLACE_ONLY = frozenset({"search_places", "find_in_box"})
+
+
+class InstrumentedRepository:
+    def __init__(self, repo, observe: Callable[[float, str, str], None]) -> None:
+        self.repo = repo
+        self._observe = observe
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.repo, name)
+        if name not in _TIMED:
+            # engine handles and backend-specific helpers of the wrapped repository
+            return attr
+        observe = self._observe
+        perf_counter = time.perf_counter
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                if name in _PLACE_ONLY:
+                    cls_name = "Place"
+                elif args and isinstance(args[0], str):
+                    cls_name = args[0]
+                else:
+                    cls_name = kwargs.get("cls_name", "")
+                observe(perf_counter() - start, cls_name, name)
+
+        timed.__name__ = name
+        timed.__doc__ = attr.__doc__
+        # later lookups find the wrapper without going through __getattr__
+        setattr(self, name, timed)
+        return timed
@@ -20,8 +20,12 @@ from sqlalchemy import (
     Table,
     Integer,
     Float,
+    Index,
     Text,
 )
+from sqlalchemy.schema import CreateIndex
+
+from .records import freeze
 
 Base = declarative_base()
 
@@ -57,6 +61,10 @@ class BaseModelMixin:
             )
         return out
 
+    def to_record(self) -> Dict[str, Any]:
+        # Read-only snapshot returned by the ORM repositories
+        return freeze(self.to_dict())
+
 
 class User(Base, BaseModelMixin):
     __tablename__ = "users"
@@ -79,10 +87,11 @@ class Place(Base, BaseModelMixin):
     country = Column(String, nullable=True)
     number_rooms = Column(Integer, nullable=True)
     number_bathrooms = Column(Integer, nullable=True)
-    max_guest = Column(Integer, nullable=True)
-    price_by_night = Column(Integer, nullable=True)
+    max_guest = Column(Integer, nullable=True, index=True)
+    price_by_night = Column(Integer, nullable=True, index=True)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    image = Column(String, nullable=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     # relationship to owner
     user = relationship("User", back_populates="places")
@@ -95,6 +104,20 @@ class Place(Base, BaseModelMixin):
         "Amenity", secondary=lambda: place_amenity_table, back_populates="places"
     )
 
+    # place search: country filter with a price range or price ordering
+    # and the bounding-box prefilter of nearby queries
+    __table_args__ = (
+        Index("ix_places_country_price", "country", "price_by_night"),
+        Index("ix_places_location", "latitude", "longitude"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Expose the many-to-many link as the `amenity_ids` list used by the
+        # business layer; must be called while the row is session-bound.
+        out = super().to_dict()
+        out["amenity_ids"] = [a.id for a in self.amenities]
+        return out
+
 
 class Review(Base, BaseModelMixin):
     __tablename__ = "reviews"
@@ -121,4 +144,19 @@ place_amenity_table = Table(
     Base.metadata,
     Column("place_id", String, ForeignKey("places.id"), primary_key=True),
     Column("amenity_id", String, ForeignKey("amenities.id"), primary_key=True),
+    # the primary key covers place -> amenities; this covers amenity -> places
+    Index("ix_place_amenity_amenity_id", "amenity_id", "place_id"),
 )
+
+
+def create_model_schema(engine) -> None:
+    """Create the ORM tables and any of their indexes that are missing.
+
+    `create_all` skips indexes of tables that already exist, so indexes
+    added after a database was first created are created here explicitly.
+    """
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
@@ -0,0 +1,156 @@
+"""One-shot migration of JSON `objects` rows into the typed ORM tables.
+
+`SQLAlchemyRepository` stores every entity as a JSON blob in the generic
+`objects` table. `migrate_objects_to_tables` copies the `User`, `Amenity`,
+`Place` and `Review` rows into `users`, `amenities`, `places` (plus
+`place_amenity`) and `reviews` so the database can be served by the
+per-entity repositories (``STORAGE_MODE = "tables"``).
+
+The migration is idempotent: rows whose id already exists in the target
+table are skipped, as are rows that would violate a constraint (missing
+owner, duplicate email, ...). Those are counted in the returned report.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from .models import (
+    Amenity as ORMAmenity,
+    Place as ORMPlace,
+    Review as ORMReview,
+    User as ORMUser,
+    create_model_schema,
+    place_amenity_table,
+)
+from .sqlalchemy_repository import ObjectStore, create_object_store_schema
+from .utils import chunked
+
+# Parents first so foreign keys can be checked against migrated rows.
+MIGRATION_ORDER = ("User", "Amenity", "Place", "Review")
+
+_MODELS = {
+    "User": ORMUser,
+    "Amenity": ORMAmenity,
+    "Place": ORMPlace,
+    "Review": ORMReview,
+}
+
+_REQUIRED = {
+    "User": ("email", "password"),
+    "Amenity": (),
+    "Place": ("user_id",),
+    "Review": ("user_id", "place_id"),
+}
+
+_REFERENCES = {
+    "Place": {"user_id": ORMUser},
+    "Review": {"user_id": ORMUser, "place_id": ORMPlace},
+}
+
+
+def _existing(session, column, values) -> Set[Any]:
+    values = [v for v in values if v is not None]
+    if not values:
+        return set()
+    stmt = select(column).where(column.in_(values))
+    return set(session.execute(stmt).scalars())
+
+
+def _to_row(model, obj: ObjectStore) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for column in model.__table__.columns:
+        if column.name == "id":
+            row["id"] = obj.id
+        elif column.name in ("created_at", "updated_at"):
+            row[column.name] = getattr(obj, column.name)
+        else:
+            value = obj.data.get(column.name)
+            if value is None and not column.nullable:
+                value = False if column.name == "is_admin" else ""
+            row[column.name] = value
+    return row
+
+
+def migrate_objects_to_tables(
+    engine, delete_source: bool = False, batch_size: int = 500
+) -> Dict[str, Dict[str, int]]:
+    """Copy typed entities out of `objects`; return per-class counters."""
+    create_model_schema(engine)
+    create_object_store_schema(engine)
+    Session = sessionmaker(bind=engine, future=True)
+    report: Dict[str, Dict[str, int]] = {}
+
+    with Session() as session:
+        for cls_name in MIGRATION_ORDER:
+            model = _MODELS[cls_name]
+            stats = {"migrated": 0, "skipped_existing": 0, "skipped_invalid": 0}
+            report[cls_name] = stats
+            ids = list(
+                session.execute(
+                    select(ObjectStore.id).where(ObjectStore.cls_name == cls_name)
+                ).scalars()
+            )
+            for batch in chunked(ids, batch_size):
+                objs = list(
+                    session.execute(
+                        select(ObjectStore).where(ObjectStore.id.in_(batch))
+                    ).scalars()
+                )
+                present = _existing(session, model.id, batch)
+                refs = {
+                    field: _existing(
+                        session, target.id, {o.data.get(field) for o in objs}
+                    )
+                    for field, target in _REFERENCES.get(cls_name, {}).items()
+                }
+                emails: Set[str] = set()
+                if cls_name == "User":
+                    emails = _existing(
+                        session, ORMUser.email, {o.data.get("email") for o in objs}
+                    )
+
+                rows: List[Dict[str, Any]] = []
+                links: List[Dict[str, str]] = []
+                done: List[str] = []
+                for obj in objs:
+                    data = obj.data or {}
+                    if obj.id in present:
+                        stats["skipped_existing"] += 1
+                        done.append(obj.id)
+                        continue
+                    if any(not data.get(f) for f in _REQUIRED[cls_name]) or any(
+                        data.get(f) not in known for f, known in refs.items()
+                    ):
+                        stats["skipped_invalid"] += 1
+                        continue
+                    if cls_name == "User":
+                        if data["email"] in emails:
+                            stats["skipped_invalid"] += 1
+                            continue
+                        emails.add(data["email"])
+                    rows.append(_to_row(model, obj))
+                    if cls_name == "Place":
+                        links.extend(
+                            {"place_id": obj.id, "amenity_id": aid}
+                            for aid in dict.fromkeys(data.get("amenity_ids") or [])
+                        )
+                    done.append(obj.id)
+
+                if rows:
+                    session.execute(insert(model.__table__), rows)
+                    stats["migrated"] += len(rows)
+                if links:
+                    known = _existing(
+                        session, ORMAmenity.id, {link["amenity_id"] for link in links}
+                    )
+                    links = [link for link in links if link["amenity_id"] in known]
+                    if links:
+                        session.execute(insert(place_amenity_table), links)
+                if delete_source and done:
+                    session.execute(delete(ObjectStore).where(ObjectStore.id.in_(done)))
+                session.commit()
+    return report
@@ -1,103 +1,290 @@
 """Place repository implemented with SQLAlchemy ORM.
 
-Basic CRUD for Place model. No relationships are added here.
+Basic CRUD for Place model. The business-level `amenity_ids` list is
+stored through the `place_amenity` association table.
 """
 
 from __future__ import annotations
 
-from copy import deepcopy
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+import uuid
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import selectinload, sessionmaker
 
-from .models import Place as ORMPlace
+from .models import Amenity as ORMAmenity, Place as ORMPlace, place_amenity_table
+from .engine import get_engine
+from .geo import BoundingBox, box_clauses
+from .place_search import PlaceSearch, sql_filters, sql_keyset
+from .unit_of_work import open_session
+from .utils import chunked, column_criteria, load_by_ids, paginate
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def _select_places():
+    # load amenity links for all rows in one extra query instead of per row
+    return select(ORMPlace).options(selectinload(ORMPlace.amenities))
+
+
+def _get_place(session, obj_id: str) -> Optional[ORMPlace]:
+    # Session.get serves rows already loaded in a unit of work without SQL
+    return session.get(ORMPlace, obj_id, options=[selectinload(ORMPlace.amenities)])
+
+
 class PlaceRepository:
-    def __init__(self, database_uri: str = "sqlite:///hbnb_dev.db", echo: bool = False):
-        self._engine = create_engine(database_uri, echo=echo, future=True)
+    def __init__(
+        self,
+        database_uri: str = "sqlite:///hbnb_dev.db",
+        echo: bool = False,
+        engine=None,
+    ):
+        # repositories on the same database share one engine and pool
+        self._engine = engine or get_engine(database_uri, echo=echo)
         self._Session = sessionmaker(bind=self._engine, future=True)
 
     def _session(self):
-        return self._Session()
+        # joins the active unit of work, if any
+        return open_session(self._engine, self._Session)
+
+    def _amenities(self, session, amenity_ids) -> List[ORMAmenity]:
+        # unknown amenity ids are dropped, as the API already ignores them
+        ids = [a for a in (amenity_ids or []) if a]
+        if not ids:
+            return []
+        stmt = select(ORMAmenity).where(ORMAmenity.id.in_(ids))
+        by_id = {a.id: a for a in session.execute(stmt).scalars()}
+        return [by_id[a] for a in dict.fromkeys(ids) if a in by_id]
+
+    def _new_row(self, session, payload: Dict[str, Any]) -> ORMPlace:
+        u = ORMPlace()
+        u.id = payload.get("id") or uuid.uuid4().hex
+        u.name = payload.get("name") or ""
+        u.description = payload.get("description") or ""
+        u.country = payload.get("country") or ""
+        u.number_rooms = payload.get("number_rooms", 0)
+        u.number_bathrooms = payload.get("number_bathrooms", 0)
+        u.max_guest = payload.get("max_guest", 0)
+        u.price_by_night = payload.get("price_by_night", 0)
+        u.latitude = payload.get("latitude")
+        u.longitude = payload.get("longitude")
+        u.image = payload.get("image") or ""
+        u.user_id = payload.get("user_id")
+        u.amenities = self._amenities(session, payload.get("amenity_ids"))
+        now = _now_iso()
+        u.created_at = u.updated_at = datetime.fromisoformat(now.replace("Z", "+00:00"))
+        return u
 
     def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         session = self._session()
         try:
-            u = ORMPlace()
-            for k in ("id", "created_at", "updated_at"):
-                if k in payload:
-                    setattr(u, k, payload[k])
-            u.name = payload.get("name") or ""
-            u.description = payload.get("description") or ""
-            u.number_rooms = payload.get("number_rooms", 0)
-            u.number_bathrooms = payload.get("number_bathrooms", 0)
-            u.max_guest = payload.get("max_guest", 0)
-            u.price_by_night = payload.get("price_by_night", 0)
-            u.latitude = payload.get("latitude")
-            u.longitude = payload.get("longitude")
-            u.user_id = payload.get("user_id")
-            u.amenity_ids = payload.get("amenity_ids") or []
-            now = _now_iso()
-            u.created_at = u.updated_at = datetime.fromisoformat(
-                now.replace("Z", "+00:00")
-            )
+            u = self._new_row(session, payload)
             session.add(u)
+            session.flush()
+            out = u.to_record()
+            session.commit()
+            return out
+        finally:
+            session.close()
+
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert several places and their amenity links in one flush.
+
+        The amenities of all payloads are loaded with one `IN` query.
+        """
+        payloads = list(payloads)
+        session = self._session()
+        try:
+            wanted = [a for p in payloads for a in (p.get("amenity_ids") or []) if a]
+            by_id = load_by_ids(session, select(ORMAmenity), ORMAmenity.id, wanted)
+            rows = []
+            for payload in payloads:
+                # resolved from the preloaded amenities, without a query
+                row = self._new_row(session, dict(payload, amenity_ids=None))
+                row.amenities = [
+                    by_id[a]
+                    for a in dict.fromkeys(payload.get("amenity_ids") or [])
+                    if a in by_id
+                ]
+                rows.append(row)
+            session.add_all(rows)
+            session.flush()
+            out = [row.to_record() for row in rows]
             session.commit()
-            return u.to_dict()
+            return out
         finally:
             session.close()
 
     def get(self, cls_name: str, obj_id: str) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMPlace).where(ORMPlace.id == obj_id)
-            row = session.execute(stmt).scalars().first()
-            return deepcopy(row.to_dict()) if row else None
+            row = _get_place(session, obj_id)
+            return row.to_record() if row else None
         finally:
             session.close()
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMPlace)
+            stmt = paginate(_select_places(), ORMPlace.id, limit, after)
             rows = session.execute(stmt).scalars().all()
-            return [deepcopy(r.to_dict()) for r in rows]
+            return [r.to_record() for r in rows]
+        finally:
+            session.close()
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every row in id order, fetching `batch_size` rows at a time.
+
+        Uses its own session outside any unit of work, so rows already
+        yielded are not kept alive by it.
+        """
+        session = self._Session()
+        try:
+            stmt = (
+                _select_places()
+                .order_by(ORMPlace.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in session.execute(stmt).scalars():
+                yield row.to_record()
+        finally:
+            session.close()
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(ids):
+                stmt = _select_places().where(ORMPlace.id.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        column = getattr(ORMPlace, field, None)
+        if column is None:
+            return []
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(values):
+                stmt = _select_places().where(column.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        clauses = column_criteria(ORMPlace, criteria)
+        if clauses is None:
+            return []
+        session = self._session()
+        try:
+            rows = session.execute(_select_places().where(*clauses)).scalars().all()
+            return [r.to_record() for r in rows]
         finally:
             session.close()
 
+    def search_places(self, query: PlaceSearch) -> List[Dict[str, Any]]:
+        """Return one page of places matching `query` in a single query.
+
+        Amenities are matched all-of through a grouped `place_amenity`
+        subquery; the scalar filters use the `places` column indexes.
+        """
+        where, order = sql_keyset(query, ORMPlace.id, ORMPlace.price_by_night)
+        where += sql_filters(
+            query, ORMPlace.country, ORMPlace.price_by_night, ORMPlace.max_guest
+        )
+        amenity_ids = list(dict.fromkeys(query.amenity_ids))
+        if amenity_ids:
+            link = place_amenity_table.c
+            having_all = (
+                select(link.place_id)
+                .where(link.amenity_id.in_(amenity_ids))
+                .group_by(link.place_id)
+                .having(func.count() == len(amenity_ids))
+            )
+            where.append(ORMPlace.id.in_(having_all))
+        stmt = _select_places().where(*where).order_by(*order)
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit)
+        session = self._session()
+        try:
+            return [r.to_record() for r in session.execute(stmt).scalars()]
+        finally:
+            session.close()
+
+    def find_in_box(self, box: BoundingBox) -> List[Dict[str, Any]]:
+        """Return places inside `box` using the (latitude, longitude) index."""
+        stmt = _select_places().where(
+            *box_clauses(box, ORMPlace.latitude, ORMPlace.longitude)
+        )
+        session = self._session()
+        try:
+            return [r.to_record() for r in session.execute(stmt).scalars()]
+        finally:
+            session.close()
+
+    def _apply(self, session, row: ORMPlace, updates: Dict[str, Any]) -> None:
+        for k, v in updates.items():
+            if k in ("id", "created_at", "updated_at"):
+                continue
+            if k == "amenity_ids":
+                row.amenities = self._amenities(session, v)
+            elif hasattr(row, k):
+                setattr(row, k, v)
+        row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+
     def update(
         self, cls_name: str, obj_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMPlace).where(ORMPlace.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = _get_place(session, obj_id)
             if row is None:
                 return None
-            for k, v in updates.items():
-                if k in ("id", "created_at"):
-                    continue
-                if hasattr(row, k):
-                    setattr(row, k, v)
-            row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+            self._apply(session, row, updates)
             session.add(row)
+            session.flush()
+            out = row.to_record()
+            session.commit()
+            return out
+        finally:
+            session.close()
+
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Apply ``{id: changes}`` in one flush; unknown ids are skipped."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, _select_places(), ORMPlace.id, updates)
+            changed = [rows[i] for i in updates if i in rows]
+            for row in changed:
+                self._apply(session, row, updates[row.id])
+            session.flush()
+            out = [row.to_record() for row in changed]
             session.commit()
-            return deepcopy(row.to_dict())
+            return out
         finally:
             session.close()
 
     def delete(self, cls_name: str, obj_id: str) -> bool:
         session = self._session()
         try:
-            stmt = select(ORMPlace).where(ORMPlace.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = _get_place(session, obj_id)
             if row is None:
                 return False
             session.delete(row)
@@ -106,20 +293,44 @@ class PlaceRepository:
         finally:
             session.close()
 
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        """Delete places with their reviews and amenity links in one flush."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, _select_places(), ORMPlace.id, ids)
+            for row in rows.values():
+                session.delete(row)
+            session.commit()
+            return len(rows)
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        session = self._session()
+        try:
+            session.execute(delete(place_amenity_table))
+            session.execute(delete(ORMPlace))
+            session.commit()
+        finally:
+            session.close()
+
     def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
         session = self._session()
         try:
-            stmt = select(ORMPlace)
+            stmt = _select_places()
             rows = session.execute(stmt).scalars().all()
-            return {"Place": [deepcopy(r.to_dict()) for r in rows]}
+            return {"Place": [r.to_record() for r in rows]}
         finally:
             session.close()
 
-    def count(self, cls_name: str) -> int:
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return the number of rows matching `criteria` using COUNT(*)."""
+        clauses = column_criteria(ORMPlace, criteria)
+        if clauses is None:
+            return 0
         session = self._session()
         try:
-            stmt = select(ORMPlace)
-            rows = session.execute(stmt).scalars().all()
-            return len(rows)
+            stmt = select(func.count()).select_from(ORMPlace).where(*clauses)
+            return session.execute(stmt).scalar_one()
         finally:
             session.close()
@@ -0,0 +1,126 @@
+"""Place search criteria shared by the repositories.
+
+`PlaceSearch` describes a filtered, sorted and keyset-paginated place query.
+Each repository translates it into its own index lookups (SQL indexes,
+expression indexes on `objects`, or `InMemoryRepository` index structures)
+and uses `matches` / `sort_key` to check rows it cannot filter natively.
+
+Cursors are opaque strings: the id for ``sort="id"``, and
+``"<price>:<id>"`` for the price sorts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+SORTS = ("id", "price", "-price")
+
+
+@dataclass(frozen=True)
+class PlaceSearch:
+    country: Optional[str] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    # minimum capacity: places whose `max_guest` is at least this value
+    max_guest: Optional[int] = None
+    # all-of: places offering every listed amenity
+    amenity_ids: Tuple[str, ...] = ()
+    sort: str = "id"
+    limit: Optional[int] = None
+    after: Optional[str] = None
+
+    def __post_init__(self):
+        if self.sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("limit must be a positive integer")
+        self.after_key()
+
+    @property
+    def by_price(self) -> bool:
+        return self.sort != "id"
+
+    @property
+    def descending(self) -> bool:
+        return self.sort == "-price"
+
+    def matches(self, place: Dict[str, Any]) -> bool:
+        if self.country is not None and place.get("country") != self.country:
+            return False
+        price = place.get("price_by_night")
+        if self.min_price is not None and (price is None or price < self.min_price):
+            return False
+        if self.max_price is not None and (price is None or price > self.max_price):
+            return False
+        guests = place.get("max_guest") or 0
+        if self.max_guest is not None and guests < self.max_guest:
+            return False
+        if self.amenity_ids and not set(self.amenity_ids) <= set(
+            place.get("amenity_ids") or ()
+        ):
+            return False
+        return True
+
+    def sort_key(self, place: Dict[str, Any]) -> Tuple[Any, ...]:
+        if self.by_price:
+            return (place.get("price_by_night") or 0, place.get("id"))
+        return (place.get("id"),)
+
+    def after_key(self) -> Optional[Tuple[Any, ...]]:
+        """Decode the `after` cursor into a `sort_key` value."""
+        if self.after is None:
+            return None
+        if not self.by_price:
+            return (self.after,)
+        price, sep, obj_id = self.after.partition(":")
+        try:
+            return (int(price), obj_id) if sep else _bad_cursor()
+        except ValueError:
+            return _bad_cursor()
+
+    def is_after(self, place: Dict[str, Any]) -> bool:
+        key = self.after_key()
+        if key is None:
+            return True
+        if self.descending:
+            return (-self.sort_key(place)[0], place.get("id")) > (-key[0], key[1])
+        return self.sort_key(place) > key
+
+    def cursor_for(self, place: Dict[str, Any]) -> str:
+        if self.by_price:
+            return f"{place.get('price_by_night') or 0}:{place.get('id')}"
+        return str(place.get("id"))
+
+
+def sql_filters(query: PlaceSearch, country, price, guests) -> List[Any]:
+    """WHERE clauses for the scalar filters of `query`."""
+    clauses: List[Any] = []
+    if query.country is not None:
+        clauses.append(country == query.country)
+    if query.min_price is not None:
+        clauses.append(price >= query.min_price)
+    if query.max_price is not None:
+        clauses.append(price <= query.max_price)
+    if query.max_guest is not None:
+        clauses.append(guests >= query.max_guest)
+    return clauses
+
+
+def sql_keyset(query: PlaceSearch, id_column, price) -> Tuple[List[Any], List[Any]]:
+    """Return (cursor WHERE clauses, ORDER BY clauses) for `query`."""
+    key = query.after_key()
+    if not query.by_price:
+        where = [] if key is None else [id_column > key[0]]
+        return where, [id_column]
+    order = [price.desc() if query.descending else price, id_column]
+    if key is None:
+        return [], order
+    beyond = price < key[0] if query.descending else price > key[0]
+    return [or_(beyond, and_(price == key[0], id_column > key[1]))], order
+
+
+def _bad_cursor():
+    raise ValueError("invalid cursor")
@@ -0,0 +1,71 @@
+"""Count the SQL statements a block of code runs.
+
+Every engine handed out by `engine.get_engine` reports its statements
+through `engine.on_statement`. `count_queries` collects the ones run by
+the current thread (or task) inside a ``with`` block. `assert_max_queries`
+fails when a block needs more than its budget. Tests use it to turn an N+1
+regression into a failure:
+
+    with assert_max_queries(6):
+        client.get("/api/v1/places")
+
+Counters nest: a statement is counted by every active counter.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from .engine import on_statement
+
+_active: ContextVar[Tuple["QueryCounter", ...]] = ContextVar(
+    "hbnb_query_counters", default=()
+)
+
+
+def _record(statement: str) -> None:
+    for counter in _active.get():
+        counter.statements.append(statement)
+
+
+class QueryCounter:
+    """The statements run while the counter is active."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+        self._token = None
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        on_statement(_record)
+        self._token = _active.set(_active.get() + (self,))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active.reset(self._token)
+        self._token = None
+
+
+def count_queries() -> QueryCounter:
+    """Context manager collecting the statements run inside it."""
+    return QueryCounter()
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryCounter]:
+    """Fail with the list of statements if the block runs more than `budget`."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > budget:
+        listing = "\n".join(
+            f"  {i}. {' '.join(sql.split())}"
+            for i, sql in enumerate(counter.statements, 1)
+        )
+        raise AssertionError(
+            f"{counter.count} SQL statements executed, budget is {budget}:\n{listing}"
+        )
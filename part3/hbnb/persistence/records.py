@@ -0,0 +1,79 @@
+"""Read-only records handed out by the repositories.
+
+Repositories return `FrozenRecord` objects instead of deep copies. A frozen
+record is a `dict` subclass, so it serializes, compares and reads like the
+dicts callers already use, but every mutating method raises `TypeError`.
+Nested lists become `FrozenList` and nested dicts become `FrozenRecord`.
+
+Because a frozen record cannot change, it can be shared: the in-memory
+repository returns its stored records directly, and `copy`/`deepcopy`
+return the record itself. Code that needs a modified version takes a
+shallow copy with ``dict(record)`` and changes that.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NoReturn
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(
+        f"{type(self).__name__} is read-only; copy it with dict() or list() first"
+    )
+
+
+class FrozenRecord(dict):
+    """A `dict` whose contents cannot be changed after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __copy__(self) -> "FrozenRecord":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenRecord":
+        return self
+
+    def __reduce__(self):
+        return (FrozenRecord, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenRecord({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """A `list` whose contents cannot be changed after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = _read_only
+    sort = reverse = _read_only
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenList":
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only version of `value`.
+
+    Dicts and lists are copied once into frozen containers; values that
+    are already frozen are returned as they are, so re-freezing is free.
+    Scalars are returned unchanged.
+    """
+    if isinstance(value, (FrozenRecord, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenRecord({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
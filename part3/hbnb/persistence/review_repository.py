@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+import uuid
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import sessionmaker
 
 from .models import Review as ORMReview
+from .engine import get_engine
+from .unit_of_work import open_session
+from .utils import chunked, column_criteria, load_by_ids, paginate
 
 
 def _now_iso() -> str:
@@ -17,74 +20,172 @@ def _now_iso() -> str:
 
 
 class ReviewRepository:
-    def __init__(self, database_uri: str = "sqlite:///hbnb_dev.db", echo: bool = False):
-        self._engine = create_engine(database_uri, echo=echo, future=True)
+    def __init__(
+        self,
+        database_uri: str = "sqlite:///hbnb_dev.db",
+        echo: bool = False,
+        engine=None,
+    ):
+        # repositories on the same database share one engine and pool
+        self._engine = engine or get_engine(database_uri, echo=echo)
         self._Session = sessionmaker(bind=self._engine, future=True)
 
     def _session(self):
-        return self._Session()
+        # joins the active unit of work, if any
+        return open_session(self._engine, self._Session)
+
+    def _new_row(self, payload: Dict[str, Any]) -> ORMReview:
+        u = ORMReview()
+        u.id = payload.get("id") or uuid.uuid4().hex
+        u.user_id = payload.get("user_id")
+        u.place_id = payload.get("place_id")
+        u.text = payload.get("text")
+        now = _now_iso()
+        u.created_at = u.updated_at = datetime.fromisoformat(now.replace("Z", "+00:00"))
+        return u
 
     def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         session = self._session()
         try:
-            u = ORMReview()
-            u.user_id = payload.get("user_id")
-            u.place_id = payload.get("place_id")
-            u.text = payload.get("text")
-            now = _now_iso()
-            u.created_at = u.updated_at = datetime.fromisoformat(
-                now.replace("Z", "+00:00")
-            )
+            u = self._new_row(payload)
             session.add(u)
             session.commit()
-            return u.to_dict()
+            return u.to_record()
+        finally:
+            session.close()
+
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert several reviews in one flush and transaction."""
+        session = self._session()
+        try:
+            rows = [self._new_row(payload) for payload in payloads]
+            session.add_all(rows)
+            session.commit()
+            return [u.to_record() for u in rows]
         finally:
             session.close()
 
     def get(self, cls_name: str, obj_id: str) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMReview).where(ORMReview.id == obj_id)
-            row = session.execute(stmt).scalars().first()
-            return deepcopy(row.to_dict()) if row else None
+            row = session.get(ORMReview, obj_id)
+            return row.to_record() if row else None
         finally:
             session.close()
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMReview)
+            stmt = paginate(select(ORMReview), ORMReview.id, limit, after)
             rows = session.execute(stmt).scalars().all()
-            return [deepcopy(r.to_dict()) for r in rows]
+            return [r.to_record() for r in rows]
+        finally:
+            session.close()
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every row in id order, fetching `batch_size` rows at a time.
+
+        Uses its own session outside any unit of work, so rows already
+        yielded are not kept alive by it.
+        """
+        session = self._Session()
+        try:
+            stmt = (
+                select(ORMReview)
+                .order_by(ORMReview.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in session.execute(stmt).scalars():
+                yield row.to_record()
+        finally:
+            session.close()
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(ids):
+                stmt = select(ORMReview).where(ORMReview.id.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        column = getattr(ORMReview, field, None)
+        if column is None:
+            return []
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(values):
+                stmt = select(ORMReview).where(column.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        clauses = column_criteria(ORMReview, criteria)
+        if clauses is None:
+            return []
+        session = self._session()
+        try:
+            rows = session.execute(select(ORMReview).where(*clauses)).scalars().all()
+            return [r.to_record() for r in rows]
         finally:
             session.close()
 
+    def _apply(self, row: ORMReview, updates: Dict[str, Any]) -> None:
+        for k, v in updates.items():
+            if k in ("id", "created_at"):
+                continue
+            if hasattr(row, k):
+                setattr(row, k, v)
+        row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+
     def update(
         self, cls_name: str, obj_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMReview).where(ORMReview.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = session.get(ORMReview, obj_id)
             if row is None:
                 return None
-            for k, v in updates.items():
-                if k in ("id", "created_at"):
-                    continue
-                if hasattr(row, k):
-                    setattr(row, k, v)
-            row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+            self._apply(row, updates)
             session.add(row)
             session.commit()
-            return deepcopy(row.to_dict())
+            return row.to_record()
+        finally:
+            session.close()
+
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Apply ``{id: changes}`` in one flush; unknown ids are skipped."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, select(ORMReview), ORMReview.id, updates)
+            changed = [rows[i] for i in updates if i in rows]
+            for row in changed:
+                self._apply(row, updates[row.id])
+            session.commit()
+            return [row.to_record() for row in changed]
         finally:
             session.close()
 
     def delete(self, cls_name: str, obj_id: str) -> bool:
         session = self._session()
         try:
-            stmt = select(ORMReview).where(ORMReview.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = session.get(ORMReview, obj_id)
             if row is None:
                 return False
             session.delete(row)
@@ -93,20 +194,43 @@ class ReviewRepository:
         finally:
             session.close()
 
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        """Delete several reviews in one flush and transaction."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, select(ORMReview), ORMReview.id, ids)
+            for row in rows.values():
+                session.delete(row)
+            session.commit()
+            return len(rows)
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        session = self._session()
+        try:
+            session.execute(delete(ORMReview))
+            session.commit()
+        finally:
+            session.close()
+
     def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
         session = self._session()
         try:
             stmt = select(ORMReview)
             rows = session.execute(stmt).scalars().all()
-            return {"Review": [deepcopy(r.to_dict()) for r in rows]}
+            return {"Review": [r.to_record() for r in rows]}
         finally:
             session.close()
 
-    def count(self, cls_name: str) -> int:
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return the number of rows matching `criteria` using COUNT(*)."""
+        clauses = column_criteria(ORMReview, criteria)
+        if clauses is None:
+            return 0
         session = self._session()
         try:
-            stmt = select(ORMReview)
-            rows = session.execute(stmt).scalars().all()
-            return len(rows)
+            stmt = select(func.count()).select_from(ORMReview).where(*clauses)
+            return session.execute(stmt).scalar_one()
         finally:
             session.close()
@@ -14,20 +14,37 @@ initialization during code changes.
 
 from __future__ import annotations
 
-from copy import deepcopy
 from datetime import datetime, timezone
+import re
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
 
 from sqlalchemy import (
     Column,
     String,
     DateTime,
+    Float,
+    Index,
     JSON,
-    create_engine,
+    delete,
+    event,
+    func,
+    literal_column,
     select,
+    update,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.functions import FunctionElement
+
+from .engine import get_engine
+from .geo import BoundingBox, box_clauses
+from .place_search import PlaceSearch, sql_filters, sql_keyset
+from .records import freeze
+from .unit_of_work import open_session
+from .utils import chunked, load_by_ids, paginate
 
 Base = declarative_base()
 
@@ -45,6 +62,127 @@ class ObjectStore(Base):
     updated_at = Column(DateTime(timezone=True), nullable=False)
 
 
+@event.listens_for(ObjectStore, "load")
+@event.listens_for(ObjectStore, "refresh")
+def _freeze_loaded(target, *args):
+    # keep payloads frozen in the session so reads can share them
+    if "data" in target.__dict__:
+        set_committed_value(target, "data", freeze(target.data))
+
+
+class json_text(FunctionElement):
+    """A top-level JSON field of a column extracted as text.
+
+    The path is rendered as a SQL literal rather than a bound parameter so
+    that expression indexes and the queries using them compile to the same
+    SQL, which is what lets the database match the index.
+    """
+
+    type = String()
+    inherit_cache = True
+    name = "json_text"
+
+    def __init__(self, column, field: str):
+        if not re.fullmatch(r"\w+", field):
+            raise ValueError(f"unsupported JSON field name: {field!r}")
+        super().__init__(column, literal_column(field))
+
+
+def _json_text_parts(element, compiler, **kw):
+    column, field = element.clauses
+    return compiler.process(column, **kw), field.name
+
+
+@compiles(json_text)
+def _json_text_default(element, compiler, **kw):
+    column, field = _json_text_parts(element, compiler, **kw)
+    return f"json_extract({column}, '$.{field}')"
+
+
+@compiles(json_text, "mysql")
+def _json_text_mysql(element, compiler, **kw):
+    column, field = _json_text_parts(element, compiler, **kw)
+    return f"json_unquote(json_extract({column}, '$.{field}'))"
+
+
+@compiles(json_text, "postgresql")
+def _json_text_postgresql(element, compiler, **kw):
+    column, field = _json_text_parts(element, compiler, **kw)
+    return f"({column} ->> '{field}')"
+
+
+class json_number(json_text):
+    """A top-level numeric JSON field of a column, comparable as a number."""
+
+    type = Float()
+    inherit_cache = True
+    name = "json_number"
+
+
+@compiles(json_number)
+def _json_number_default(element, compiler, **kw):
+    # SQLite and MySQL json_extract() already return JSON numbers as numbers
+    column, field = _json_text_parts(element, compiler, **kw)
+    return f"json_extract({column}, '$.{field}')"
+
+
+@compiles(json_number, "postgresql")
+def _json_number_postgresql(element, compiler, **kw):
+    column, field = _json_text_parts(element, compiler, **kw)
+    return f"CAST(({column} ->> '{field}') AS NUMERIC)"
+
+
+# Expression indexes for the reference fields the API looks objects up by.
+for _field in ("email", "user_id", "place_id", "country"):
+    Index(
+        f"ix_objects_{_field}",
+        ObjectStore.cls_name,
+        json_text(ObjectStore.data, _field),
+    )
+# ... and for the numeric place search filters and price ordering.
+for _field in ("price_by_night", "max_guest"):
+    Index(
+        f"ix_objects_{_field}",
+        ObjectStore.cls_name,
+        json_number(ObjectStore.data, _field),
+    )
+# Bounding-box prefilter of nearby-place queries.
+Index(
+    "ix_objects_location",
+    ObjectStore.cls_name,
+    json_number(ObjectStore.data, "latitude"),
+    json_number(ObjectStore.data, "longitude"),
+)
+
+
+def create_object_store_schema(engine) -> None:
+    """Create the `objects` table and any of its indexes that are missing.
+
+    `create_all` skips indexes of tables that already exist, so indexes
+    added after a database was first created are created here explicitly.
+    """
+    Base.metadata.create_all(engine)
+    # Reflection cannot see expression indexes, so rely on IF NOT EXISTS
+    # rather than `checkfirst`.
+    with engine.begin() as conn:
+        for index in ObjectStore.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _json_equals(field: str, value: Any):
+    """SQL clause comparing a JSON field to a scalar, or None if unsupported."""
+    expr = ObjectStore.data[field]
+    if isinstance(value, bool):
+        return expr.as_boolean() == value
+    if isinstance(value, int):
+        return expr.as_integer() == value
+    if isinstance(value, float):
+        return expr.as_float() == value
+    if isinstance(value, str):
+        return json_text(ObjectStore.data, field) == value
+    return None
+
+
 class SQLAlchemyRepository:
     """A simple repository backed by SQLAlchemy.
 
@@ -52,63 +190,238 @@ class SQLAlchemyRepository:
     required tables when ready.
     """
 
-    def __init__(self, database_uri: str = "sqlite:///hbnb_dev.db", echo: bool = False):
-        self._engine = create_engine(database_uri, echo=echo, future=True)
+    def __init__(
+        self,
+        database_uri: str = "sqlite:///hbnb_dev.db",
+        echo: bool = False,
+        engine=None,
+    ):
+        # repositories on the same database share one engine and pool
+        self._engine = engine or get_engine(database_uri, echo=echo)
         self._Session = sessionmaker(bind=self._engine, future=True)
 
     def _ensure_session(self):
-        return self._Session()
+        return open_session(self._engine, self._Session)
 
     def _generate_id(self) -> str:
         return uuid.uuid4().hex
 
-    def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _new_row(self, cls_name: str, payload: Dict[str, Any]) -> ObjectStore:
         if not isinstance(payload, dict):
             raise ValueError("payload must be a dict")
+        obj_id = self._generate_id()
+        now = _now_iso()
+        data = dict(payload)
+        data.pop("id", None)
+        data["id"] = obj_id
+        data["created_at"] = now
+        data["updated_at"] = now
+        return ObjectStore(
+            id=obj_id,
+            cls_name=cls_name,
+            data=freeze(data),
+            created_at=datetime.fromisoformat(now.replace("Z", "+00:00")),
+            updated_at=datetime.fromisoformat(now.replace("Z", "+00:00")),
+        )
+
+    def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        row = self._new_row(cls_name, payload)
         session = self._ensure_session()
         try:
-            obj_id = self._generate_id()
-            now = _now_iso()
-            data = deepcopy(payload)
-            data.pop("id", None)
-            data["id"] = obj_id
-            data["created_at"] = now
-            data["updated_at"] = now
-            row = ObjectStore(
-                id=obj_id,
-                cls_name=cls_name,
-                data=data,
-                created_at=datetime.fromisoformat(now.replace("Z", "+00:00")),
-                updated_at=datetime.fromisoformat(now.replace("Z", "+00:00")),
-            )
             session.add(row)
             session.commit()
-            return deepcopy(data)
+            return row.data
+        finally:
+            session.close()
+
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert several objects in one transaction.
+
+        The rows are flushed together, which SQLAlchemy sends as a single
+        multi-row INSERT (or executemany) rather than one statement per row.
+        """
+        rows = [self._new_row(cls_name, payload) for payload in payloads]
+        session = self._ensure_session()
+        try:
+            session.add_all(rows)
+            session.commit()
+            return [row.data for row in rows]
         finally:
             session.close()
 
     def get(self, cls_name: str, obj_id: str) -> Optional[Dict[str, Any]]:
         session = self._ensure_session()
         try:
-            stmt = select(ObjectStore).where(
-                ObjectStore.cls_name == cls_name, ObjectStore.id == obj_id
-            )
-            res = session.execute(stmt).scalars().first()
-            if res is None:
+            res = session.get(ObjectStore, obj_id)
+            if res is None or res.cls_name != cls_name:
                 return None
-            return deepcopy(res.data)
+            return freeze(res.data)
         finally:
             session.close()
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return objects of `cls_name`; a page in id order if `limit`/`after`."""
         session = self._ensure_session()
         try:
-            stmt = select(ObjectStore).where(ObjectStore.cls_name == cls_name)
+            stmt = paginate(
+                select(ObjectStore).where(ObjectStore.cls_name == cls_name),
+                ObjectStore.id,
+                limit,
+                after,
+            )
             rows = session.execute(stmt).scalars().all()
-            return [deepcopy(r.data) for r in rows]
+            return [freeze(r.data) for r in rows]
+        finally:
+            session.close()
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every object of `cls_name` in id order, `batch_size` at a time.
+
+        Only the JSON column is selected, on a server-side cursor
+        (`yield_per`) and a session of its own outside any unit of work,
+        so memory stays bounded by one batch however large the table is.
+        """
+        session = self._Session()
+        try:
+            stmt = (
+                select(ObjectStore.data)
+                .where(ObjectStore.cls_name == cls_name)
+                .order_by(ObjectStore.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for data in session.execute(stmt).scalars():
+                yield freeze(data)
+        finally:
+            session.close()
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Return objects whose id is in `ids` using chunked `IN` queries."""
+        session = self._ensure_session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(ids):
+                stmt = select(ObjectStore).where(
+                    ObjectStore.cls_name == cls_name, ObjectStore.id.in_(batch)
+                )
+                rows = session.execute(stmt).scalars().all()
+                out.extend(freeze(r.data) for r in rows)
+            return out
         finally:
             session.close()
 
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """Return objects whose JSON `field` is one of `values`.
+
+        The comparison is done on the JSON value extracted as text, which is
+        what the id-style reference fields (`place_id`, `user_id`) hold and
+        what the expression indexes on the `objects` table cover.
+        """
+        session = self._ensure_session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(values):
+                stmt = select(ObjectStore).where(
+                    ObjectStore.cls_name == cls_name,
+                    json_text(ObjectStore.data, field).in_(batch),
+                )
+                rows = session.execute(stmt).scalars().all()
+                out.extend(freeze(r.data) for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        """Return objects whose JSON fields equal all of `criteria`.
+
+        Scalar criteria are pushed into SQL; anything else is checked in
+        Python on the rows returned.
+        """
+        clauses = [ObjectStore.cls_name == cls_name]
+        for field, value in criteria.items():
+            clause = _json_equals(field, value)
+            if clause is not None:
+                clauses.append(clause)
+        session = self._ensure_session()
+        try:
+            rows = session.execute(select(ObjectStore).where(*clauses)).scalars()
+            return [
+                freeze(r.data)
+                for r in rows
+                if all(r.data.get(k) == v for k, v in criteria.items())
+            ]
+        finally:
+            session.close()
+
+    def search_places(self, query: PlaceSearch) -> List[Dict[str, Any]]:
+        """Return one page of `Place` objects matching `query`.
+
+        Scalar filters, the cursor and the ordering run in SQL on the
+        expression indexes; the all-of amenity filter is checked on the
+        rows streamed back until the page is full.
+        """
+        price = json_number(ObjectStore.data, "price_by_night")
+        where, order = sql_keyset(query, ObjectStore.id, price)
+        where += sql_filters(
+            query,
+            json_text(ObjectStore.data, "country"),
+            price,
+            json_number(ObjectStore.data, "max_guest"),
+        )
+        stmt = (
+            select(ObjectStore)
+            .where(ObjectStore.cls_name == "Place", *where)
+            .order_by(*order)
+        )
+        if query.limit is not None and not query.amenity_ids:
+            stmt = stmt.limit(query.limit)
+        session = self._ensure_session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for row in session.execute(stmt).scalars():
+                if query.amenity_ids and not query.matches(row.data):
+                    continue
+                out.append(freeze(row.data))
+                if query.limit is not None and len(out) >= query.limit:
+                    break
+            return out
+        finally:
+            session.close()
+
+    def find_in_box(self, box: BoundingBox) -> List[Dict[str, Any]]:
+        """Return `Place` objects inside `box` via the location index."""
+        stmt = select(ObjectStore).where(
+            ObjectStore.cls_name == "Place",
+            *box_clauses(
+                box,
+                json_number(ObjectStore.data, "latitude"),
+                json_number(ObjectStore.data, "longitude"),
+            ),
+        )
+        session = self._ensure_session()
+        try:
+            return [freeze(r.data) for r in session.execute(stmt).scalars()]
+        finally:
+            session.close()
+
+    def _apply(self, row: ObjectStore, updates: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(row.data)
+        for k, v in updates.items():
+            if k in ("id", "created_at"):
+                continue
+            data[k] = v
+        data["updated_at"] = _now_iso()
+        row.data = data = freeze(data)
+        row.updated_at = datetime.fromisoformat(
+            data["updated_at"].replace("Z", "+00:00")
+        )
+        return data
+
     def update(
         self, cls_name: str, obj_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -116,36 +429,89 @@ class SQLAlchemyRepository:
             raise ValueError("updates must be a dict")
         session = self._ensure_session()
         try:
-            stmt = select(ObjectStore).where(
-                ObjectStore.cls_name == cls_name, ObjectStore.id == obj_id
-            )
-            row = session.execute(stmt).scalars().first()
-            if row is None:
+            row = session.get(ObjectStore, obj_id)
+            if row is None or row.cls_name != cls_name:
                 return None
-            data = dict(row.data)
-            for k, v in updates.items():
-                if k in ("id", "created_at"):
-                    continue
-                data[k] = deepcopy(v)
-            data["updated_at"] = _now_iso()
-            row.data = data
-            row.updated_at = datetime.fromisoformat(
-                data["updated_at"].replace("Z", "+00:00")
-            )
+            data = self._apply(row, updates)
             session.add(row)
             session.commit()
-            return deepcopy(data)
+            return data
         finally:
             session.close()
 
-    def delete(self, cls_name: str, obj_id: str) -> bool:
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Apply ``{id: changes}`` in one transaction; unknown ids are skipped.
+
+        Rows are loaded with chunked `IN` queries and the changed rows are
+        written back in one flush (an executemany UPDATE).
+        """
+        session = self._ensure_session()
+        try:
+            rows = load_by_ids(
+                session,
+                select(ObjectStore).where(ObjectStore.cls_name == cls_name),
+                ObjectStore.id,
+                updates,
+            )
+            out = [
+                self._apply(rows[obj_id], changes)
+                for obj_id, changes in updates.items()
+                if obj_id in rows
+            ]
+            session.commit()
+            return out
+        finally:
+            session.close()
+
+    def update_locked(
+        self,
+        cls_name: str,
+        ids: Iterable[str],
+        compute: Callable[[Dict[str, Dict[str, Any]]], Dict[str, Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Lock the rows with `ids`, then apply ``compute({id: current})``.
+
+        A no-op ``UPDATE`` takes the row write locks first (there is no
+        ``SELECT ... FOR UPDATE`` on SQLite), and the rows are then re-read,
+        so `compute` sees values no other transaction can change before
+        this one ends. It returns ``{id: changes}`` for the rows to write.
+        """
+        ids = list(dict.fromkeys(ids))
         session = self._ensure_session()
         try:
-            stmt = select(ObjectStore).where(
-                ObjectStore.cls_name == cls_name, ObjectStore.id == obj_id
+            table = ObjectStore.__table__
+            for batch in chunked(ids):
+                session.execute(
+                    update(table)
+                    .where(table.c.cls_name == cls_name, table.c.id.in_(batch))
+                    .values(updated_at=table.c.updated_at)
+                )
+            rows = load_by_ids(
+                session,
+                select(ObjectStore)
+                .where(ObjectStore.cls_name == cls_name)
+                .execution_options(populate_existing=True),
+                ObjectStore.id,
+                ids,
             )
-            row = session.execute(stmt).scalars().first()
-            if row is None:
+            changes = compute({obj_id: row.data for obj_id, row in rows.items()})
+            out = [
+                self._apply(rows[obj_id], updates)
+                for obj_id, updates in changes.items()
+                if obj_id in rows
+            ]
+            session.commit()
+            return out
+        finally:
+            session.close()
+
+    def delete(self, cls_name: str, obj_id: str) -> bool:
+        session = self._ensure_session()
+        try:
+            row = session.get(ObjectStore, obj_id)
+            if row is None or row.cls_name != cls_name:
                 return False
             session.delete(row)
             session.commit()
@@ -153,6 +519,21 @@ class SQLAlchemyRepository:
         finally:
             session.close()
 
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        """Delete the objects with `ids` using chunked `DELETE ... IN` statements."""
+        session = self._ensure_session()
+        try:
+            deleted = 0
+            for batch in chunked(ids):
+                stmt = delete(ObjectStore).where(
+                    ObjectStore.cls_name == cls_name, ObjectStore.id.in_(batch)
+                )
+                deleted += session.execute(stmt).rowcount
+            session.commit()
+            return deleted
+        finally:
+            session.close()
+
     def clear(self) -> None:
         session = self._ensure_session()
         try:
@@ -168,16 +549,25 @@ class SQLAlchemyRepository:
             rows = session.execute(stmt).scalars().all()
             out: Dict[str, List[Dict[str, Any]]] = {}
             for r in rows:
-                out.setdefault(r.cls_name, []).append(deepcopy(r.data))
+                out.setdefault(r.cls_name, []).append(freeze(r.data))
             return out
         finally:
             session.close()
 
-    def count(self, cls_name: str) -> int:
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return the number of objects matching `criteria` using COUNT(*).
+
+        Criteria that cannot be expressed in SQL fall back to `find_by`.
+        """
+        clauses = [ObjectStore.cls_name == cls_name]
+        for field, value in criteria.items():
+            clause = _json_equals(field, value)
+            if clause is None:
+                return len(self.find_by(cls_name, **criteria))
+            clauses.append(clause)
         session = self._ensure_session()
         try:
-            stmt = select(ObjectStore).where(ObjectStore.cls_name == cls_name)
-            rows = session.execute(stmt).scalars().all()
-            return len(rows)
+            stmt = select(func.count()).select_from(ObjectStore).where(*clauses)
+            return session.execute(stmt).scalar_one()
         finally:
             session.close()
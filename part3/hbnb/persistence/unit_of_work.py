@@ -0,0 +1,194 @@
+"""Request-scoped unit of work for the repositories.
+
+Outside a unit of work every repository method opens a session, commits
+and closes it, as before. Inside `unit_of_work()` the repositories join a
+single session per engine instead: their ``commit()`` only flushes (so
+constraint errors still surface at the same call), ``close()`` is a no-op,
+and the transaction is committed once when the unit of work ends. Objects
+loaded earlier in the unit are served from the session identity map.
+
+A failed flush leaves the transaction unusable. If the caller handles
+the error and carries on, ending the unit rolls everything back and raises
+`UnitOfWorkFailed` rather than reporting success.
+
+The in-memory repository has no transaction; it registers rollback
+hooks that undo its writes instead (see `UnitOfWork.on_rollback`).
+
+The active unit is kept in a context variable, so each thread or task
+(e.g. each Flask request) gets its own.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, Result, Row
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar(
+    "hbnb_unit_of_work", default=None
+)
+
+
+class UnitOfWorkFailed(RuntimeError):
+    """A write failed earlier in the unit of work, so nothing was committed."""
+
+
+class UnitOfWork:
+    """One session per engine, committed or rolled back together."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[Engine, Session] = {}
+        # the identity map is weak; hold loaded rows so later reads hit it
+        # (rows of streamed `yield_per` reads are not held, see `_on_execute`)
+        self._loaded: List[Any] = []
+        self._rollback_hooks: List[Callable[[], None]] = []
+        self._commit_hooks: List[Callable[[], None]] = []
+        self.failed = False
+
+    def on_rollback(self, hook: Callable[[], None]) -> None:
+        """Run `hook` if this unit of work is rolled back.
+
+        Rollback hooks run newest first, so hooks that undo writes restore
+        each object to its state before the unit began.
+        """
+        self._rollback_hooks.append(hook)
+
+    def on_commit(self, hook: Callable[[], None]) -> None:
+        """Run `hook` after this unit of work has committed."""
+        self._commit_hooks.append(hook)
+
+    def _keep(self, session: Session, instance: Any) -> None:
+        self._loaded.append(instance)
+
+    def _on_execute(self, state: ORMExecuteState) -> Optional[Result]:
+        if not state.is_select or state.execution_options.get("yield_per"):
+            # streamed reads keep only one batch in memory at a time
+            return None
+        frozen = state.invoke_statement().freeze()
+        for row in frozen.data:
+            # rows of several columns, or bare objects for scalar ORM results
+            for value in row if isinstance(row, (tuple, Row)) else (row,):
+                if hasattr(value, "_sa_instance_state"):
+                    self._loaded.append(value)
+        return frozen()
+
+    def session(self, engine: Engine, factory: sessionmaker) -> "_JoinedSession":
+        session = self._sessions.get(engine)
+        if session is None:
+            session = self._sessions[engine] = factory()
+            event.listen(session, "do_orm_execute", self._on_execute)
+            event.listen(session, "pending_to_persistent", self._keep)
+        return _JoinedSession(session, self)
+
+    def commit(self) -> None:
+        if self.failed:
+            # the caller handled the error but cannot keep the other writes
+            self.rollback()
+            raise UnitOfWorkFailed(
+                "a write failed earlier in this unit of work; it was rolled back"
+            )
+        try:
+            for session in self._sessions.values():
+                session.commit()
+        except BaseException:
+            # run the rollback hooks before `close` discards them
+            self.rollback()
+            raise
+        self._rollback_hooks.clear()
+        hooks, self._commit_hooks = self._commit_hooks, []
+        for hook in hooks:
+            hook()
+
+    def rollback(self) -> None:
+        for session in self._sessions.values():
+            session.rollback()
+        self._commit_hooks.clear()
+        hooks, self._rollback_hooks = self._rollback_hooks, []
+        for hook in reversed(hooks):
+            hook()
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        self._loaded.clear()
+        self._rollback_hooks.clear()
+        self._commit_hooks.clear()
+
+
+class _JoinedSession:
+    """Session handle given to repositories inside a unit of work."""
+
+    def __init__(self, session: Session, uow: UnitOfWork) -> None:
+        self._session = session
+        self._uow = uow
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def commit(self) -> None:
+        try:
+            self._session.flush()
+        except Exception:
+            # the transaction is unusable now; discard the whole unit
+            self._session.rollback()
+            self._uow.failed = True
+            raise
+
+    def close(self) -> None:
+        pass
+
+
+def current() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+def open_session(engine: Engine, factory: sessionmaker):
+    """Return the unit-of-work session for `engine`, or a fresh session."""
+    uow = _current.get()
+    if uow is None:
+        return factory()
+    return uow.session(engine, factory)
+
+
+def begin() -> Token:
+    """Start a unit of work in the current context; pass the token to `end`."""
+    return _current.set(UnitOfWork())
+
+
+def end(token: Token, commit: bool = True) -> None:
+    """Commit (or roll back) and close the unit of work started by `token`."""
+    uow = _current.get()
+    try:
+        if uow is not None:
+            if commit:
+                uow.commit()
+            else:
+                uow.rollback()
+    finally:
+        if uow is not None:
+            uow.close()
+        _current.reset(token)
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """Run the block in one transaction per engine.
+
+    Nested calls join the outer unit of work.
+    """
+    uow = _current.get()
+    if uow is not None:
+        yield uow
+        return
+    token = begin()
+    try:
+        yield _current.get()
+    except BaseException:
+        end(token, commit=False)
+        raise
+    end(token)
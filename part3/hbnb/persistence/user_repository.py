@@ -9,14 +9,17 @@ the database schema in a controlled migration/initialization step.
 
 from __future__ import annotations
 
-from copy import deepcopy
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+import uuid
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import sessionmaker
 
 from .models import User as ORMUser
+from .engine import get_engine
+from .unit_of_work import open_session
+from .utils import chunked, column_criteria, load_by_ids, paginate
 
 
 def _now_iso() -> str:
@@ -24,82 +27,179 @@ def _now_iso() -> str:
 
 
 class UserRepository:
-    def __init__(self, database_uri: str = "sqlite:///hbnb_dev.db", echo: bool = False):
-        self._engine = create_engine(database_uri, echo=echo, future=True)
+    def __init__(
+        self,
+        database_uri: str = "sqlite:///hbnb_dev.db",
+        echo: bool = False,
+        engine=None,
+    ):
+        # repositories on the same database share one engine and pool
+        self._engine = engine or get_engine(database_uri, echo=echo)
         self._Session = sessionmaker(bind=self._engine, future=True)
 
     def _session(self):
-        return self._Session()
+        # joins the active unit of work, if any
+        return open_session(self._engine, self._Session)
+
+    def _new_row(self, payload: Dict[str, Any]) -> ORMUser:
+        # payload expected to include hashed password already
+        u = ORMUser()
+        u.id = payload.get("id") or uuid.uuid4().hex
+        u.email = payload.get("email")
+        u.password = payload.get("password")
+        u.first_name = payload.get("first_name") or ""
+        u.last_name = payload.get("last_name") or ""
+        u.is_admin = bool(payload.get("is_admin", False))
+        # timestamps
+        now = _now_iso()
+        u.created_at = u.updated_at = datetime.fromisoformat(now.replace("Z", "+00:00"))
+        return u
 
     def create(self, cls_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         # cls_name ignored; this repo only handles User
         session = self._session()
         try:
-            # payload expected to include hashed password already
-            u = ORMUser()
-            u.id = payload.get("id") or (payload.get("id") or None)
-            u.email = payload.get("email")
-            u.password = payload.get("password")
-            u.first_name = payload.get("first_name") or ""
-            u.last_name = payload.get("last_name") or ""
-            u.is_admin = bool(payload.get("is_admin", False))
-            # timestamps
-            now = _now_iso()
-            u.created_at = u.updated_at = datetime.fromisoformat(
-                now.replace("Z", "+00:00")
-            )
+            u = self._new_row(payload)
             session.add(u)
             session.commit()
-            return u.to_dict()
+            return u.to_record()
+        finally:
+            session.close()
+
+    def create_many(
+        self, cls_name: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert several users in one flush and transaction."""
+        session = self._session()
+        try:
+            rows = [self._new_row(payload) for payload in payloads]
+            session.add_all(rows)
+            session.commit()
+            return [u.to_record() for u in rows]
         finally:
             session.close()
 
     def get(self, cls_name: str, obj_id: str) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMUser).where(ORMUser.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = session.get(ORMUser, obj_id)
             if row is None:
                 return None
-            return deepcopy(row.to_dict())
+            return row.to_record()
         finally:
             session.close()
 
-    def list(self, cls_name: str) -> List[Dict[str, Any]]:
+    def list(
+        self, cls_name: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMUser)
+            stmt = paginate(select(ORMUser), ORMUser.id, limit, after)
             rows = session.execute(stmt).scalars().all()
-            return [deepcopy(r.to_dict()) for r in rows]
+            return [r.to_record() for r in rows]
+        finally:
+            session.close()
+
+    def stream(self, cls_name: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every row in id order, fetching `batch_size` rows at a time.
+
+        Uses its own session outside any unit of work, so rows already
+        yielded are not kept alive by it.
+        """
+        session = self._Session()
+        try:
+            stmt = (
+                select(ORMUser)
+                .order_by(ORMUser.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in session.execute(stmt).scalars():
+                yield row.to_record()
+        finally:
+            session.close()
+
+    def get_many(self, cls_name: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(ids):
+                stmt = select(ORMUser).where(ORMUser.id.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_in(
+        self, cls_name: str, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        column = getattr(ORMUser, field, None)
+        if column is None:
+            return []
+        session = self._session()
+        try:
+            out: List[Dict[str, Any]] = []
+            for batch in chunked(values):
+                stmt = select(ORMUser).where(column.in_(batch))
+                rows = session.execute(stmt).scalars().all()
+                out.extend(r.to_record() for r in rows)
+            return out
+        finally:
+            session.close()
+
+    def find_by(self, cls_name: str, **criteria: Any) -> List[Dict[str, Any]]:
+        clauses = column_criteria(ORMUser, criteria)
+        if clauses is None:
+            return []
+        session = self._session()
+        try:
+            rows = session.execute(select(ORMUser).where(*clauses)).scalars().all()
+            return [r.to_record() for r in rows]
         finally:
             session.close()
 
+    def _apply(self, row: ORMUser, updates: Dict[str, Any]) -> None:
+        for k, v in updates.items():
+            if k in ("id", "created_at"):
+                continue
+            if hasattr(row, k):
+                setattr(row, k, v)
+        row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+
     def update(
         self, cls_name: str, obj_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         session = self._session()
         try:
-            stmt = select(ORMUser).where(ORMUser.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = session.get(ORMUser, obj_id)
             if row is None:
                 return None
-            for k, v in updates.items():
-                if k in ("id", "created_at"):
-                    continue
-                if hasattr(row, k):
-                    setattr(row, k, v)
-            row.updated_at = datetime.fromisoformat(_now_iso().replace("Z", "+00:00"))
+            self._apply(row, updates)
             session.add(row)
             session.commit()
-            return deepcopy(row.to_dict())
+            return row.to_record()
+        finally:
+            session.close()
+
+    def update_many(
+        self, cls_name: str, updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Apply ``{id: changes}`` in one flush; unknown ids are skipped."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, select(ORMUser), ORMUser.id, updates)
+            changed = [rows[i] for i in updates if i in rows]
+            for row in changed:
+                self._apply(row, updates[row.id])
+            session.commit()
+            return [row.to_record() for row in changed]
         finally:
             session.close()
 
     def delete(self, cls_name: str, obj_id: str) -> bool:
         session = self._session()
         try:
-            stmt = select(ORMUser).where(ORMUser.id == obj_id)
-            row = session.execute(stmt).scalars().first()
+            row = session.get(ORMUser, obj_id)
             if row is None:
                 return False
             session.delete(row)
@@ -108,20 +208,43 @@ class UserRepository:
         finally:
             session.close()
 
+    def delete_many(self, cls_name: str, ids: Iterable[str]) -> int:
+        """Delete users (and, by cascade, their places and reviews) in one flush."""
+        session = self._session()
+        try:
+            rows = load_by_ids(session, select(ORMUser), ORMUser.id, ids)
+            for row in rows.values():
+                session.delete(row)
+            session.commit()
+            return len(rows)
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        session = self._session()
+        try:
+            session.execute(delete(ORMUser))
+            session.commit()
+        finally:
+            session.close()
+
     def list_all(self) -> Dict[str, List[Dict[str, Any]]]:
         session = self._session()
         try:
             stmt = select(ORMUser)
             rows = session.execute(stmt).scalars().all()
-            return {"User": [deepcopy(r.to_dict()) for r in rows]}
+            return {"User": [r.to_record() for r in rows]}
         finally:
             session.close()
 
-    def count(self, cls_name: str) -> int:
+    def count(self, cls_name: str, **criteria: Any) -> int:
+        """Return the number of rows matching `criteria` using COUNT(*)."""
+        clauses = column_criteria(ORMUser, criteria)
+        if clauses is None:
+            return 0
         session = self._session()
         try:
-            stmt = select(ORMUser)
-            rows = session.execute(stmt).scalars().all()
-            return len(rows)
+            stmt = select(func.count()).select_from(ORMUser).where(*clauses)
+            return session.execute(stmt).scalar_one()
         finally:
             session.close()
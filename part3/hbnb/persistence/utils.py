@@ -0,0 +1,56 @@
+"""Small helpers shared by the SQLAlchemy-backed repositories."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit, which is
+# 999 on older builds.
+IN_CLAUSE_CHUNK = 500
+
+
+def chunked(values: Iterable[Any], size: int = IN_CLAUSE_CHUNK) -> Iterator[List[Any]]:
+    """Yield de-duplicated `values` in lists of at most `size` items."""
+    batch: List[Any] = []
+    for value in dict.fromkeys(values):
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_by_ids(session, stmt, id_column, ids: Iterable[Any]) -> Dict[Any, Any]:
+    """Run `stmt` restricted to `ids` in chunks; return ``{id: row}``."""
+    rows: Dict[Any, Any] = {}
+    for batch in chunked(ids):
+        for row in session.execute(stmt.where(id_column.in_(batch))).scalars():
+            rows[row.id] = row
+    return rows
+
+
+def column_criteria(model, criteria: Dict[str, Any]) -> Optional[List[Any]]:
+    """Equality clauses on `model` columns, or None if a field is unknown."""
+    clauses = []
+    for field, value in criteria.items():
+        column = model.__table__.columns.get(field)
+        if column is None:
+            return None
+        clauses.append(column == value)
+    return clauses
+
+
+def paginate(stmt, id_column, limit: Optional[int] = None, after: Any = None):
+    """Apply keyset pagination: ``WHERE id > after ORDER BY id LIMIT limit``.
+
+    Without `limit` and `after` the statement is returned unchanged.
+    """
+    if limit is None and after is None:
+        return stmt
+    if after is not None:
+        stmt = stmt.where(id_column > after)
+    stmt = stmt.order_by(id_column)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
@@ -7,27 +7,84 @@ It provides the endpoints exercised by the test suite in `tests/test_api.py`.
 
 from __future__ import annotations
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify, stream_with_context
 from flask import current_app
 from functools import lru_cache
+from typing import NamedTuple
 import importlib
 import os
 import sys
+import time
 from flask_jwt_extended import (
     JWTManager,
     create_access_token,
-    verify_jwt_in_request,
     get_jwt,
-    get_jwt_identity,
+    verify_jwt_in_request,
 )
 
+from .. import metrics
 from ..business.facade import HBNBFacade, NotFoundError, ValidationError
+from ..business import passwords
+from ..business.review_stats import PUBLIC_FIELDS as REVIEW_STATS_FIELDS
+from ..business.review_stats import STATS_CLASS as REVIEW_STATS_CLASS
+from ..business.review_stats import summary as review_summary
+from .auth_cache import TokenCache
+from .response_cache import ResponseCache, etag_for
 import click
 from ..persistence.sqlalchemy_repository import (
     SQLAlchemyRepository,
-    Base as SQLAlchemyRepositoryBase,
+    create_object_store_schema,
 )
 from ..persistence.in_memory_repository import InMemoryRepository
+from ..persistence.models import create_model_schema
+from ..persistence.user_repository import UserRepository
+from ..persistence.place_repository import PlaceRepository
+from ..persistence.review_repository import ReviewRepository
+from ..persistence.amenity_repository import AmenityRepository
+from ..persistence.composite_repository import CompositeRepository
+from ..persistence.caching_repository import CachingRepository
+from ..persistence.instrumented_repository import InstrumentedRepository
+from ..persistence.engine import PoolSettings, get_engine, on_statement, pool_status
+from ..persistence import unit_of_work as uow
+
+STORAGE_MODES = ("objects", "tables")
+
+
+class _PlaceRelations(NamedTuple):
+    """Related records embedded in serialized places."""
+
+    owners: dict
+    amenities: dict
+    reviews: dict  # place id -> reviews
+    review_stats: dict  # place id -> review aggregates
+
+    # classes whose writes change a serialized place
+    CLASSES = ("User", "Amenity", "Review", REVIEW_STATS_CLASS)
+
+    def records(self):
+        for _, owner in sorted(self.owners.items()):
+            yield owner
+        for _, amenity in sorted(self.amenities.items()):
+            yield amenity
+        for reviews in self.reviews.values():
+            yield from reviews
+        for place_id, stats in sorted(self.review_stats.items()):
+            if "id" in stats:
+                yield stats
+            else:
+                # computed from the reviews, not stored: tag by its values
+                yield {
+                    "id": place_id,
+                    "updated_at": (stats["review_count"], stats["last_review_at"]),
+                }
+
+
+class _BatchError(Exception):
+    """A rejected item of a batch request: its operation, index and status."""
+
+    def __init__(self, status: int, message: str, op: str, index: int):
+        super().__init__(message)
+        self.status, self.op, self.index = status, op, index
 
 
 @lru_cache(maxsize=1)
@@ -51,6 +108,39 @@ def _load_alembic_tools():
     return alembic_config.Config, alembic_command
 
 
+def _config_flag(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+def _build_sql_repository(uri: str, mode: str, pool: PoolSettings | None = None):
+    """Create the SQL repository for `STORAGE_MODE` and its schema.
+
+    ``"objects"`` keeps every entity as JSON in the generic `objects` table.
+    ``"tables"`` maps User, Place, Review and Amenity onto their typed ORM
+    tables and keeps `objects` only for any other class. All repositories
+    share a single engine (and connection pool).
+    """
+    if mode not in STORAGE_MODES:
+        raise RuntimeError(
+            f"Unknown STORAGE_MODE {mode!r}; expected one of {STORAGE_MODES}."
+        )
+    engine = get_engine(uri, pool=pool)
+    generic = SQLAlchemyRepository(uri, engine=engine)
+    create_object_store_schema(engine)
+    if mode == "objects":
+        return generic
+    create_model_schema(engine)
+    return CompositeRepository(
+        UserRepository(uri, engine=engine),
+        generic,
+        place_repo=PlaceRepository(uri, engine=engine),
+        review_repo=ReviewRepository(uri, engine=engine),
+        amenity_repo=AmenityRepository(uri, engine=engine),
+    )
+
+
 def create_app(config: object | dict | None = None):
     app = Flask(__name__)
     if config:
@@ -64,7 +154,61 @@ def create_app(config: object | dict | None = None):
         os.environ.get("SQLALCHEMY_DATABASE_URI", "sqlite:///hbnb_dev.db"),
     )
     app.config.setdefault("USE_IN_MEMORY", False)
+    app.config.setdefault("STORAGE_MODE", os.environ.get("STORAGE_MODE", "objects"))
+    for key in (
+        "SQLALCHEMY_POOL_SIZE",
+        "SQLALCHEMY_MAX_OVERFLOW",
+        "SQLALCHEMY_POOL_TIMEOUT",
+        "SQLALCHEMY_POOL_RECYCLE",
+        "SQLALCHEMY_POOL_PRE_PING",
+    ):
+        if key in os.environ:
+            app.config.setdefault(key, os.environ[key])
     app.config.setdefault("CORS_ALLOW_ORIGIN", "http://127.0.0.1:8000")
+    # request, repository, SQL and bcrypt metrics served at /metrics
+    app.config.setdefault("METRICS_ENABLED", os.environ.get("METRICS_ENABLED", True))
+    metrics_enabled = _config_flag(app.config["METRICS_ENABLED"])
+    app.config.setdefault("MAX_PAGE_SIZE", 100)
+    # rows fetched (and serialized) per step of a streamed list response
+    app.config.setdefault("STREAM_BATCH_SIZE", os.environ.get("STREAM_BATCH_SIZE", 500))
+    # items accepted by one POST /api/v1/<resource>/batch request
+    app.config.setdefault("BATCH_MAX_ITEMS", os.environ.get("BATCH_MAX_ITEMS", 1000))
+    # optional read cache in front of the repository
+    for key, default in (
+        ("REPOSITORY_CACHE", False),
+        ("REPOSITORY_CACHE_SIZE", 10_000),
+        ("REPOSITORY_CACHE_TTL", 30),
+    ):
+        app.config.setdefault(key, os.environ.get(key, default))
+    # serialized GET responses kept for ETag revalidation; 0 disables
+    app.config.setdefault(
+        "RESPONSE_CACHE_SIZE", os.environ.get("RESPONSE_CACHE_SIZE", 256)
+    )
+    # bcrypt cost and hashing pool; tests hash inline at the minimum cost.
+    # Every server process (SERVER_WORKERS on this host) starts its own
+    # pool, so by default each gets its share of the CPUs.
+    testing = bool(app.config.get("TESTING"))
+    app.config.setdefault(
+        "SERVER_WORKERS",
+        os.environ.get("SERVER_WORKERS") or os.environ.get("WEB_CONCURRENCY") or 1,
+    )
+    server_workers = int(app.config["SERVER_WORKERS"])
+    for key, default in (
+        ("BCRYPT_ROUNDS", 4 if testing else passwords.DEFAULT_ROUNDS),
+        (
+            "PASSWORD_HASH_WORKERS",
+            0 if testing else passwords.default_workers(server_workers),
+        ),
+        ("PASSWORD_HASH_QUEUE", None),
+    ):
+        app.config.setdefault(key, os.environ.get(key, default))
+    hash_queue = app.config["PASSWORD_HASH_QUEUE"]
+    hasher = passwords.PasswordHasher(
+        rounds=int(app.config["BCRYPT_ROUNDS"]),
+        workers=int(app.config["PASSWORD_HASH_WORKERS"]),
+        max_pending=None if hash_queue in (None, "") else int(hash_queue),
+    )
+    app.extensions["hbnb_password_hasher"] = hasher
 
     def _allowed_origins() -> set[str]:
         configured = app.config.get("CORS_ALLOW_ORIGINS")
@@ -94,6 +238,37 @@ def create_app(config: object | dict | None = None):
 
         return app.config.get("CORS_ALLOW_ORIGIN", "http://127.0.0.1:8000")
 
+    if metrics_enabled:
+        on_statement(metrics.statement_executed)
+
+        # registered first: timing covers the other request handlers
+        @app.before_request
+        def start_request_metrics():
+            g.metrics = (time.perf_counter(), metrics.track_queries())
+
+        @app.after_request
+        def record_request_metrics(response):
+            started = g.pop("metrics", None)
+            if started is not None:
+                start, token = started
+                route = request.url_rule.rule if request.url_rule else "<unmatched>"
+                metrics.REQUEST_SECONDS.observe(
+                    time.perf_counter() - start,
+                    request.method,
+                    route,
+                    str(response.status_code),
+                )
+                metrics.REQUEST_QUERIES.observe(
+                    metrics.tracked_queries(token), request.method, route
+                )
+            return response
+
+        @app.teardown_request
+        def discard_request_metrics(exc=None):
+            started = g.pop("metrics", None)
+            if started is not None:
+                metrics.tracked_queries(started[1])
+
     @app.before_request
     def handle_preflight_request():
         if request.method != "OPTIONS":
@@ -113,6 +288,7 @@ def create_app(config: object | dict | None = None):
         response.headers["Access-Control-Allow-Methods"] = request.headers.get(
             "Access-Control-Request-Method", "GET, POST, PUT, DELETE, OPTIONS"
         )
+        response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor, ETag"
         response.headers["Vary"] = (
             "Origin, Access-Control-Request-Headers, Access-Control-Request-Method"
         )
@@ -121,12 +297,57 @@ def create_app(config: object | dict | None = None):
     if app.config.get("TESTING") or app.config.get("USE_IN_MEMORY"):
         repo = InMemoryRepository()
     else:
-        repo = SQLAlchemyRepository(app.config["SQLALCHEMY_DATABASE_URI"])
-        SQLAlchemyRepositoryBase.metadata.create_all(repo._engine)
+        repo = _build_sql_repository(
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            app.config["STORAGE_MODE"],
+            PoolSettings.from_config(app.config),
+        )
+    if _config_flag(app.config.get("REPOSITORY_CACHE")):
+        repo = CachingRepository(
+            repo,
+            max_entries=int(app.config["REPOSITORY_CACHE_SIZE"]),
+            ttl=float(app.config["REPOSITORY_CACHE_TTL"]),
+        )
+    cache = repo
+    if metrics_enabled:
+        repo = InstrumentedRepository(repo, metrics.REPOSITORY_SECONDS.observe)
 
-    facade = HBNBFacade(repo)
+    facade = HBNBFacade(repo, hasher)
     app.extensions["hbnb_facade"] = facade
 
+    @app.errorhandler(passwords.PasswordHasherBusy)
+    def password_hashing_busy(e):
+        return {"error": str(e)}, 429, {"Retry-After": "1"}
+
+    # One unit of work per request: repositories share a session and the
+    # transaction is committed once, or rolled back on an error response.
+    @app.before_request
+    def begin_unit_of_work():
+        g.uow_token = uow.begin()
+
+    @app.after_request
+    def commit_unit_of_work(response):
+        token = g.pop("uow_token", None)
+        if token is not None:
+            try:
+                uow.end(token, commit=response.status_code < 400)
+            except uow.UnitOfWorkFailed:
+                # the view answered success although one of its writes failed
+                app.logger.error(
+                    "%s %s: a write failed; the request was rolled back",
+                    request.method,
+                    request.path,
+                )
+                response = jsonify({"error": "Internal server error"})
+                response.status_code = 500
+        return response
+
+    @app.teardown_request
+    def discard_unit_of_work(exc=None):
+        token = g.pop("uow_token", None)
+        if token is not None:
+            uow.end(token, commit=False)
+
     # Initialize JWT if requested in config
     if app.config.get("ENABLE_AUTH"):
         # Prefer explicit config; fall back to environment variable
@@ -156,58 +377,308 @@ def create_app(config: object | dict | None = None):
     def _sanitize_amenity(obj: dict) -> dict:
         return dict(obj)
 
+    def _place_relations(objs: list, fields: set | None = None) -> _PlaceRelations:
+        """Load the owners, amenities, reviews and review aggregates of places.
+
+        Relations for the whole page are resolved with a few bulk
+        repository calls instead of one lookup per place and amenity.
+        Relations left out of a `fields` projection are not loaded, so a
+        listing asking for the aggregates but not `reviews` never reads
+        the reviews themselves.
+        """
+
+        def wanted(name: str) -> bool:
+            return fields is None or name in fields
+
+        owner_ids = set()
+        if wanted("owner"):
+            owner_ids = {o.get("user_id") for o in objs if o.get("user_id")}
+        amenity_ids = set()
+        if wanted("amenities"):
+            amenity_ids = {aid for o in objs for aid in (o.get("amenity_ids") or [])}
+        place_ids = [o.get("id") for o in objs if o.get("id")]
+
+        owners = {}
+        if owner_ids:
+            owners = {u.get("id"): u for u in facade.get_many("User", owner_ids)}
+        amenities_by_id = {}
+        if amenity_ids:
+            amenities_by_id = {
+                a.get("id"): a for a in facade.get_many("Amenity", amenity_ids)
+            }
+        reviews_by_place: dict = {}
+        if place_ids and wanted("reviews"):
+            for r in facade.find_in("Review", "place_id", place_ids):
+                reviews_by_place.setdefault(r.get("place_id"), []).append(r)
+        stats_by_place = {}
+        if place_ids and any(wanted(f) for f in REVIEW_STATS_FIELDS):
+            stats_by_place = facade.review_stats(place_ids)
+        return _PlaceRelations(
+            owners, amenities_by_id, reviews_by_place, stats_by_place
+        )
+
+    def _sanitize_places(
+        objs: list,
+        fields: set | None = None,
+        relations: _PlaceRelations | None = None,
+    ) -> list:
+        """Attach owner, amenities, reviews and review aggregates to places."""
+        if relations is None:
+            relations = _place_relations(objs, fields)
+        owners, amenities_by_id, reviews_by_place, stats_by_place = relations
+        out = []
+        for obj in objs:
+            place = dict(obj)
+            owner_id = place.get("user_id")
+            if owner_id:
+                owner = owners.get(owner_id)
+                if owner is not None:
+                    place["owner"] = {
+                        "id": owner.get("id"),
+                        "email": owner.get("email"),
+                    }
+                else:
+                    place["owner"] = {"id": owner_id}
+            else:
+                place["owner"] = None
+            # missing amenities are ignored
+            place["amenities"] = [
+                amenities_by_id[aid]
+                for aid in (place.get("amenity_ids") or [])
+                if aid in amenities_by_id
+            ]
+            place["reviews"] = reviews_by_place.get(place.get("id"), [])
+            place.update(review_summary(stats_by_place.get(place.get("id"))))
+            out.append(place)
+        return out
+
     def _sanitize_place(obj: dict) -> dict:
-        out = dict(obj)
-        owner_id = out.get("user_id")
-        if owner_id:
-            try:
-                owner = facade.get("User", owner_id)
-                out["owner"] = {
-                    "id": owner.get("id"),
-                    "email": owner.get("email"),
-                }
-            except NotFoundError:
-                out["owner"] = {"id": owner_id}
-        else:
-            out["owner"] = None
+        return _sanitize_places([obj])[0]
 
-        # attach amenities
-        amenity_ids = out.get("amenity_ids") or []
-        amenities = []
-        for aid in amenity_ids:
+    def _create_error(cls_name: str, payload) -> str | None:
+        """The first problem with a create payload that needs no lookups."""
+        if not isinstance(payload, dict):
+            return "Invalid payload"
+        required = {
+            "User": ("email", "password"),
+            "Amenity": ("name",),
+            "Place": ("user_id", "name"),
+            "Review": ("place_id", "text"),
+        }[cls_name]
+        for field in required:
+            if not payload.get(field):
+                return f"Missing {field}"
+        if cls_name == "Place" and "price_by_night" in payload:
             try:
-                a = facade.get("Amenity", aid)
-                amenities.append(a)
-            except NotFoundError:
-                # ignore missing amenities
-                pass
-        out["amenities"] = amenities
+                if int(payload["price_by_night"]) < 0:
+                    return "price_by_night must be >= 0"
+            except (ValueError, TypeError):
+                return "price_by_night must be int"
+        return None
+
+    def _requested_fields() -> set | None:
+        raw = request.args.get("fields")
+        if not raw:
+            return None
+        # the id is always returned; it is the pagination cursor
+        return {f.strip() for f in raw.split(",") if f.strip()} | {"id"}
 
-        # attach reviews
+    def _int_arg(name: str, default: int | None = None) -> int | None:
+        raw = request.args.get(name)
+        if raw is None or raw == "":
+            return default
         try:
-            all_reviews = facade.list("Review")
-            place_reviews = [
-                r for r in all_reviews if r.get("place_id") == out.get("id")
-            ]
-        except NotFoundError:
-            place_reviews = []
-        out["reviews"] = place_reviews
-        return out
+            return int(raw)
+        except ValueError:
+            raise ValidationError(f"{name} must be an integer") from None
+
+    def _page_limit() -> int:
+        max_size = int(current_app.config["MAX_PAGE_SIZE"])
+        limit = _int_arg("limit", max_size)
+        if limit < 1:
+            raise ValidationError("limit must be a positive integer")
+        return min(limit, max_size)
+
+    def _render_list(items: list, cursor: str | None, sanitize, fields):
+        out = sanitize(items, fields)
+        if fields is not None:
+            out = [{k: v for k, v in o.items() if k in fields} for o in out]
+        response = jsonify(out)
+        if cursor is not None:
+            response.headers["X-Next-Cursor"] = cursor
+        return response
 
-    def _ensure_auth_allowed():
-        """Verify JWT when `ENABLE_AUTH` is set; otherwise no-op."""
-        if current_app.config.get("ENABLE_AUTH"):
-            verify_jwt_in_request()
+    response_cache = ResponseCache(int(app.config["RESPONSE_CACHE_SIZE"]))
+    app.extensions["hbnb_response_cache"] = response_cache
+    facade.add_write_listener(lambda cls_name, _id: response_cache.invalidate(cls_name))
+
+    def _cached_json(records, build, depends_on, headers=None):
+        """Serve `build()` as JSON under an ETag derived from `records`.
+
+        A matching `If-None-Match` gets a 304 without building or
+        serializing the body; otherwise the body comes from the response
+        cache, or is built, serialized and cached.
+        """
+        key = request.full_path
+        etag = etag_for(key, records)
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+        else:
+            hit = response_cache.get(key, etag)
+            if hit is None:
+                response = jsonify(build())
+                response.headers.update(headers or {})
+                response_cache.put(
+                    key, etag, response.get_data(), headers or {}, depends_on
+                )
+            else:
+                body, cached_headers = hit
+                response = app.response_class(body, mimetype="application/json")
+                response.headers.update(cached_headers)
+        response.set_etag(etag)
+        # clients may keep the body but must revalidate before reusing it
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def _stream_format() -> str | None:
+        """``"json"`` or ``"ndjson"`` when the client asked for a stream."""
+        requested = request.args.get("stream")
+        if requested in ("json", "ndjson"):
+            return requested
+        if request.accept_mimetypes.best == "application/x-ndjson":
+            return "ndjson"
+        return None
+
+    def _streamed_list(cls_name: str, sanitize, fields, ndjson: bool):
+        """Stream the whole collection as a chunked JSON array or NDJSON.
+
+        Rows come from `facade.stream` and are serialized
+        `STREAM_BATCH_SIZE` at a time, so memory per request stays flat
+        and the first bytes are sent before the query has finished.
+        Streams carry no ETag: it would need every row up front.
+        """
+        batch_size = int(app.config["STREAM_BATCH_SIZE"])
+
+        def dumps(obj) -> str:
+            # compact, like jsonify outside debug mode
+            return app.json.dumps(obj, separators=(",", ":"))
+
+        def render(batch):
+            out = sanitize(batch, fields)
+            if fields is not None:
+                out = [{k: v for k, v in o.items() if k in fields} for o in out]
+            return out
+
+        def batches():
+            batch = []
+            for obj in facade.stream(cls_name, batch_size):
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    yield render(batch)
+                    batch = []
+            if batch:
+                yield render(batch)
+
+        def ndjson_body():
+            for out in batches():
+                yield "".join(dumps(o) + "\n" for o in out)
+
+        def json_body():
+            yield "["
+            separator = ""
+            for out in batches():
+                yield separator + ",".join(dumps(o) for o in out)
+                separator = ","
+            yield "]"
+
+        body = ndjson_body() if ndjson else json_body()
+        mimetype = "application/x-ndjson" if ndjson else "application/json"
+        return app.response_class(stream_with_context(body), mimetype=mimetype)
+
+    def _list_response(cls_name: str, sanitize, relations=None):
+        """Serve a list endpoint honouring `limit`, `after` and `fields`.
+
+        Without `limit`/`after` the whole collection is returned as before.
+        Otherwise one page ordered by id is returned and, if more rows
+        follow, the cursor for the next page is sent in `X-Next-Cursor`.
+
+        Responses carry an ETag (see `_cached_json`). `relations`, when
+        given, loads the related records that `sanitize` embeds; they are
+        part of the ETag and are passed to `sanitize` as a third argument.
+
+        ``?stream=json``, ``?stream=ndjson`` or ``Accept:
+        application/x-ndjson`` stream the whole collection instead (see
+        `_streamed_list`).
+        """
+        fields = _requested_fields()
+        after = request.args.get("after") or None
+        stream = _stream_format()
+        if stream is not None:
+            if after is not None or request.args.get("limit") is not None:
+                return {"error": "stream cannot be combined with limit or after"}, 400
+            return _streamed_list(cls_name, sanitize, fields, stream == "ndjson")
+        cursor = None
+        try:
+            if request.args.get("limit") is None and after is None:
+                items = facade.list(cls_name)
+            else:
+                items, cursor = facade.list_page(cls_name, _page_limit(), after)
+        except ValidationError as e:
+            return {"error": str(e)}, 400
+        records = list(items)
+        depends_on = {cls_name}
+        extra = ()
+        if relations is not None:
+            related = relations(items, fields)
+            records.extend(related.records())
+            depends_on.update(related.CLASSES)
+            extra = (related,)
+
+        def build():
+            out = sanitize(items, fields, *extra)
+            if fields is not None:
+                out = [{k: v for k, v in o.items() if k in fields} for o in out]
+            return out
+
+        headers = {"X-Next-Cursor": cursor} if cursor is not None else None
+        return _cached_json(records, build, depends_on, headers)
+
+    token_cache = TokenCache()
+    app.extensions["hbnb_token_cache"] = token_cache
+
+    def _verified_claims(_key=None) -> dict:
+        # flask-jwt-extended finds the token (JWT_TOKEN_LOCATION,
+        # JWT_HEADER_NAME, JWT_HEADER_TYPE, ...) and checks that it is a
+        # valid access token
+        verify_jwt_in_request()
+        return get_jwt()
+
+    def _token_cache_key() -> str | None:
+        # Only tokens sent in a header are cached: a cookie token must pass
+        # its CSRF check on every unsafe request.
+        locations = current_app.config["JWT_TOKEN_LOCATION"]
+        if isinstance(locations, str):
+            locations = [locations]
+        if list(locations) != ["headers"]:
+            return None
+        return request.headers.get(current_app.config["JWT_HEADER_NAME"])
 
-    def _is_admin_claim() -> bool:
-        if not current_app.config.get("ENABLE_AUTH"):
-            return False
-        return bool(get_jwt().get("is_admin", False))
+    def _authenticate() -> tuple[str | None, bool] | None:
+        """Return (identity, is_admin) for the request's access token, or None.
 
-    def _current_identity() -> str | None:
-        if not current_app.config.get("ENABLE_AUTH"):
+        Header tokens are verified once and then cached until they expire
+        (see `TokenCache`).
+        """
+        key = _token_cache_key()
+        try:
+            if key is None:
+                claims = _verified_claims()
+            else:
+                claims = token_cache.claims(key, _verified_claims)
+        except Exception:
             return None
-        return get_jwt_identity()
+        identity = claims.get(current_app.config.get("JWT_IDENTITY_CLAIM", "sub"))
+        return identity, bool(claims.get("is_admin", False))
 
     @app.cli.command("init-db")
     @click.option("--db", default=None, help="Database URI to initialize")
@@ -218,32 +689,67 @@ def create_app(config: object | dict | None = None):
         `app.config['SQLALCHEMY_DATABASE_URI']` or fall back to
         `sqlite:///hbnb_dev.db`.
         """
-        from sqlalchemy import create_engine
-
         uri = db or app.config.get("SQLALCHEMY_DATABASE_URI") or "sqlite:///hbnb_dev.db"
 
         # Create engine and create metadata for known modules
-        engine = create_engine(uri, future=True)
+        engine = get_engine(uri)
 
-        # Create tables for the generic object store (if present)
+        # Create tables and indexes for the generic object store (if present)
         try:
-            from ..persistence.sqlalchemy_repository import Base as _obj_base
+            from ..persistence.sqlalchemy_repository import (
+                create_object_store_schema as _create_obj_schema,
+            )
 
-            _obj_base.metadata.create_all(engine)
+            _create_obj_schema(engine)
         except ImportError:
             # ignore if module not available
             pass
 
         # Create tables for ORM models (if present)
         try:
-            from ..persistence.models import Base as _models_base
+            from ..persistence.models import create_model_schema
 
-            _models_base.metadata.create_all(engine)
+            create_model_schema(engine)
         except ImportError:
             pass
 
         print(f"Initialized database: {uri}")
 
+    @app.cli.command("migrate-objects")
+    @click.option("--db", default=None, help="Database URI to migrate")
+    @click.option(
+        "--delete-source",
+        is_flag=True,
+        help="Remove migrated rows from the generic objects table",
+    )
+    def migrate_objects(db: str | None = None, delete_source: bool = False):
+        """Move User/Place/Review/Amenity rows from `objects` to typed tables.
+
+        Run once before switching `STORAGE_MODE` to ``tables``. Rows already
+        present in the typed tables are left untouched.
+        """
+        from ..persistence.object_migration import migrate_objects_to_tables
+
+        uri = db or app.config.get("SQLALCHEMY_DATABASE_URI") or "sqlite:///hbnb_dev.db"
+        engine = get_engine(uri)
+        report = migrate_objects_to_tables(engine, delete_source=delete_source)
+        for cls_name, stats in report.items():
+            print(
+                f"{cls_name}: {stats['migrated']} migrated, "
+                f"{stats['skipped_existing']} already present, "
+                f"{stats['skipped_invalid']} skipped"
+            )
+
+    @app.cli.command("rebuild-review-stats")
+    def rebuild_review_stats():
+        """Recompute the per-place review aggregates from the stored reviews.
+
+        Run after loading data written without the facade (imports, direct
+        SQL) or after `migrate-objects`.
+        """
+        count = facade.rebuild_review_stats()
+        print(f"Rebuilt review aggregates for {count} places")
+
     # Alembic `flask db` wrapper
     @app.cli.group("db")
     def db_cmd():
@@ -306,17 +812,13 @@ def create_app(config: object | dict | None = None):
     @app.route("/api/v1/users", methods=["POST"])
     def create_user():
         payload = request.get_json() or {}
-        if not isinstance(payload, dict):
-            return {"error": "Invalid payload"}, 400
-        if not payload.get("email"):
-            return {"error": "Missing email"}, 400
-        if not payload.get("password"):
-            return {"error": "Missing password"}, 400
+        error = _create_error("User", payload)
+        if error:
+            return {"error": error}, 400
 
         # ensure unique email
-        for u in facade.list("User"):
-            if u.get("email") == payload.get("email"):
-                return {"error": "email already exists"}, 400
+        if facade.get_user_by_email(payload.get("email")) is not None:
+            return {"error": "email already exists"}, 400
 
         try:
             obj = facade.create("User", payload)
@@ -330,25 +832,14 @@ def create_app(config: object | dict | None = None):
         if not data.get("email") or not data.get("password"):
             return {"error": "Missing credentials"}, 400
         # find user by email
-        user = None
-        for u in facade.list("User"):
-            if u.get("email") == data.get("email"):
-                user = u
-                break
+        user = facade.get_user_by_email(data.get("email"))
         if not user:
             return {"error": "Bad credentials"}, 401
-        # stored password may be hashed; use bcrypt
-        import bcrypt
-
+        # verified on the password hashing pool (429 when saturated)
         stored = user.get("password")
-        if not stored or not isinstance(stored, str):
+        if not isinstance(stored, str) or not isinstance(data.get("password"), str):
             return {"error": "Bad credentials"}, 401
-        try:
-            if not bcrypt.checkpw(
-                data.get("password").encode("utf-8"), stored.encode("utf-8")
-            ):
-                return {"error": "Bad credentials"}, 401
-        except (ValueError, TypeError):
+        if not hasher.verify(data.get("password"), stored):
             return {"error": "Bad credentials"}, 401
         # create token with is_admin claim
         token = create_access_token(
@@ -359,8 +850,9 @@ def create_app(config: object | dict | None = None):
 
     @app.route("/api/v1/users", methods=["GET"])
     def list_users():
-        items = facade.list("User")
-        return jsonify([_sanitize_user(i) for i in items])
+        return _list_response(
+            "User", lambda items, fields: [_sanitize_user(i) for i in items]
+        )
 
     @app.route("/api/v1/users/<string:obj_id>", methods=["GET", "PUT"])
     def user_item(obj_id: str):
@@ -369,7 +861,7 @@ def create_app(config: object | dict | None = None):
                 obj = facade.get("User", obj_id)
             except NotFoundError:
                 return {"error": "Not found"}, 404
-            return _sanitize_user(obj)
+            return _cached_json([obj], lambda: _sanitize_user(obj), {"User"})
 
         # PUT
         payload = request.get_json() or {}
@@ -379,14 +871,16 @@ def create_app(config: object | dict | None = None):
             payload.pop(forbidden, None)
         # enforce auth: only the user themselves or admin may update
         if current_app.config.get("ENABLE_AUTH"):
-            try:
-                verify_jwt_in_request()
-            except Exception:
+            auth = _authenticate()
+            if auth is None:
                 return {"error": "Missing or invalid token"}, 401
-            identity = get_jwt_identity()
-            is_admin = bool(get_jwt().get("is_admin", False))
+            identity, is_admin = auth
             if not is_admin and identity != obj_id:
                 return {"error": "Forbidden"}, 403
+        email = payload.get("email")
+        holder = facade.get_user_by_email(email) if isinstance(email, str) else None
+        if holder is not None and holder["id"] != obj_id:
+            return {"error": "email already exists"}, 400
         try:
             obj = facade.update("User", obj_id, payload)
         except NotFoundError:
@@ -400,17 +894,17 @@ def create_app(config: object | dict | None = None):
     def amenities_list():
         if request.method == "POST":
             payload = request.get_json() or {}
-            if not isinstance(payload, dict):
-                return {"error": "Invalid payload"}, 400
-            if not payload.get("name"):
-                return {"error": "Missing name"}, 400
+            error = _create_error("Amenity", payload)
+            if error:
+                return {"error": error}, 400
             try:
                 obj = facade.create("Amenity", payload)
             except ValidationError as e:
                 return {"error": str(e)}, 400
             return _sanitize_amenity(obj), 201
-        items = facade.list("Amenity")
-        return jsonify(items)
+        return _list_response(
+            "Amenity", lambda items, fields: [_sanitize_amenity(i) for i in items]
+        )
 
     @app.route("/api/v1/amenities/<string:obj_id>", methods=["GET", "PUT"])
     def amenity_item(obj_id: str):
@@ -442,24 +936,15 @@ def create_app(config: object | dict | None = None):
                 return {"error": "Invalid payload"}, 400
             # enforce auth: creator must be authenticated and owner (or admin)
             if current_app.config.get("ENABLE_AUTH"):
-                try:
-                    verify_jwt_in_request()
-                except Exception:
+                auth = _authenticate()
+                if auth is None:
                     return {"error": "Missing or invalid token"}, 401
-                identity = get_jwt_identity()
-                is_admin = bool(get_jwt().get("is_admin", False))
+                identity, is_admin = auth
                 if not is_admin and identity != payload.get("user_id"):
                     return {"error": "Forbidden"}, 403
-            if not payload.get("user_id"):
-                return {"error": "Missing user_id"}, 400
-            if not payload.get("name"):
-                return {"error": "Missing name"}, 400
-            if "price_by_night" in payload:
-                try:
-                    if int(payload["price_by_night"]) < 0:
-                        return {"error": "price_by_night must be >= 0"}, 400
-                except (ValueError, TypeError):
-                    return {"error": "price_by_night must be int"}, 400
+            error = _create_error("Place", payload)
+            if error:
+                return {"error": error}, 400
             try:
                 facade.get("User", payload.get("user_id"))
             except NotFoundError:
@@ -469,8 +954,58 @@ def create_app(config: object | dict | None = None):
             except ValidationError as e:
                 return {"error": str(e)}, 400
             return _sanitize_place(obj), 201
-        items = facade.list("Place")
-        return jsonify([_sanitize_place(i) for i in items])
+        return _list_response("Place", _sanitize_places, _place_relations)
+
+    @app.route("/api/v1/places/search", methods=["GET"])
+    def places_search():
+        """Filtered, sorted and paginated place listing.
+
+        Query parameters: `country`, `min_price`, `max_price`, `max_guest`
+        (minimum capacity), `amenity_ids` (comma-separated, all required),
+        `sort` (`id`, `price` or `-price`), `limit`, `after` and `fields`.
+        """
+        amenity_ids = [
+            aid.strip()
+            for raw in request.args.getlist("amenity_ids")
+            for aid in raw.split(",")
+            if aid.strip()
+        ]
+        try:
+            items, cursor = facade.search_places(
+                _page_limit(),
+                country=request.args.get("country") or None,
+                min_price=_int_arg("min_price"),
+                max_price=_int_arg("max_price"),
+                max_guest=_int_arg("max_guest"),
+                amenity_ids=tuple(amenity_ids),
+                sort=request.args.get("sort") or "id",
+                after=request.args.get("after") or None,
+            )
+        except ValidationError as e:
+            return {"error": str(e)}, 400
+        return _render_list(items, cursor, _sanitize_places, _requested_fields())
+
+    @app.route("/api/v1/places/nearby", methods=["GET"])
+    def places_nearby():
+        """Places within `radius_km` (default 10) of `lat`/`lon`, nearest first.
+
+        Accepts `limit` and `fields`; each place carries `distance_km`.
+        """
+        try:
+            try:
+                lat = float(request.args["lat"])
+                lon = float(request.args["lon"])
+                radius_km = float(request.args.get("radius_km") or 10)
+            except KeyError:
+                raise ValidationError("lat and lon are required") from None
+            except ValueError:
+                raise ValidationError(
+                    "lat, lon and radius_km must be numbers"
+                ) from None
+            items = facade.nearby_places(lat, lon, radius_km, limit=_page_limit())
+        except ValidationError as e:
+            return {"error": str(e)}, 400
+        return _render_list(items, None, _sanitize_places, _requested_fields())
 
     @app.route("/api/v1/places/<string:obj_id>", methods=["GET", "PUT", "DELETE"])
     def place_item(obj_id: str):
@@ -479,7 +1014,12 @@ def create_app(config: object | dict | None = None):
                 obj = facade.get("Place", obj_id)
             except NotFoundError:
                 return {"error": "Not found"}, 404
-            return _sanitize_place(obj)
+            related = _place_relations([obj])
+            return _cached_json(
+                [obj, *related.records()],
+                lambda: _sanitize_places([obj], None, related)[0],
+                {"Place", *related.CLASSES},
+            )
         if request.method == "PUT":
             payload = request.get_json() or {}
             if not isinstance(payload, dict):
@@ -488,18 +1028,17 @@ def create_app(config: object | dict | None = None):
                 payload.pop(forbidden, None)
             # enforce auth: only owner or admin may update
             if current_app.config.get("ENABLE_AUTH"):
-                try:
-                    verify_jwt_in_request()
-                except Exception:
+                auth = _authenticate()
+                if auth is None:
                     return {"error": "Missing or invalid token"}, 401
-                identity = get_jwt_identity()
-                is_admin = bool(get_jwt().get("is_admin", False))
-                try:
-                    existing = facade.get("Place", obj_id)
-                except NotFoundError:
-                    return {"error": "Not found"}, 404
-                if not is_admin and existing.get("user_id") != identity:
-                    return {"error": "Forbidden"}, 403
+                identity, is_admin = auth
+                if not is_admin:
+                    try:
+                        owner = facade.is_owner("Place", obj_id, identity)
+                    except NotFoundError:
+                        return {"error": "Not found"}, 404
+                    if not owner:
+                        return {"error": "Forbidden"}, 403
             try:
                 obj = facade.update("Place", obj_id, payload)
             except NotFoundError:
@@ -510,23 +1049,21 @@ def create_app(config: object | dict | None = None):
         # DELETE
         # DELETE: only owner or admin
         if current_app.config.get("ENABLE_AUTH"):
-            try:
-                verify_jwt_in_request()
-            except Exception:
+            auth = _authenticate()
+            if auth is None:
                 return {"error": "Missing or invalid token"}, 401
-            identity = get_jwt_identity()
-            is_admin = bool(get_jwt().get("is_admin", False))
-            try:
-                existing = facade.get("Place", obj_id)
-            except NotFoundError:
-                return {"error": "Not found"}, 404
-            if not is_admin and existing.get("user_id") != identity:
-                return {"error": "Forbidden"}, 403
+            identity, is_admin = auth
+            if not is_admin:
+                try:
+                    owner = facade.is_owner("Place", obj_id, identity)
+                except NotFoundError:
+                    return {"error": "Not found"}, 404
+                if not owner:
+                    return {"error": "Forbidden"}, 403
         try:
-            facade.get("Place", obj_id)
+            facade.delete("Place", obj_id)
         except NotFoundError:
             return {"error": "Not found"}, 404
-        facade.delete("Place", obj_id)
         return ("", 204)
 
     # Reviews
@@ -534,24 +1071,19 @@ def create_app(config: object | dict | None = None):
     def reviews_list():
         if request.method == "POST":
             payload = request.get_json() or {}
-            if not isinstance(payload, dict):
-                return {"error": "Invalid payload"}, 400
-            if not payload.get("place_id"):
-                return {"error": "Missing place_id"}, 400
-            if not payload.get("text"):
-                return {"error": "Missing text"}, 400
+            error = _create_error("Review", payload)
+            if error:
+                return {"error": error}, 400
             try:
                 facade.get("Place", payload.get("place_id"))
             except NotFoundError:
                 return {"error": "place_id not found"}, 400
             # enforce auth: creator must be authenticated and owner (or admin)
             if current_app.config.get("ENABLE_AUTH"):
-                try:
-                    verify_jwt_in_request()
-                except Exception:
+                auth = _authenticate()
+                if auth is None:
                     return {"error": "Missing or invalid token"}, 401
-                identity = get_jwt_identity()
-                is_admin = bool(get_jwt().get("is_admin", False))
+                identity, is_admin = auth
                 if not is_admin and identity != payload.get("user_id"):
                     return {"error": "Forbidden"}, 403
             try:
@@ -559,8 +1091,7 @@ def create_app(config: object | dict | None = None):
             except ValidationError as e:
                 return {"error": str(e)}, 400
             return obj, 201
-        items = facade.list("Review")
-        return jsonify(items)
+        return _list_response("Review", lambda items, fields: items)
 
     @app.route("/api/v1/reviews/<string:obj_id>", methods=["GET", "PUT", "DELETE"])
     def review_item(obj_id: str):
@@ -578,18 +1109,17 @@ def create_app(config: object | dict | None = None):
                 payload.pop(forbidden, None)
             # enforce auth: only review owner or admin may update
             if current_app.config.get("ENABLE_AUTH"):
-                try:
-                    verify_jwt_in_request()
-                except Exception:
+                auth = _authenticate()
+                if auth is None:
                     return {"error": "Missing or invalid token"}, 401
-                identity = get_jwt_identity()
-                is_admin = bool(get_jwt().get("is_admin", False))
-                try:
-                    existing = facade.get("Review", obj_id)
-                except NotFoundError:
-                    return {"error": "Not found"}, 404
-                if not is_admin and existing.get("user_id") != identity:
-                    return {"error": "Forbidden"}, 403
+                identity, is_admin = auth
+                if not is_admin:
+                    try:
+                        owner = facade.is_owner("Review", obj_id, identity)
+                    except NotFoundError:
+                        return {"error": "Not found"}, 404
+                    if not owner:
+                        return {"error": "Forbidden"}, 403
             try:
                 obj = facade.update("Review", obj_id, payload)
             except NotFoundError:
@@ -600,27 +1130,189 @@ def create_app(config: object | dict | None = None):
         # DELETE
         # DELETE: only owner or admin
         if current_app.config.get("ENABLE_AUTH"):
-            try:
-                verify_jwt_in_request()
-            except Exception:
+            auth = _authenticate()
+            if auth is None:
                 return {"error": "Missing or invalid token"}, 401
-            identity = get_jwt_identity()
-            is_admin = bool(get_jwt().get("is_admin", False))
-            try:
-                existing = facade.get("Review", obj_id)
-            except NotFoundError:
-                return {"error": "Not found"}, 404
-            if not is_admin and existing.get("user_id") != identity:
-                return {"error": "Forbidden"}, 403
+            identity, is_admin = auth
+            if not is_admin:
+                try:
+                    owner = facade.is_owner("Review", obj_id, identity)
+                except NotFoundError:
+                    return {"error": "Not found"}, 404
+                if not owner:
+                    return {"error": "Forbidden"}, 403
         try:
-            facade.get("Review", obj_id)
+            facade.delete("Review", obj_id)
         except NotFoundError:
             return {"error": "Not found"}, 404
-        facade.delete("Review", obj_id)
         return ("", 204)
 
+    # Batch writes
+    _BATCH_RESOURCES = {
+        "users": ("User", ("create", "update")),
+        "amenities": ("Amenity", ("create", "update")),
+        "places": ("Place", ("create", "update", "delete")),
+        "reviews": ("Review", ("create", "update", "delete")),
+    }
+    # fields a PUT on the resource ignores
+    _READ_ONLY = {"Review": ("id", "created_at", "user_id", "place_id")}
+    _SANITIZE = {
+        "User": lambda objs: [_sanitize_user(o) for o in objs],
+        "Amenity": lambda objs: [_sanitize_amenity(o) for o in objs],
+        "Place": _sanitize_places,
+        "Review": lambda objs: list(objs),
+    }
+
+    def _check_batch_creates(cls_name: str, items: list, auth) -> None:
+        """Apply the POST checks to every item, with bulk lookups."""
+        for i, payload in enumerate(items):
+            error = _create_error(cls_name, payload)
+            if error:
+                raise _BatchError(400, error, "create", i)
+        reference = {"Place": ("user_id", "User"), "Review": ("place_id", "Place")}
+        if cls_name in reference:
+            field, target = reference[cls_name]
+            known = {
+                o["id"] for o in facade.get_many(target, [p[field] for p in items])
+            }
+            for i, payload in enumerate(items):
+                if payload[field] not in known:
+                    raise _BatchError(400, f"{field} not found", "create", i)
+                if auth is not None:
+                    identity, is_admin = auth
+                    if not is_admin and identity != payload.get("user_id"):
+                        raise _BatchError(403, "Forbidden", "create", i)
+
+    def _check_batch_emails(creates: list, updates: dict) -> None:
+        """Reject emails stored on another user or claimed twice in the batch.
+
+        An address a batch moves a user away from is still taken: the
+        writes run in order, so it is only free once the batch committed.
+        """
+        claims = [(p["email"], "create", i, None) for i, p in enumerate(creates)]
+        claims += [
+            (changes["email"], "update", i, obj_id)
+            for i, (obj_id, changes) in enumerate(updates.items())
+            if isinstance(changes.get("email"), str)
+        ]
+        if not claims:
+            return
+        holders = {
+            u.get("email"): u["id"]
+            for u in facade.find_in("User", "email", [c[0] for c in claims])
+        }
+        seen = set()
+        for email, op, i, obj_id in claims:
+            if holders.get(email, obj_id) != obj_id or email in seen:
+                raise _BatchError(400, "email already exists", op, i)
+            seen.add(email)
+
+    def _check_batch_owners(cls_name: str, op: str, ids: list, auth) -> None:
+        """Apply the PUT/DELETE existence and ownership checks to `ids`."""
+        found = {o["id"]: o for o in facade.get_many(cls_name, ids)}
+        for i, obj_id in enumerate(ids):
+            obj = found.get(obj_id)
+            if obj is None:
+                raise _BatchError(404, "Not found", op, i)
+            if auth is None or auth[1] or cls_name == "Amenity":
+                continue
+            owner = obj_id if cls_name == "User" else obj.get("user_id")
+            if owner != auth[0]:
+                raise _BatchError(403, "Forbidden", op, i)
+
+    @app.route("/api/v1/<string:resource>/batch", methods=["POST"])
+    def batch(resource: str):
+        """Create, update and delete many objects of one resource at once.
+
+        Body: ``{"create": [payload, ...], "update": [{"id": ..., changes},
+        ...], "delete": [id, ...]}``; every key is optional. All items are
+        checked like the single-object endpoints before anything is
+        written, including the unique emails of users against the stored
+        ones and each other. The first failing item is reported as
+        ``{"error", "op", "index"}`` with the status the single endpoint
+        would use. Each operation is then one bulk repository call, all in
+        the request's unit of work: if a write still fails, the request
+        fails and the unit of work undoes the writes already made.
+        """
+        if resource not in _BATCH_RESOURCES:
+            return {"error": "Not found"}, 404
+        cls_name, allowed = _BATCH_RESOURCES[resource]
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return {"error": "Invalid payload"}, 400
+        ops = {}
+        for op in ("create", "update", "delete"):
+            items = body.get(op) or []
+            if not isinstance(items, list):
+                return {"error": f"{op} must be a list"}, 400
+            if items and op not in allowed:
+                return {"error": f"{op} is not supported for {resource}"}, 400
+            ops[op] = items
+        if sum(len(items) for items in ops.values()) > int(
+            app.config["BATCH_MAX_ITEMS"]
+        ):
+            return {"error": "Too many items"}, 413
+        auth = None
+        if current_app.config.get("ENABLE_AUTH"):
+            auth = _authenticate()
+            if auth is None:
+                return {"error": "Missing or invalid token"}, 401
+
+        updates = {}
+        try:
+            _check_batch_creates(cls_name, ops["create"], auth)
+            for i, item in enumerate(ops["update"]):
+                if not isinstance(item, dict) or not item.get("id"):
+                    raise _BatchError(400, "Missing id", "update", i)
+                if item["id"] in updates:
+                    raise _BatchError(400, "Duplicate id", "update", i)
+                changes = dict(item)
+                for forbidden in _READ_ONLY.get(cls_name, ("id", "created_at")):
+                    changes.pop(forbidden, None)
+                updates[item["id"]] = changes
+            _check_batch_owners(cls_name, "update", list(updates), auth)
+            if cls_name == "User":
+                _check_batch_emails(ops["create"], updates)
+            for i, obj_id in enumerate(ops["delete"]):
+                if not isinstance(obj_id, str):
+                    raise _BatchError(400, "ids must be strings", "delete", i)
+            _check_batch_owners(cls_name, "delete", ops["delete"], auth)
+        except _BatchError as e:
+            return {"error": str(e), "op": e.op, "index": e.index}, e.status
+
+        try:
+            created = facade.create_many(cls_name, ops["create"])
+            updated = facade.update_many(cls_name, updates)
+            facade.delete_many(cls_name, ops["delete"])
+        except ValidationError as e:
+            return {"error": str(e)}, 400
+        except NotFoundError as e:
+            return {"error": str(e)}, 404
+        sanitize = _SANITIZE[cls_name]
+        return {
+            "created": sanitize(created),
+            "updated": sanitize(updated),
+            "deleted": list(dict.fromkeys(ops["delete"])),
+        }
+
     @app.route("/health")
     def health():
         return {"status": "ok"}
 
+    @app.route("/health/pool")
+    def health_pool():
+        return {"engines": pool_status()}
+
+    @app.route("/health/cache")
+    def health_cache():
+        if not isinstance(cache, CachingRepository):
+            return {"enabled": False}
+        return {"enabled": True, **cache.stats()}
+
+    if metrics_enabled:
+
+        @app.route("/metrics")
+        def metrics_endpoint():
+            return metrics.render(), 200, {"Content-Type": metrics.CONTENT_TYPE}
+
     return app
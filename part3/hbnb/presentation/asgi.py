@@ -0,0 +1,112 @@
+"""ASGI entry point serving the Flask app's routes from an event loop.
+
+The Flask app is served through uvicorn's WSGI interface
+(`uvicorn.middleware.wsgi.WSGIMiddleware`, which is ``a2wsgi`` when that is
+installed). It receives requests and sends responses on the event loop and
+runs the views on a bounded thread pool, so slow or idle connections do not
+hold a thread. Routes, validation, auth and caching are the same code as
+the WSGI app; the views, the facade and the repositories stay synchronous.
+
+`BodyLimit` sits in front of it: uvicorn's interface buffers the whole body
+before the view can check ``MAX_CONTENT_LENGTH``, so oversized bodies are
+answered with 413 before they are read.
+Serve it with any ASGI server, e.g. ``uvicorn --factory hbnb:create_asgi_app``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .app import create_app
+
+# request body limit when the app sets no MAX_CONTENT_LENGTH
+DEFAULT_MAX_BODY = 16 * 1024 * 1024
+
+_TOO_LARGE = json.dumps({"error": "Request body too large"}).encode()
+
+
+def _default_threads() -> int:
+    # the default size of `ThreadPoolExecutor`
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def _declared_length(scope: Dict[str, Any]) -> Optional[int]:
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodyLimit:
+    """ASGI middleware answering 413 to request bodies over `limit` bytes."""
+
+    def __init__(self, app, limit: int) -> None:
+        self.app = app
+        self.limit = limit
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        declared = _declared_length(scope)
+        if declared is not None and declared > self.limit:
+            await self._too_large(send)
+            return
+        size = 0
+
+        async def limited_receive():
+            nonlocal size
+            message = await receive()
+            size += len(message.get("body", b""))
+            if size > self.limit:
+                # a chunked or mis-declared body: stop reading it
+                raise _BodyTooLarge()
+            return message
+
+        try:
+            await self.app(scope, limited_receive, send)
+        except _BodyTooLarge:
+            # raised while the body is buffered, before the view has run
+            await self._too_large(send)
+
+    async def _too_large(self, send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_TOO_LARGE)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _TOO_LARGE})
+
+
+def create_asgi_app(config: object | dict | None = None) -> BodyLimit:
+    """Create the HBnB app and wrap it for an ASGI server.
+
+    ``ASGI_THREADS`` sizes the WSGI interface's thread pool (default
+    ``min(32, cpus + 4)``). Keep it within the SQL connection pool
+    (``SQLALCHEMY_POOL_SIZE`` plus ``SQLALCHEMY_MAX_OVERFLOW``).
+    ``MAX_CONTENT_LENGTH`` defaults to `DEFAULT_MAX_BODY`.
+    """
+    # only ASGI deployments need uvicorn installed
+    from uvicorn.middleware.wsgi import WSGIMiddleware
+
+    app = create_app(config)
+    if app.config.get("MAX_CONTENT_LENGTH") is None:
+        app.config["MAX_CONTENT_LENGTH"] = DEFAULT_MAX_BODY
+    threads = app.config.get("ASGI_THREADS") or os.environ.get("ASGI_THREADS")
+    wsgi = WSGIMiddleware(app, workers=int(threads) if threads else _default_threads())
+    return BodyLimit(wsgi, int(app.config["MAX_CONTENT_LENGTH"]))
@@ -0,0 +1,65 @@
+"""Cache of verified access tokens.
+
+Protected routes authenticate the bearer token on every request. A
+`TokenCache` keeps the claims of tokens that already passed verification,
+keyed by the SHA-256 digest of the header carrying the token (the token
+itself is not kept) and dropped when the token expires, so repeated
+requests with the same token skip signature and claim validation.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from ..persistence.records import freeze
+
+
+class TokenCache:
+    """Bounded LRU cache of decoded token claims, valid until ``exp``."""
+
+    def __init__(
+        self, max_entries: int = 10_000, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Mapping[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def claims(
+        self, token: str, decode: Callable[[str], Dict[str, Any]]
+    ) -> Mapping[str, Any]:
+        """Return the read-only claims of `token`, decoding it on a miss.
+
+        `decode` must verify the token and raise when it is invalid; its
+        errors propagate and nothing is cached. Tokens without an ``exp``
+        claim are verified every time.
+        """
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+        claims = freeze(decode(token))
+        expires = claims.get("exp")
+        if isinstance(expires, (int, float)):
+            with self._lock:
+                self._entries[key] = (float(expires), claims)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
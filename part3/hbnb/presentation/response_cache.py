@@ -0,0 +1,82 @@
+"""ETags and a server-side cache for read endpoints.
+
+A response's ETag is derived from what it is built from: the request path
+and query, plus the ``id`` and ``updated_at`` of every record serialized
+into it (the objects themselves and the related owners, amenities and
+reviews). Any change to one of those records, or a record appearing or
+disappearing, changes the tag. Since only stored records are hashed, the
+tag can be computed before anything is serialized, and an
+``If-None-Match`` hit answers 304 straight away.
+
+`ResponseCache` keeps the serialized bodies of recent responses, keyed by
+path and ETag, in a bounded LRU. A key can only match the body it was
+built for, so entries never go stale; the facade's write notifications
+just evict entries that depend on the written class to free the memory.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+
+def etag_for(key: str, records: Iterable[Mapping[str, Any]]) -> str:
+    """Strong ETag for a response at `key` built from `records`."""
+    digest = hashlib.sha1(key.encode("utf-8"))
+    for record in records:
+        digest.update(
+            f"\0{record.get('id')}\0{record.get('updated_at')}".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+_Entry = Tuple[bytes, Dict[str, str], FrozenSet[str]]
+
+
+class ResponseCache:
+    """Bounded LRU of serialized response bodies keyed by (path, ETag)."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        with self._lock:
+            entry = self._entries.get((key, etag))
+            if entry is None:
+                return None
+            self._entries.move_to_end((key, etag))
+            return entry[0], entry[1]
+
+    def put(
+        self,
+        key: str,
+        etag: str,
+        body: bytes,
+        headers: Dict[str, str],
+        depends_on: Iterable[str],
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(key, etag)] = (body, dict(headers), frozenset(depends_on))
+            self._entries.move_to_end((key, etag))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, cls_name: str) -> None:
+        """Drop every entry built from objects of `cls_name`."""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if cls_name in e[2]]
+            for k in stale:
+                del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -28,6 +28,9 @@ def _build_app_config() -> dict:
     if _env_flag("USE_IN_MEMORY"):
         config["USE_IN_MEMORY"] = True
 
+    if os.environ.get("STORAGE_MODE"):
+        config["STORAGE_MODE"] = os.environ["STORAGE_MODE"]
+
     return config
 
 
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Production launcher: runs the HBnB app under gunicorn's pre-fork server.
+
+`run.py` uses Flask's single-process development server. This launcher
+starts a gunicorn master that forks `--workers` processes (default: one per
+CPU), each serving requests on `--threads` threads. Send the master SIGHUP
+to reload workers gracefully, or SIGTERM to drain and stop.
+
+With `--preload` the app is created once in the master before forking, so
+workers start fast and share its memory copy-on-write. Either way every
+worker drops the database connections it inherited and opens its own.
+
+App settings come from the same environment variables as `run.py`. Server
+settings can be passed as options or as `HBNB_*` environment variables.
+Requires gunicorn (`pip install gunicorn`).
+"""
+
+import argparse
+import os
+import sys
+
+from hbnb import create_app
+from hbnb.demo_seed import seed_demo_data
+from hbnb.persistence.engine import after_fork, dispose_engines
+from run import _build_app_config, _env_flag, _should_seed_demo_data
+
+
+def _default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    env = os.environ
+    parser = argparse.ArgumentParser(
+        description="Run the HBnB API under a multi-process gunicorn server"
+    )
+    parser.add_argument(
+        "--bind",
+        "-b",
+        default=env.get("HBNB_BIND", "0.0.0.0:5000"),
+        help="Address to listen on (default 0.0.0.0:5000)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=int(env.get("HBNB_WORKERS") or _default_workers()),
+        help="Worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(env.get("HBNB_THREADS") or 1),
+        help="Request threads per worker (default 1)",
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        default=_env_flag("HBNB_PRELOAD"),
+        help="Create the app in the master before forking workers",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=int(env.get("HBNB_TIMEOUT") or 30),
+        help="Seconds before a silent worker is killed and restarted",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=int(env.get("HBNB_GRACEFUL_TIMEOUT") or 30),
+        help="Seconds workers get to finish requests on reload or stop",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(env.get("HBNB_MAX_REQUESTS") or 0),
+        help="Restart a worker after this many requests (0 disables)",
+    )
+    return parser.parse_args(argv)
+
+
+def _seed(app) -> None:
+    result = seed_demo_data(app)
+    place = result.get("place") or {}
+    credentials = result.get("credentials") or {}
+    print(
+        "Demo data ready: "
+        f"{credentials.get('email')} / {credentials.get('password')} "
+        f"(place id: {place.get('id', 'n/a')})"
+    )
+
+
+def _on_starting(preload: bool):
+    def on_starting(server):
+        # Seed once in the master, not once per worker. With --preload the
+        # app created in the master is seeded by `load` instead.
+        if preload or not _should_seed_demo_data():
+            return
+        _seed(create_app(_build_app_config()))
+        dispose_engines()
+
+    return on_starting
+
+
+def post_fork(server, worker):
+    after_fork()
+
+
+def server_options(args: argparse.Namespace) -> dict:
+    """Translate launcher options into gunicorn settings."""
+    return {
+        "bind": args.bind,
+        "workers": max(1, args.workers),
+        "threads": max(1, args.threads),
+        "worker_class": "gthread" if args.threads > 1 else "sync",
+        "preload_app": args.preload,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests // 10,
+        "on_starting": _on_starting(args.preload),
+        "post_fork": post_fork,
+    }
+
+
+def load_app(preload: bool, workers: int = 1):
+    config = _build_app_config()
+    # the app sizes its password hashing pool for its share of the host
+    config["SERVER_WORKERS"] = max(1, workers)
+    app = create_app(config)
+    if preload and _should_seed_demo_data():
+        _seed(app)
+    return app
+
+
+def main(argv=None):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("serve.py needs gunicorn: pip install gunicorn")
+
+    args = _parse_args(argv)
+
+    class HBnBServer(BaseApplication):
+        def load_config(self):
+            for key, value in server_options(args).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app(args.preload, args.workers)
+
+    HBnBServer().run()
+
+
+if __name__ == "__main__":
+    main()
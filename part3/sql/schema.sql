@@ -25,6 +25,7 @@ CREATE TABLE IF NOT EXISTS places (
   price_by_night INTEGER,
   latitude REAL,
   longitude REAL,
+  image TEXT,
   user_id TEXT NOT NULL,
   created_at TEXT NOT NULL,
   updated_at TEXT NOT NULL,
@@ -32,6 +33,10 @@ CREATE TABLE IF NOT EXISTS places (
 );
 
 CREATE INDEX IF NOT EXISTS idx_places_user_id ON places(user_id);
+CREATE INDEX IF NOT EXISTS ix_places_country_price ON places(country, price_by_night);
+CREATE INDEX IF NOT EXISTS ix_places_price_by_night ON places(price_by_night);
+CREATE INDEX IF NOT EXISTS ix_places_max_guest ON places(max_guest);
+CREATE INDEX IF NOT EXISTS ix_places_location ON places(latitude, longitude);
 
 CREATE TABLE IF NOT EXISTS reviews (
   id TEXT PRIMARY KEY,
@@ -61,3 +66,5 @@ CREATE TABLE IF NOT EXISTS place_amenity (
   FOREIGN KEY(place_id) REFERENCES places(id) ON DELETE CASCADE,
   FOREIGN KEY(amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity(amenity_id, place_id);
@@ -0,0 +1,48 @@
+"""Run a set of tests against every repository backend.
+
+Write the tests as a mixin that builds its repository with
+``make_repository(self.backend, self)``, then let `for_each_backend`
+declare one `unittest.TestCase` per backend in the test module:
+
+    class PlaceSearchTests:
+        def setUp(self):
+            self.repo = make_repository(self.backend, self)
+
+    for_each_backend(PlaceSearchTests, globals())
+"""
+
+import os
+import tempfile
+import unittest
+
+from hbnb.persistence import InMemoryRepository
+from hbnb.persistence.engine import dispose_engines
+from hbnb.presentation.app import _build_sql_repository
+
+# in-memory, SQL with every class in `objects`, SQL with typed tables
+BACKENDS = ("memory", "objects", "tables")
+
+
+def make_repository(backend, test):
+    """Return a fresh, empty repository; cleanup is registered on `test`."""
+    if backend == "memory":
+        return InMemoryRepository()
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}")
+    # a file database, so every thread gets its own connection
+    tmpdir = tempfile.TemporaryDirectory()
+    test.addCleanup(tmpdir.cleanup)
+    test.addCleanup(dispose_engines)
+    uri = "sqlite:///" + os.path.join(tmpdir.name, f"{backend}.db")
+    return _build_sql_repository(uri, backend)
+
+
+def for_each_backend(mixin, namespace, backends=BACKENDS):
+    """Add a ``<Backend><Mixin>`` test case per backend to `namespace`."""
+    for backend in backends:
+        name = backend.title() + mixin.__name__
+        namespace[name] = type(
+            name,
+            (mixin, unittest.TestCase),
+            {"backend": backend, "__module__": namespace["__name__"]},
+        )
@@ -1,5 +1,6 @@
 import unittest
 import json
+from unittest import mock
 
 from hbnb import create_app
 
@@ -43,6 +44,12 @@ class HBNBApiTestCase(unittest.TestCase):
         self.assertEqual(r.status_code, 200)
         u2 = r.get_json()
         self.assertEqual(u2.get("first_name"), "Alice")
+        # duplicate email on create or update is rejected
+        r = self.post_json("/api/v1/users", {"email": "a@b.com", "password": "pw"})
+        self.assertEqual(r.status_code, 400)
+        r = self.post_json("/api/v1/users", {"email": "c@d.com", "password": "pw"})
+        r = self.put_json(f"/api/v1/users/{r.get_json()['id']}", {"email": "a@b.com"})
+        self.assertEqual(r.status_code, 400)
 
     def test_amenity_crud(self):
         # missing name
@@ -148,6 +155,151 @@ class HBNBApiTestCase(unittest.TestCase):
         r = self.client.get(f"/api/v1/reviews/{rid}")
         self.assertEqual(r.status_code, 404)
 
+    def test_list_pagination_and_fields(self):
+        names = [f"A{i}" for i in range(5)]
+        for name in names:
+            self.post_json("/api/v1/amenities", {"name": name})
+        seen, after, pages = [], None, 0
+        while True:
+            url = "/api/v1/amenities?limit=2&fields=name"
+            if after:
+                url += f"&after={after}"
+            r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            page = r.get_json()
+            self.assertLessEqual(len(page), 2)
+            self.assertTrue(all(set(a) == {"id", "name"} for a in page))
+            seen.extend(page)
+            pages += 1
+            after = r.headers.get("X-Next-Cursor")
+            if not after:
+                break
+        self.assertEqual(pages, 3)
+        ids = [a["id"] for a in seen]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(sorted(a["name"] for a in seen), names)
+
+        self.assertEqual(self.client.get("/api/v1/amenities?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/amenities?limit=x").status_code, 400)
+        # without paging parameters the full list is still returned
+        self.assertEqual(len(self.client.get("/api/v1/amenities").get_json()), 5)
+
+        u = self.post_json(
+            "/api/v1/users", {"email": "p@b.com", "password": "pw"}
+        ).get_json()
+        self.post_json("/api/v1/places", {"name": "P", "user_id": u["id"]})
+        places = self.client.get("/api/v1/places?limit=10&fields=name,owner").get_json()
+        self.assertEqual(places[0]["owner"]["id"], u["id"])
+        self.assertNotIn("reviews", places[0])
+
+    def test_places_search(self):
+        u = self.post_json(
+            "/api/v1/users", {"email": "s@b.com", "password": "pw"}
+        ).get_json()
+        for name, country, price in (
+            ("A", "Chile", 30),
+            ("B", "Peru", 10),
+            ("C", "Chile", 20),
+        ):
+            self.post_json(
+                "/api/v1/places",
+                {
+                    "name": name,
+                    "user_id": u["id"],
+                    "country": country,
+                    "price_by_night": price,
+                },
+            )
+        r = self.client.get("/api/v1/places/search?country=Chile&sort=price&limit=1")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([p["name"] for p in r.get_json()], ["C"])
+        self.assertIn("owner", r.get_json()[0])
+        cursor = r.headers["X-Next-Cursor"]
+        r = self.client.get(
+            f"/api/v1/places/search?country=Chile&sort=price&limit=1&after={cursor}"
+        )
+        self.assertEqual([p["name"] for p in r.get_json()], ["A"])
+        self.assertNotIn("X-Next-Cursor", r.headers)
+        r = self.client.get("/api/v1/places/search?max_price=15&fields=name")
+        self.assertEqual(r.get_json(), [{"id": r.get_json()[0]["id"], "name": "B"}])
+        self.assertEqual(
+            self.client.get("/api/v1/places/search?min_price=x").status_code, 400
+        )
+        self.assertEqual(
+            self.client.get("/api/v1/places/search?sort=x").status_code, 400
+        )
+
+    def test_places_nearby(self):
+        u = self.post_json(
+            "/api/v1/users", {"email": "n@b.com", "password": "pw"}
+        ).get_json()
+        for name, lat, lon in (("near", 0.01, 0.01), ("far", 5.0, 5.0)):
+            self.post_json(
+                "/api/v1/places",
+                {"name": name, "user_id": u["id"], "latitude": lat, "longitude": lon},
+            )
+        r = self.client.get("/api/v1/places/nearby?lat=0&lon=0&radius_km=50")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([p["name"] for p in r.get_json()], ["near"])
+        self.assertIn("distance_km", r.get_json()[0])
+        self.assertEqual(
+            self.client.get("/api/v1/places/nearby?lat=0").status_code, 400
+        )
+        self.assertEqual(
+            self.client.get("/api/v1/places/nearby?lat=0&lon=x").status_code, 400
+        )
+
+    def test_etags_and_conditional_get(self):
+        u = self.post_json(
+            "/api/v1/users", {"email": "e@b.com", "password": "pw"}
+        ).get_json()
+        place = self.post_json(
+            "/api/v1/places", {"name": "Loft", "user_id": u["id"]}
+        ).get_json()
+        for url in (
+            f"/api/v1/places/{place['id']}",
+            "/api/v1/places",
+            "/api/v1/amenities",
+            f"/api/v1/users/{u['id']}",
+        ):
+            r = self.client.get(url)
+            etag = r.headers["ETag"]
+            self.assertEqual(r.headers["Cache-Control"], "no-cache")
+            r = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(r.status_code, 304, url)
+            self.assertEqual(r.headers["ETag"], etag)
+            self.assertEqual(r.get_data(), b"")
+
+        # related writes change the place tags
+        url = f"/api/v1/places/{place['id']}"
+        etag = self.client.get(url).headers["ETag"]
+        self.post_json(
+            "/api/v1/reviews",
+            {"place_id": place["id"], "user_id": u["id"], "text": "Nice"},
+        )
+        r = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.get_json()["reviews"]), 1)
+        etag = r.headers["ETag"]
+        self.put_json(f"/api/v1/users/{u['id']}", {"email": "new@b.com"})
+        r = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(r.get_json()["owner"]["email"], "new@b.com")
+
+    def test_response_cache_serves_body_without_rebuilding(self):
+        self.post_json("/api/v1/amenities", {"name": "Wifi"})
+        cache = self.app.extensions["hbnb_response_cache"]
+        first = self.client.get("/api/v1/amenities")
+        self.assertEqual(len(cache), 1)
+        with mock.patch("hbnb.presentation.app.jsonify") as jsonify:
+            again = self.client.get("/api/v1/amenities")
+        jsonify.assert_not_called()
+        self.assertEqual(again.get_data(), first.get_data())
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+        # writes evict the entries built from that class
+        self.post_json("/api/v1/amenities", {"name": "Pool"})
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(len(self.client.get("/api/v1/amenities").get_json()), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from hbnb import create_asgi_app
+
+
+def call(app, method, path, body=None, query=b"", declare_length=True):
+    """Send one request through the ASGI app; return (status, headers, body)."""
+    raw = b"" if body is None else json.dumps(body).encode()
+    headers = [(b"content-type", b"application/json")]
+    if declare_length:
+        headers.append((b"content-length", str(len(raw)).encode()))
+    # deliver the body in two parts, as a slow client would
+    incoming = [
+        {"type": "http.request", "body": raw[:5], "more_body": True},
+        {"type": "http.request", "body": raw[5:], "more_body": False},
+    ]
+    sent = []
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "http_version": "1.1",
+        "query_string": query,
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    start, *parts = sent
+    return (
+        start["status"],
+        {name.lower(): value for name, value in start["headers"]},
+        b"".join(p["body"] for p in parts),
+        parts,
+    )
+
+
+class AsgiAppTest(unittest.TestCase):
+    def setUp(self):
+        self.app = create_asgi_app({"TESTING": True, "STREAM_BATCH_SIZE": 1})
+
+    def test_serves_the_same_routes(self):
+        status, _, body, _ = call(
+            self.app,
+            "POST",
+            "/api/v1/users",
+            {"email": "a@example.com", "password": "pw"},
+        )
+        self.assertEqual(status, 201)
+        user = json.loads(body)
+        status, headers, body, _ = call(self.app, "GET", f"/api/v1/users/{user['id']}")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["email"], "a@example.com")
+        self.assertIn(b"etag", headers)
+        status, _, _, _ = call(self.app, "GET", "/api/v1/users/missing")
+        self.assertEqual(status, 404)
+
+    def test_streamed_body_is_sent_in_chunks(self):
+        for name in "abc":
+            call(self.app, "POST", "/api/v1/amenities", {"name": name})
+        status, _, body, parts = call(
+            self.app, "GET", "/api/v1/amenities", query=b"stream=ndjson"
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body.splitlines()), 3)
+        self.assertGreater(len(parts), 2)
+
+    def test_views_run_off_the_event_loop(self):
+        threads = []
+        flask_app = self.app.app.app
+        flask_app.before_request(lambda: threads.append(threading.current_thread()))
+        call(self.app, "GET", "/health")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_oversized_bodies_are_refused(self):
+        app = create_asgi_app({"TESTING": True, "MAX_CONTENT_LENGTH": 20})
+        views = []
+        app.app.app.before_request(lambda: views.append(1))
+        payload = {"name": "x" * 40}
+        # a body arriving in parts without a declared length
+        status, headers, body, _ = call(
+            app, "POST", "/api/v1/amenities", payload, declare_length=False
+        )
+        self.assertEqual(status, 413)
+        self.assertIn("error", json.loads(body))
+        # a declared length over the limit is refused before reading
+        status, _, _, _ = call(app, "POST", "/api/v1/amenities", payload)
+        self.assertEqual(status, 413)
+        self.assertEqual(views, [])
+        status, _, _, _ = call(app, "POST", "/api/v1/amenities", {"name": "ok"})
+        self.assertEqual(status, 201)
+
+
+if __name__ == "__main__":
+    unittest.main()
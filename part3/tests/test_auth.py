@@ -1,7 +1,12 @@
 import unittest
 import json
+from datetime import timedelta
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
 
 from hbnb import create_app
+from hbnb.presentation.auth_cache import TokenCache
 
 
 class AuthIntegrationTestCase(unittest.TestCase):
@@ -65,6 +70,104 @@ class AuthIntegrationTestCase(unittest.TestCase):
         r = self.post_json("/api/v1/places", payload, headers=headers)
         self.assertEqual(r.status_code, 403)
 
+    def _signup_and_login(self, email):
+        uid = self.post_json("/api/v1/users", {"email": email, "password": "pw"})
+        r = self.post_json("/api/v1/auth/login", {"email": email, "password": "pw"})
+        token = r.get_json()["access_token"]
+        return uid.get_json()["id"], {"Authorization": f"Bearer {token}"}
+
+    def test_tokens_are_verified_once(self):
+        owner_id, owner = self._signup_and_login("o@example.com")
+        _, other = self._signup_and_login("x@example.com")
+        place = self.post_json(
+            "/api/v1/places", {"name": "Loft", "user_id": owner_id}, headers=owner
+        ).get_json()
+        url = f"/api/v1/places/{place['id']}"
+        r = self.client.put(url, json={"name": "Mine"}, headers=other)
+        self.assertEqual(r.status_code, 403)
+        with mock.patch(
+            "flask_jwt_extended.view_decorators.decode_token",
+            side_effect=AssertionError("token decoded twice"),
+        ):
+            r = self.client.put(url, json={"name": "Mine"}, headers=other)
+            self.assertEqual(r.status_code, 403)
+        r = self.client.put(url, json={"name": "Flat"}, headers=owner)
+        self.assertEqual(r.status_code, 200)
+        r = self.client.delete(url, headers=owner)
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(self.client.delete(url, headers=owner).status_code, 404)
+
+    def test_ownership_changes_apply_at_once(self):
+        owner_id, owner = self._signup_and_login("o@example.com")
+        buyer_id, buyer = self._signup_and_login("x@example.com")
+        place = self.post_json(
+            "/api/v1/places", {"name": "Loft", "user_id": owner_id}, headers=owner
+        ).get_json()
+        url = f"/api/v1/places/{place['id']}"
+        self.assertEqual(
+            self.client.put(url, json={"name": "Mine"}, headers=buyer).status_code,
+            403,
+        )
+        # as if another worker moved the place to the buyer
+        facade = self.app.extensions["hbnb_facade"]
+        facade._repo.update("Place", place["id"], {"user_id": buyer_id})
+        r = self.client.put(url, json={"name": "Mine"}, headers=buyer)
+        self.assertEqual(r.status_code, 200)
+        r = self.client.put(url, json={"name": "Loft"}, headers=owner)
+        self.assertEqual(r.status_code, 403)
+
+    def test_header_type_comes_from_the_jwt_config(self):
+        owner_id, owner = self._signup_and_login("o@example.com")
+        place = self.post_json(
+            "/api/v1/places", {"name": "Loft", "user_id": owner_id}, headers=owner
+        ).get_json()
+        url = f"/api/v1/places/{place['id']}"
+        self.app.config["JWT_HEADER_TYPE"] = "JWT"
+        r = self.post_json(
+            "/api/v1/auth/login", {"email": "o@example.com", "password": "pw"}
+        )
+        token = r.get_json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        r = self.client.put(url, json={"name": "x"}, headers=headers)
+        self.assertEqual(r.status_code, 401)
+        headers = {"Authorization": f"JWT {token}"}
+        r = self.client.put(url, json={"name": "Flat"}, headers=headers)
+        self.assertEqual(r.status_code, 200)
+
+    def test_invalid_and_expired_tokens_are_rejected(self):
+        owner_id, owner = self._signup_and_login("o@example.com")
+        place = self.post_json(
+            "/api/v1/places", {"name": "Loft", "user_id": owner_id}, headers=owner
+        ).get_json()
+        url = f"/api/v1/places/{place['id']}"
+        with self.app.app_context():
+            expired = create_access_token(
+                identity=owner_id, expires_delta=timedelta(seconds=-1)
+            )
+        for headers in (
+            {},
+            {"Authorization": "Bearer not-a-token"},
+            {"Authorization": f"Bearer {expired}"},
+        ):
+            r = self.client.put(url, json={"name": "x"}, headers=headers)
+            self.assertEqual(r.status_code, 401)
+
+
+class AuthCachesTestCase(unittest.TestCase):
+    def test_token_cache_expires_with_token(self):
+        now = [1000.0]
+        cache = TokenCache(clock=lambda: now[0])
+        decode = mock.Mock(return_value={"sub": "u1", "exp": 1010})
+        self.assertEqual(cache.claims("t", decode)["sub"], "u1")
+        cache.claims("t", decode)
+        self.assertEqual(decode.call_count, 1)
+        now[0] = 1010.0
+        cache.claims("t", decode)
+        self.assertEqual(decode.call_count, 2)
+        decode.side_effect = ValueError("bad")
+        with self.assertRaises(ValueError):
+            cache.claims("other", decode)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,273 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import event
+
+from backends import for_each_backend, make_repository
+from hbnb import create_app
+from hbnb.business.facade import HBNBFacade, NotFoundError, ValidationError
+from hbnb.persistence import InMemoryRepository
+from hbnb.persistence.engine import dispose_engines
+
+
+class BulkTests:
+    def setUp(self):
+        self.repo = make_repository(self.backend, self)
+
+    def test_create_update_delete_many(self):
+        created = self.repo.create_many("Amenity", [{"name": "a"}, {"name": "b"}])
+        self.assertEqual([o["name"] for o in created], ["a", "b"])
+        ids = [o["id"] for o in created]
+        updated = self.repo.update_many(
+            "Amenity", {ids[1]: {"name": "B"}, "missing": {"name": "x"}}
+        )
+        self.assertEqual([(o["id"], o["name"]) for o in updated], [(ids[1], "B")])
+        self.assertEqual(self.repo.delete_many("Amenity", [ids[0], "missing"]), 1)
+        self.assertEqual([o["name"] for o in self.repo.list("Amenity")], ["B"])
+
+
+class InMemoryBulkAtomicityTest(unittest.TestCase):
+    def test_rejected_item_undoes_the_batch(self):
+        repo = InMemoryRepository()
+        repo.create("User", {"email": "taken@example.com"})
+        with self.assertRaises(ValueError):
+            repo.create_many(
+                "User", [{"email": "new@example.com"}, {"email": "taken@example.com"}]
+            )
+        self.assertEqual(repo.count("User"), 1)
+        self.assertEqual(repo.find_by("User", email="new@example.com"), [])
+
+
+for_each_backend(BulkTests, globals())
+
+
+class BatchRollbackTests:
+    """A failing batch leaves nothing behind, whatever the backend."""
+
+    def setUp(self):
+        config = {"BCRYPT_ROUNDS": 4, "PASSWORD_HASH_WORKERS": 0}
+        if self.backend == "memory":
+            config["USE_IN_MEMORY"] = True
+        else:
+            tmpdir = tempfile.TemporaryDirectory()
+            self.addCleanup(tmpdir.cleanup)
+            self.addCleanup(dispose_engines)
+            config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(
+                tmpdir.name, "batch.db"
+            )
+            config["STORAGE_MODE"] = self.backend
+        self.app = create_app(config)
+        self.client = self.app.test_client()
+        self.users = [
+            self.client.post(
+                "/api/v1/users", json={"email": email, "password": "pw"}
+            ).get_json()
+            for email in ("a@example.com", "b@example.com")
+        ]
+
+    def emails(self):
+        users = self.client.get("/api/v1/users").get_json()
+        return sorted(u["email"] for u in users)
+
+    def test_update_to_a_taken_email_fails_the_whole_batch(self):
+        r = self.client.post(
+            "/api/v1/users/batch",
+            json={
+                "create": [{"email": "new@example.com", "password": "pw"}],
+                "update": [{"id": self.users[1]["id"], "email": "a@example.com"}],
+            },
+        )
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(
+            r.get_json(), {"error": "email already exists", "op": "update", "index": 0}
+        )
+        self.assertEqual(self.emails(), ["a@example.com", "b@example.com"])
+
+    def test_users_may_keep_their_own_email(self):
+        r = self.client.post(
+            "/api/v1/users/batch",
+            json={
+                "update": [
+                    {"id": self.users[0]["id"], "email": "a@example.com"},
+                    {"id": self.users[1]["id"], "email": "c@example.com"},
+                ]
+            },
+        )
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self.emails(), ["a@example.com", "c@example.com"])
+
+    def test_duplicate_emails_within_the_batch_are_refused(self):
+        r = self.client.post(
+            "/api/v1/users/batch",
+            json={
+                "update": [
+                    {"id": self.users[0]["id"], "email": "c@example.com"},
+                    {"id": self.users[1]["id"], "email": "c@example.com"},
+                ]
+            },
+        )
+        self.assertEqual(r.get_json()["index"], 1)
+        self.assertEqual(self.emails(), ["a@example.com", "b@example.com"])
+
+    def test_rolled_back_unit_undoes_every_bulk_write(self):
+        facade = self.app.extensions["hbnb_facade"]
+        kept, gone = facade.create_many("Amenity", [{"name": "a"}, {"name": "b"}])
+        with self.assertRaises(RuntimeError):
+            with facade.unit_of_work():
+                facade.create_many("Amenity", [{"name": "c"}])
+                facade.update_many("Amenity", {kept["id"]: {"name": "A"}})
+                facade.delete_many("Amenity", [gone["id"]])
+                raise RuntimeError("later step failed")
+        names = sorted(o["name"] for o in facade.list("Amenity"))
+        self.assertEqual(names, ["a", "b"])
+
+
+for_each_backend(BatchRollbackTests, globals())
+
+
+class UniqueEmailTests:
+    def setUp(self):
+        self.repo = make_repository(self.backend, self)
+        self.facade = HBNBFacade(self.repo)
+
+    def test_taken_email_is_a_validation_error(self):
+        self.repo.create("User", {"email": "a@example.com", "password": "x"})
+        user = self.repo.create("User", {"email": "b@example.com", "password": "x"})
+        with self.assertRaises(ValidationError):
+            self.facade.update_many("User", {user["id"]: {"email": "a@example.com"}})
+        self.assertEqual(self.repo.get("User", user["id"])["email"], "b@example.com")
+
+
+# the objects table has no unique constraint; the API checks emails first
+for_each_backend(UniqueEmailTests, globals(), backends=("memory", "tables"))
+
+
+class ObjectStoreBulkTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = make_repository("objects", self)
+
+    def test_inserts_are_batched(self):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                statements.append(statement)
+
+        event.listen(self.repo._engine, "before_cursor_execute", record)
+        try:
+            self.repo.create_many("Amenity", [{"name": str(i)} for i in range(50)])
+        finally:
+            event.remove(self.repo._engine, "before_cursor_execute", record)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.repo.count("Amenity"), 50)
+
+
+class FacadeBulkTest(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBNBFacade(InMemoryRepository())
+
+    def test_bulk_reviews_keep_aggregates_current(self):
+        place = self.facade.create("Place", {"name": "Loft"})
+        reviews = self.facade.create_many(
+            "Review", [{"place_id": place["id"], "text": t} for t in "abc"]
+        )
+        stats = self.facade.review_stats([place["id"]])[place["id"]]
+        self.assertEqual(stats["review_count"], 3)
+        self.facade.delete_many("Review", [r["id"] for r in reviews[:2]])
+        stats = self.facade.review_stats([place["id"]])[place["id"]]
+        self.assertEqual(stats["review_count"], 1)
+
+    def test_missing_ids_fail_before_writing(self):
+        obj = self.facade.create("Amenity", {"name": "Wifi"})
+        with self.assertRaises(NotFoundError):
+            self.facade.update_many(
+                "Amenity", {obj["id"]: {"name": "Fibre"}, "nope": {"name": "x"}}
+            )
+        with self.assertRaises(NotFoundError):
+            self.facade.delete_many("Amenity", [obj["id"], "nope"])
+        self.assertEqual(self.facade.get("Amenity", obj["id"])["name"], "Wifi")
+        with self.assertRaises(ValidationError):
+            self.facade.create_many("Amenity", [{"name": "ok"}, "not a dict"])
+        self.assertEqual(self.facade.count("Amenity"), 1)
+
+
+class BatchApiTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        uri = "sqlite:///" + os.path.join(self.tmpdir.name, "batch.db")
+        self.app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "TESTING": True})
+        self.client = self.app.test_client()
+        self.user = self.client.post(
+            "/api/v1/users", json={"email": "b@example.com", "password": "pw"}
+        ).get_json()
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def batch(self, resource, body):
+        return self.client.post(f"/api/v1/{resource}/batch", json=body)
+
+    def test_create_update_delete_places(self):
+        r = self.batch(
+            "places",
+            {
+                "create": [
+                    {"name": f"P{i}", "user_id": self.user["id"]} for i in range(3)
+                ]
+            },
+        )
+        self.assertEqual(r.status_code, 200)
+        created = r.get_json()["created"]
+        self.assertEqual([p["owner"]["id"] for p in created], [self.user["id"]] * 3)
+        ids = [p["id"] for p in created]
+        r = self.batch(
+            "places",
+            {"update": [{"id": ids[0], "name": "Renamed"}], "delete": ids[1:]},
+        )
+        self.assertEqual(r.status_code, 200)
+        body = r.get_json()
+        self.assertEqual(body["updated"][0]["name"], "Renamed")
+        self.assertEqual(body["deleted"], ids[1:])
+        names = [p["name"] for p in self.client.get("/api/v1/places").get_json()]
+        self.assertEqual(names, ["Renamed"])
+
+    def test_first_bad_item_is_reported_and_nothing_is_written(self):
+        r = self.batch(
+            "places",
+            {
+                "create": [
+                    {"name": "ok", "user_id": self.user["id"]},
+                    {"name": "bad", "user_id": "nobody"},
+                ]
+            },
+        )
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(
+            r.get_json(), {"error": "user_id not found", "op": "create", "index": 1}
+        )
+        r = self.batch(
+            "users",
+            {
+                "create": [
+                    {"email": "n@example.com", "password": "pw"},
+                    {"email": "b@example.com", "password": "pw"},
+                ]
+            },
+        )
+        self.assertEqual(r.get_json()["index"], 1)
+        self.assertEqual(self.client.get("/api/v1/places").get_json(), [])
+        self.assertEqual(len(self.client.get("/api/v1/users").get_json()), 1)
+
+    def test_unsupported_operations_and_limits(self):
+        r = self.batch("users", {"delete": [self.user["id"]]})
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(self.batch("widgets", {}).status_code, 404)
+        self.app.config["BATCH_MAX_ITEMS"] = 1
+        r = self.batch("amenities", {"create": [{"name": "a"}, {"name": "b"}]})
+        self.assertEqual(r.status_code, 413)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import unittest
+from unittest import mock
+
+from hbnb import create_app
+from hbnb.persistence import CachingRepository, InMemoryRepository
+from hbnb.persistence.unit_of_work import unit_of_work
+
+
+class CachingRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.backend = InMemoryRepository()
+        self.repo = CachingRepository(
+            self.backend, max_entries=3, ttl=10, clock=lambda: self.now[0]
+        )
+
+    def test_get_is_cached_and_invalidated_by_writes(self):
+        obj = self.repo.create("Amenity", {"name": "Wifi"})
+        with mock.patch.object(self.backend, "get", wraps=self.backend.get) as get:
+            first = self.repo.get("Amenity", obj["id"])
+            self.assertEqual(first["name"], "Wifi")
+            self.assertIs(self.repo.get("Amenity", obj["id"]), first)
+            self.assertEqual(get.call_count, 1)
+            self.repo.update("Amenity", obj["id"], {"name": "Fibre"})
+            self.assertEqual(self.repo.get("Amenity", obj["id"])["name"], "Fibre")
+            self.assertEqual(get.call_count, 2)
+            self.now[0] = 10.0
+            self.repo.get("Amenity", obj["id"])
+            self.assertEqual(get.call_count, 3)
+        self.repo.delete("Amenity", obj["id"])
+        self.assertIsNone(self.repo.get("Amenity", obj["id"]))
+        self.assertEqual(self.repo.stats()["hits"], 1)
+
+    def test_list_is_cached_per_class(self):
+        self.repo.create("Amenity", {"name": "Wifi"})
+        with mock.patch.object(self.backend, "list", wraps=self.backend.list) as lst:
+            self.assertEqual(len(self.repo.list("Amenity")), 1)
+            self.assertEqual(len(self.repo.list("Amenity")), 1)
+            self.repo.list("Place")
+            self.repo.create("Place", {"name": "Loft"})
+            self.assertEqual(len(self.repo.list("Amenity")), 1)
+            self.assertEqual(lst.call_count, 2)
+            self.repo.create("Amenity", {"name": "Pool"})
+            self.assertEqual(len(self.repo.list("Amenity")), 2)
+            self.assertEqual(lst.call_count, 3)
+
+    def test_get_many_fetches_only_missing_and_evicts_lru(self):
+        ids = [self.repo.create("Amenity", {"name": n})["id"] for n in "abcd"]
+        self.repo.get("Amenity", ids[0])
+        with mock.patch.object(
+            self.backend, "get_many", wraps=self.backend.get_many
+        ) as get_many:
+            found = self.repo.get_many("Amenity", [ids[1], ids[0], "nope"])
+            self.assertEqual([o["id"] for o in found], [ids[1], ids[0]])
+            get_many.assert_called_once_with("Amenity", [ids[1], "nope"])
+        self.repo.get("Amenity", ids[2])
+        self.repo.get("Amenity", ids[3])
+        self.assertEqual(self.repo.stats()["entries"], 3)
+        self.assertEqual(self.repo.stats()["evictions"], 1)
+
+    def test_reads_after_a_write_are_not_cached_until_commit(self):
+        obj = self.repo.create("Amenity", {"name": "Wifi"})
+        with self.assertRaises(RuntimeError):
+            with unit_of_work():
+                self.repo.update("Amenity", obj["id"], {"name": "Fibre"})
+                self.repo.get("Amenity", obj["id"])
+                self.repo.list("Amenity")
+                self.assertEqual(self.repo.stats()["entries"], 0)
+                raise RuntimeError("abort")
+        self.assertEqual(self.repo.stats()["entries"], 0)
+        with unit_of_work():
+            self.repo.get("Amenity", obj["id"])
+            self.assertEqual(self.repo.stats()["entries"], 1)
+
+    def test_commit_invalidates_entries_cached_meanwhile(self):
+        obj = self.repo.create("Amenity", {"name": "Wifi"})
+        with unit_of_work():
+            self.repo.update("Amenity", obj["id"], {"name": "Fibre"})
+            # another request caches the object before this unit commits
+            reader = threading.Thread(target=self.repo.get, args=("Amenity", obj["id"]))
+            reader.start()
+            reader.join()
+            self.assertEqual(self.repo.stats()["entries"], 1)
+        self.assertEqual(self.repo.stats()["entries"], 0)
+
+
+class CachingRepositoryAppTest(unittest.TestCase):
+    def test_config_switch(self):
+        app = create_app({"TESTING": True, "REPOSITORY_CACHE": "true"})
+        client = app.test_client()
+        amenity = client.post("/api/v1/amenities", json={"name": "Wifi"}).get_json()
+        for _ in range(2):
+            client.get(f"/api/v1/amenities/{amenity['id']}")
+        stats = client.get("/health/cache").get_json()
+        self.assertTrue(stats["enabled"])
+        self.assertGreaterEqual(stats["hits"], 1)
+        plain = create_app({"TESTING": True}).test_client()
+        self.assertEqual(plain.get("/health/cache").get_json(), {"enabled": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
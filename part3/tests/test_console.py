@@ -0,0 +1,41 @@
+import contextlib
+import io
+import unittest
+
+from hbnb.console import HBNBCommand
+
+
+class ConsoleCountTest(unittest.TestCase):
+    def setUp(self):
+        self.console = HBNBCommand()
+        facade = self.console._facade
+        owner = facade.create("User", {"email": "o@example.com", "password": "pw"})
+        for name, guests in (("a", 4), ("b", 4), ("c", 2)):
+            facade.create(
+                "Place",
+                {
+                    "name": name,
+                    "price_by_night": 50,
+                    "user_id": owner["id"],
+                    "max_guest": guests,
+                },
+            )
+
+    def run_command(self, line):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.console.onecmd(line)
+        return out.getvalue().strip()
+
+    def test_numeric_filter_matches_numbers(self):
+        self.assertEqual(self.run_command("count Place max_guest=4"), "2")
+        self.assertEqual(self.run_command("count Place max_guest=3"), "0")
+
+    def test_string_filters_are_kept_as_strings(self):
+        self.assertEqual(self.run_command("count Place name=c"), "1")
+        self.assertEqual(self.run_command('count Place name="a"'), "1")
+        self.assertEqual(self.run_command("count User email=o@example.com"), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from hbnb import create_app
+from hbnb.persistence import (
+    PlaceRepository,
+    SQLAlchemyRepository,
+    UserRepository,
+)
+from hbnb.persistence.engine import PoolSettings, dispose_engines, get_engine
+
+
+class EngineRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = "sqlite:///" + os.path.join(self.tmpdir.name, "hbnb.db")
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def test_repositories_share_one_engine(self):
+        users = UserRepository(self.uri)
+        places = PlaceRepository(self.uri)
+        generic = SQLAlchemyRepository(self.uri)
+        self.assertIs(users._engine, places._engine)
+        self.assertIs(users._engine, generic._engine)
+
+    def test_memory_databases_stay_private(self):
+        a = get_engine("sqlite:///:memory:")
+        b = get_engine("sqlite:///:memory:")
+        self.assertIsNot(a, b)
+
+    def test_pool_settings_and_stats(self):
+        settings = PoolSettings.from_config(
+            {
+                "SQLALCHEMY_POOL_SIZE": "3",
+                "SQLALCHEMY_MAX_OVERFLOW": 2,
+                "SQLALCHEMY_POOL_PRE_PING": "true",
+            }
+        )
+        self.assertEqual(
+            settings.engine_kwargs(),
+            {"pool_size": 3, "max_overflow": 2, "pool_pre_ping": True},
+        )
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": self.uri,
+                "STORAGE_MODE": "tables",
+                "SQLALCHEMY_POOL_SIZE": 3,
+            }
+        )
+        repo = app.extensions["hbnb_facade"]._repo
+        self.assertIs(repo.user_repo._engine, repo.generic_repo._engine)
+        self.assertIs(repo.place_repo._engine, repo.generic_repo._engine)
+
+        engines = app.test_client().get("/health/pool").get_json()["engines"]
+        self.assertEqual(len(engines), 1)
+        self.assertEqual(engines[0]["size"], 3)
+        self.assertEqual(engines[0]["checkedout"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from hbnb.persistence import DuplicateKeyError, IndexSpec, InMemoryRepository
+
+
+class InMemoryIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = InMemoryRepository()
+
+    def test_unique_hash_index(self):
+        u = self.repo.create("User", {"email": "a@example.com"})
+        with self.assertRaises(DuplicateKeyError):
+            self.repo.create("User", {"email": "a@example.com"})
+        other = self.repo.create("User", {"email": "b@example.com"})
+        with self.assertRaises(DuplicateKeyError):
+            self.repo.update("User", other["id"], {"email": "a@example.com"})
+        # a failed update leaves the stored object and index untouched
+        self.assertEqual(self.repo.get("User", other["id"])["email"], "b@example.com")
+        self.assertEqual(
+            self.repo.find_by("User", email="a@example.com")[0]["id"], u["id"]
+        )
+
+        self.repo.update("User", u["id"], {"email": "c@example.com"})
+        self.assertEqual(self.repo.find_by("User", email="a@example.com"), [])
+        self.repo.delete("User", u["id"])
+        self.assertEqual(self.repo.find_by("User", email="c@example.com"), [])
+        self.repo.create("User", {"email": "c@example.com"})
+
+    def test_non_unique_lookups(self):
+        r1 = self.repo.create("Review", {"place_id": "p1", "user_id": "u1"})
+        r2 = self.repo.create("Review", {"place_id": "p1", "user_id": "u2"})
+        self.repo.create("Review", {"place_id": "p2", "user_id": "u1"})
+        found = self.repo.find_by("Review", place_id="p1")
+        self.assertEqual([r["id"] for r in found], [r1["id"], r2["id"]])
+        found = self.repo.find_by("Review", place_id="p1", user_id="u2")
+        self.assertEqual([r["id"] for r in found], [r2["id"]])
+        self.assertEqual(len(self.repo.find_in("Review", "place_id", ["p1", "p2"])), 3)
+        # criteria on an unindexed field fall back to a scan
+        self.assertEqual(len(self.repo.find_by("Review", text=None)), 3)
+
+    def test_count_with_criteria(self):
+        self.repo.create("Review", {"place_id": "p1", "rating": 5})
+        self.repo.create("Review", {"place_id": "p1", "rating": 3})
+        self.repo.create("Review", {"place_id": "p2", "rating": 5})
+        self.repo.create("Place", {"price_by_night": 10})
+        self.assertEqual(self.repo.count("Review"), 3)
+        self.assertEqual(self.repo.count("Review", place_id="p1"), 2)
+        self.assertEqual(self.repo.count("Review", place_id="p1", rating=5), 1)
+        self.assertEqual(self.repo.count("Review", rating=5), 2)
+        self.assertEqual(self.repo.count("Place", price_by_night=10), 1)
+        self.assertEqual(self.repo.count("Place", price_by_night=11), 0)
+
+    def test_sorted_index_range(self):
+        for price in (50, 10, 30, 20):
+            self.repo.create("Place", {"price_by_night": price})
+        prices = [
+            p["price_by_night"]
+            for p in self.repo.find_range("Place", "price_by_night", 15, 30)
+        ]
+        self.assertEqual(prices, [20, 30])
+        prices = [
+            p["price_by_night"]
+            for p in self.repo.find_range("Place", "price_by_night", reverse=True)
+        ]
+        self.assertEqual(prices, [50, 30, 20, 10])
+        self.assertEqual(len(self.repo.find_by("Place", price_by_night=10)), 1)
+
+    def test_declared_index_on_existing_data(self):
+        repo = InMemoryRepository(indexes=[])
+        repo.create("Amenity", {"name": "Wifi"})
+        repo.create("Amenity", {"name": "Wifi"})
+        with self.assertRaises(DuplicateKeyError):
+            repo.create_index(IndexSpec("Amenity", "name", unique=True))
+        repo.create_index(IndexSpec("Amenity", "name"))
+        self.assertEqual(len(repo.find_by("Amenity", name="Wifi")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
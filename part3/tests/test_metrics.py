@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from hbnb import create_app, metrics
+from hbnb.persistence.engine import dispose_engines
+
+
+class HistogramTest(unittest.TestCase):
+    def test_renders_cumulative_buckets(self):
+        hist = metrics.Histogram("t_seconds", "Test.", ("op",), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 3):
+            hist.observe(value, "read")
+        self.assertEqual(
+            hist.render(),
+            [
+                "# HELP t_seconds Test.",
+                "# TYPE t_seconds histogram",
+                't_seconds_bucket{op="read",le="0.1"} 1',
+                't_seconds_bucket{op="read",le="1"} 3',
+                't_seconds_bucket{op="read",le="+Inf"} 4',
+                't_seconds_sum{op="read"} 4.05',
+                't_seconds_count{op="read"} 4',
+            ],
+        )
+
+    def test_label_count_is_checked(self):
+        counter = metrics.Counter("t_total", "Test.", ("a",))
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_metrics_must_render_and_clear(self):
+        class Partial(metrics._Metric):
+            def render(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            Partial("t", "Test.")
+
+
+class MetricsEndpointTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        uri = "sqlite:///" + os.path.join(self.tmpdir.name, "metrics.db")
+        # not TESTING: that selects the in-memory repository
+        self.app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": uri,
+                "BCRYPT_ROUNDS": 4,
+                "PASSWORD_HASH_WORKERS": 0,
+            }
+        )
+        self.client = self.app.test_client()
+        metrics.REGISTRY.clear()
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def test_requests_repository_calls_and_queries_are_recorded(self):
+        user = self.client.post(
+            "/api/v1/users", json={"email": "m@example.com", "password": "pw"}
+        ).get_json()
+        self.client.post("/api/v1/places", json={"name": "P", "user_id": user["id"]})
+        self.client.get("/api/v1/places")
+
+        route = ("GET", "/api/v1/places")
+        self.assertEqual(metrics.REQUEST_SECONDS.count(*route, "200"), 1)
+        self.assertEqual(metrics.REQUEST_QUERIES.count(*route), 1)
+        self.assertGreater(metrics.REQUEST_QUERIES.total(*route), 0)
+        self.assertGreater(metrics.REPOSITORY_SECONDS.count("Place", "list"), 0)
+        self.assertEqual(metrics.PASSWORD_SECONDS.count("hash"), 1)
+        self.assertGreater(metrics.SQL_QUERIES.value(), 0)
+
+        r = self.client.get("/metrics")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.content_type.startswith("text/plain; version=0.0.4"))
+        text = r.get_data(as_text=True)
+        self.assertIn(
+            'hbnb_http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/places",status="200"} 1',
+            text,
+        )
+        self.assertIn('cls_name="Place",method="list"', text)
+
+    def test_unknown_paths_share_one_label(self):
+        self.client.get("/nowhere/1")
+        self.client.get("/nowhere/2")
+        self.assertEqual(metrics.REQUEST_SECONDS.count("GET", "<unmatched>", "404"), 2)
+
+    def test_can_be_disabled(self):
+        app = create_app({"TESTING": True, "METRICS_ENABLED": "false"})
+        self.assertEqual(app.test_client().get("/metrics").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
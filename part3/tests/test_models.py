@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from hbnb.business import passwords
+from hbnb.business.facade import HBNBFacade
+from hbnb.business.models import Amenity, Place, User
+from hbnb.persistence import InMemoryRepository
+
+
+class BusinessModelTest(unittest.TestCase):
+    def test_models_are_slotted(self):
+        place = Place.from_dict({"name": "Loft"})
+        self.assertFalse(hasattr(place, "__dict__"))
+        with self.assertRaises(AttributeError):
+            place.unknown = 1
+        self.assertEqual(
+            Amenity.field_names(), ("id", "created_at", "updated_at", "name")
+        )
+
+    def test_from_dict_ignores_unknown_fields(self):
+        place = Place.from_dict({"name": "Loft", "owner": {"id": "u1"}, "id": "p1"})
+        self.assertEqual((place.id, place.name), ("p1", "Loft"))
+
+    def test_to_dict_copies_lists(self):
+        ids = ["a1"]
+        place = Place.from_dict({"amenity_ids": ids})
+        out = place.to_dict()
+        self.assertEqual(set(out), set(Place.field_names()))
+        out["amenity_ids"].append("a2")
+        self.assertEqual(place.amenity_ids, ["a1"])
+
+    def test_user_password_only_in_storage_dict(self):
+        user = User.from_dict({"email": "a@example.com", "password": "secret"})
+        self.assertNotIn("password", user.to_dict())
+        stored = user.to_storage_dict()
+        self.assertTrue(stored["password"].startswith("$2"))
+        user.update_from_dict({"first_name": "Ada"})
+        self.assertEqual(user.to_storage_dict()["first_name"], "Ada")
+
+    def test_password_hashed_once_per_real_change(self):
+        hasher = passwords.PasswordHasher(rounds=4)
+        facade = HBNBFacade(InMemoryRepository(), hasher)
+        with mock.patch(
+            "hbnb.business.models.user.hash_password",
+            wraps=passwords.hash_password,
+        ) as hashed:
+            user = facade.create("User", {"email": "a@example.com", "password": "pw"})
+            self.assertEqual(hashed.call_count, 1)
+            updated = facade.update("User", user["id"], {"first_name": "Ada"})
+            self.assertEqual(hashed.call_count, 1)
+            self.assertEqual(updated["password"], user["password"])
+            self.assertTrue(hasher.verify("pw", updated["password"]))
+
+            updated = facade.update("User", user["id"], {"password": "new"})
+            self.assertEqual(hashed.call_count, 2)
+            self.assertTrue(hasher.verify("new", updated["password"]))
+
+    def test_from_record_keeps_stored_hash(self):
+        stored = User.from_dict({"email": "a@example.com", "password": "pw"})
+        record = stored.to_storage_dict()
+        self.assertEqual(User.from_record(record).password, record["password"])
+
+
+if __name__ == "__main__":
+    unittest.main()
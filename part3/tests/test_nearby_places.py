@@ -0,0 +1,78 @@
+import unittest
+
+from backends import for_each_backend, make_repository
+from hbnb.business.facade import HBNBFacade, ValidationError
+from hbnb.persistence.geo import bounding_box, haversine_km
+
+PLACES = [
+    # name, latitude, longitude
+    ("santiago", -33.4489, -70.6693),
+    ("valparaiso", -33.0472, -71.6127),
+    ("lima", -12.0464, -77.0428),
+    ("fiji-east", -17.7134, 179.9),
+    ("fiji-west", -17.7134, -179.9),
+    ("nowhere", None, None),
+]
+
+
+class GeoTest(unittest.TestCase):
+    def test_haversine(self):
+        # Santiago - Valparaiso is roughly 100 km
+        d = haversine_km(-33.4489, -70.6693, -33.0472, -71.6127)
+        self.assertAlmostEqual(d, 98.0, delta=3)
+
+    def test_box_wraps_antimeridian(self):
+        box = bounding_box(-17.7, 179.95, 50)
+        self.assertEqual(len(box.lon_ranges), 2)
+        self.assertTrue(box.contains(-17.7, -179.9))
+        self.assertFalse(box.contains(-17.7, 0))
+        polar = bounding_box(89.9, 0, 50)
+        self.assertEqual(polar.lon_ranges, ((-180.0, 180.0),))
+
+
+class NearbyTests:
+    def setUp(self):
+        self.facade = HBNBFacade(make_repository(self.backend, self))
+        owner = self.facade.create("User", {"email": "o@x.com", "password": "pw"})
+        for name, lat, lon in PLACES:
+            self.facade.create(
+                "Place",
+                {
+                    "name": name,
+                    "user_id": owner["id"],
+                    "latitude": lat,
+                    "longitude": lon,
+                },
+            )
+
+    def names(self, lat, lon, radius_km, limit=None):
+        places = self.facade.nearby_places(lat, lon, radius_km, limit=limit)
+        return [p["name"] for p in places]
+
+    def test_radius_and_order(self):
+        self.assertEqual(self.names(-33.45, -70.67, 50), ["santiago"])
+        self.assertEqual(self.names(-33.45, -70.67, 150), ["santiago", "valparaiso"])
+        self.assertEqual(self.names(-33.0, -71.6, 150, limit=1), ["valparaiso"])
+        self.assertEqual(
+            self.names(-33.45, -70.67, 2500), ["santiago", "valparaiso", "lima"]
+        )
+        places = self.facade.nearby_places(-33.45, -70.67, 150)
+        self.assertLess(places[0]["distance_km"], 1)
+
+    def test_across_antimeridian(self):
+        self.assertEqual(
+            sorted(self.names(-17.7134, 179.99, 30)), ["fiji-east", "fiji-west"]
+        )
+
+    def test_validation(self):
+        with self.assertRaises(ValidationError):
+            self.facade.nearby_places(91, 0, 10)
+        with self.assertRaises(ValidationError):
+            self.facade.nearby_places(0, 0, 0)
+
+
+for_each_backend(NearbyTests, globals())
+
+
+if __name__ == "__main__":
+    unittest.main()
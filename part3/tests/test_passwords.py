@@ -0,0 +1,121 @@
+import json
+import unittest
+from unittest import mock
+
+from hbnb import create_app
+from hbnb.business import passwords
+from hbnb.business.passwords import PasswordHasher, PasswordHasherBusy
+
+
+class PasswordHasherTest(unittest.TestCase):
+    def test_inline_hash_uses_configured_cost(self):
+        hasher = PasswordHasher(rounds=5)
+        hashed = hasher.hash("secret")
+        self.assertTrue(hashed.startswith("$2b$05$"))
+        self.assertTrue(hasher.verify("secret", hashed))
+        self.assertFalse(hasher.verify("wrong", hashed))
+        self.assertFalse(hasher.verify("secret", "not-a-hash"))
+        with self.assertRaises(ValueError):
+            PasswordHasher(rounds=3)
+
+    def test_pool_hashes_and_rejects_when_saturated(self):
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=0)
+        try:
+            hashed = hasher.hash("secret")
+            self.assertTrue(hasher.verify("secret", hashed))
+            # hold the only slot, as a running hash would
+            hasher._slots.acquire()
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash("secret")
+            hasher._slots.release()
+            self.assertTrue(hasher.verify("secret", hashed))
+        finally:
+            hasher.shutdown()
+
+
+class PasswordHashingApiTest(unittest.TestCase):
+    def make_app(self, **config):
+        config = {
+            "TESTING": True,
+            "ENABLE_AUTH": True,
+            "JWT_SECRET_KEY": "A" * 40,
+            **config,
+        }
+        app = create_app(config)
+        self.addCleanup(app.extensions["hbnb_password_hasher"].shutdown)
+        return app
+
+    def setUp(self):
+        self.app = self.make_app()
+        self.client = self.app.test_client()
+
+    def post_json(self, path, payload, client=None):
+        return (client or self.client).post(
+            path, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_testing_apps_hash_at_minimum_cost(self):
+        self.assertEqual(self.app.extensions["hbnb_password_hasher"].rounds, 4)
+        r = self.post_json(
+            "/api/v1/users", {"email": "a@example.com", "password": "pw"}
+        )
+        self.assertEqual(r.status_code, 201)
+        stored = self.app.extensions["hbnb_facade"].get_user_by_email("a@example.com")
+        self.assertTrue(stored["password"].startswith("$2b$04$"))
+
+    def test_each_app_keeps_its_own_hasher(self):
+        other = self.make_app(BCRYPT_ROUNDS=5)
+        r = self.post_json(
+            "/api/v1/users", {"email": "a@example.com", "password": "pw"}
+        )
+        self.assertEqual(r.status_code, 201)
+        stored = self.app.extensions["hbnb_facade"].get_user_by_email("a@example.com")
+        self.assertTrue(stored["password"].startswith("$2b$04$"))
+        self.post_json(
+            "/api/v1/users",
+            {"email": "b@example.com", "password": "pw"},
+            other.test_client(),
+        )
+        stored = other.extensions["hbnb_facade"].get_user_by_email("b@example.com")
+        self.assertTrue(stored["password"].startswith("$2b$05$"))
+
+    def test_pool_is_shared_out_between_server_workers(self):
+        with mock.patch("os.cpu_count", return_value=8):
+            self.assertEqual(passwords.default_workers(), 8)
+            self.assertEqual(passwords.default_workers(4), 2)
+            self.assertEqual(passwords.default_workers(16), 1)
+            app = create_app({"USE_IN_MEMORY": True, "SERVER_WORKERS": 4})
+        self.assertEqual(app.config["PASSWORD_HASH_WORKERS"], 2)
+        self.assertEqual(app.extensions["hbnb_password_hasher"].workers, 2)
+
+    def test_saturated_pool_returns_429(self):
+        app = self.make_app(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0)
+        client = app.test_client()
+        self.post_json(
+            "/api/v1/users", {"email": "a@example.com", "password": "pw"}, client
+        )
+        hasher = app.extensions["hbnb_password_hasher"]
+        hasher._slots.acquire()
+        try:
+            r = self.post_json(
+                "/api/v1/auth/login",
+                {"email": "a@example.com", "password": "pw"},
+                client,
+            )
+            self.assertEqual(r.status_code, 429)
+            self.assertEqual(r.headers.get("Retry-After"), "1")
+            r = self.post_json(
+                "/api/v1/users", {"email": "b@example.com", "password": "pw"}, client
+            )
+            self.assertEqual(r.status_code, 429)
+            self.assertEqual(client.get("/api/v1/users").status_code, 200)
+        finally:
+            hasher._slots.release()
+        r = self.post_json(
+            "/api/v1/auth/login", {"email": "a@example.com", "password": "pw"}, client
+        )
+        self.assertEqual(r.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from backends import for_each_backend, make_repository
+from hbnb.business.facade import HBNBFacade, ValidationError
+
+PLACES = [
+    # name, country, price, guests, amenities
+    ("a", "Chile", 50, 2, ["wifi"]),
+    ("b", "Chile", 120, 4, ["wifi", "pool"]),
+    ("c", "Peru", 80, 6, ["pool"]),
+    ("d", "Chile", 80, 8, ["wifi", "pool"]),
+    ("e", "Peru", 200, 1, []),
+]
+
+
+class PlaceSearchTests:
+    def setUp(self):
+        self.facade = HBNBFacade(make_repository(self.backend, self))
+        owner = self.facade.create("User", {"email": "o@x.com", "password": "pw"})
+        amenity = {
+            name: self.facade.create("Amenity", {"name": name})["id"]
+            for name in ("wifi", "pool")
+        }
+        self.amenity = amenity
+        self.ids = {}
+        for name, country, price, guests, amenities in PLACES:
+            self.ids[name] = self.facade.create(
+                "Place",
+                {
+                    "name": name,
+                    "user_id": owner["id"],
+                    "country": country,
+                    "price_by_night": price,
+                    "max_guest": guests,
+                    "amenity_ids": [amenity[a] for a in amenities],
+                },
+            )["id"]
+
+    def names(self, limit=10, **filters):
+        items, _ = self.facade.search_places(limit, **filters)
+        return [p["name"] for p in items]
+
+    def test_filters(self):
+        self.assertEqual(sorted(self.names(country="Chile")), ["a", "b", "d"])
+        self.assertEqual(
+            sorted(self.names(min_price=60, max_price=150)), ["b", "c", "d"]
+        )
+        self.assertEqual(sorted(self.names(max_guest=5)), ["c", "d"])
+        wifi_pool = (self.amenity["wifi"], self.amenity["pool"])
+        self.assertEqual(sorted(self.names(amenity_ids=wifi_pool)), ["b", "d"])
+        self.assertEqual(
+            self.names(country="Chile", amenity_ids=wifi_pool, max_guest=5), ["d"]
+        )
+
+    def test_sorted_pages(self):
+        price = {name: p for name, _, p, _, _ in PLACES}
+        for sort, sign in (("price", 1), ("-price", -1)):
+            # equal prices are ordered by id
+            expected = sorted(price, key=lambda n: (sign * price[n], self.ids[n]))
+            seen, after = [], None
+            while True:
+                items, after = self.facade.search_places(2, sort=sort, after=after)
+                seen.extend(p["name"] for p in items)
+                if after is None:
+                    break
+            self.assertEqual(seen, expected)
+
+    def test_invalid_queries(self):
+        with self.assertRaises(ValidationError):
+            self.facade.search_places(10, sort="name")
+        with self.assertRaises(ValidationError):
+            self.facade.search_places(10, sort="price", after="nope")
+
+
+for_each_backend(PlaceSearchTests, globals())
+
+
+if __name__ == "__main__":
+    unittest.main()
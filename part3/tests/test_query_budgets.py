@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+
+from hbnb import create_app
+from hbnb.persistence.engine import dispose_engines, get_engine
+from hbnb.persistence.query_counter import assert_max_queries, count_queries
+
+
+class AssertMaxQueriesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = get_engine("sqlite:///" + os.path.join(self.tmpdir.name, "q.db"))
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def run_queries(self, n):
+        with self.engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text(f"SELECT {i}"))
+
+    def test_counts_nested_blocks(self):
+        with count_queries() as outer:
+            self.run_queries(1)
+            with count_queries() as inner:
+                self.run_queries(2)
+        self.assertEqual((outer.count, inner.count), (3, 2))
+
+    def test_over_budget_lists_the_statements(self):
+        with self.assertRaises(AssertionError) as ctx:
+            with assert_max_queries(1):
+                self.run_queries(2)
+        self.assertIn("2 SQL statements executed, budget is 1", str(ctx.exception))
+        self.assertIn("2. SELECT 1", str(ctx.exception))
+
+
+class ObjectsQueryBudgetTest(unittest.TestCase):
+    """Statement budgets of the hot endpoints; they must not grow with data."""
+
+    STORAGE_MODE = "objects"
+    # endpoint -> statements, including the unit of work's commit
+    # create_review includes locking and re-reading the place's review stats
+    # update_place reads the place once for the owner check and the update
+    BUDGETS = {
+        "list_places": 5,
+        "get_place": 5,
+        "update_place": 6,
+        "create_review": 6,
+        "login": 1,
+    }
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///"
+                + os.path.join(self.tmpdir.name, "budget.db"),
+                "STORAGE_MODE": self.STORAGE_MODE,
+                "BCRYPT_ROUNDS": 4,
+                "PASSWORD_HASH_WORKERS": 0,
+                "ENABLE_AUTH": True,
+                "JWT_SECRET_KEY": "A" * 40,
+                "RESPONSE_CACHE_SIZE": 0,
+            }
+        )
+        self.client = self.app.test_client()
+        self.facade = self.app.extensions["hbnb_facade"]
+        self.user = self.facade.create(
+            "User", {"email": "q@example.com", "password": "pw"}
+        )
+        self.amenities = self.facade.create_many(
+            "Amenity", [{"name": str(i)} for i in range(3)]
+        )
+        self.add_places(3)
+        token = self.client.post(
+            "/api/v1/auth/login", json={"email": "q@example.com", "password": "pw"}
+        ).get_json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def add_places(self, n):
+        places = self.facade.create_many(
+            "Place",
+            [
+                {
+                    "name": f"Place {i}",
+                    "user_id": self.user["id"],
+                    "amenity_ids": [a["id"] for a in self.amenities],
+                }
+                for i in range(n)
+            ],
+        )
+        self.facade.create_many(
+            "Review",
+            [
+                {"text": "ok", "user_id": self.user["id"], "place_id": p["id"]}
+                for p in places
+            ],
+        )
+        self.place = places[0]
+
+    def test_list_places(self):
+        with assert_max_queries(self.BUDGETS["list_places"]):
+            r = self.client.get("/api/v1/places", headers=self.headers)
+        self.assertEqual(len(r.get_json()), 3)
+
+    def test_list_places_does_not_grow_with_rows(self):
+        with count_queries() as few:
+            self.client.get("/api/v1/places", headers=self.headers)
+        self.add_places(20)
+        with count_queries() as many:
+            r = self.client.get("/api/v1/places", headers=self.headers)
+        self.assertEqual(len(r.get_json()), 23)
+        self.assertEqual(many.count, few.count)
+
+    def test_get_place(self):
+        with assert_max_queries(self.BUDGETS["get_place"]):
+            r = self.client.get(
+                f"/api/v1/places/{self.place['id']}", headers=self.headers
+            )
+        self.assertEqual(r.status_code, 200)
+
+    def test_update_place(self):
+        with assert_max_queries(self.BUDGETS["update_place"]):
+            r = self.client.put(
+                f"/api/v1/places/{self.place['id']}",
+                json={"name": "Renamed"},
+                headers=self.headers,
+            )
+        self.assertEqual(r.status_code, 200)
+
+    def test_create_review(self):
+        body = {
+            "text": "great",
+            "user_id": self.user["id"],
+            "place_id": self.place["id"],
+        }
+        with assert_max_queries(self.BUDGETS["create_review"]):
+            r = self.client.post("/api/v1/reviews", json=body, headers=self.headers)
+        self.assertEqual(r.status_code, 201)
+
+    def test_login(self):
+        body = {"email": "q@example.com", "password": "pw"}
+        with assert_max_queries(self.BUDGETS["login"]):
+            r = self.client.post("/api/v1/auth/login", json=body)
+        self.assertEqual(r.status_code, 200)
+
+
+class TablesQueryBudgetTest(ObjectsQueryBudgetTest):
+    STORAGE_MODE = "tables"
+    # place reads also load the place_amenity association
+    BUDGETS = {
+        "list_places": 6,
+        "get_place": 6,
+        "update_place": 9,
+        "create_review": 7,
+        "login": 1,
+    }
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import copy
+import json
+import pickle
+import unittest
+
+from hbnb.persistence import InMemoryRepository
+from hbnb.persistence.records import FrozenList, FrozenRecord, freeze
+from hbnb.persistence.sqlalchemy_repository import SQLAlchemyRepository, Base
+
+
+class FreezeTest(unittest.TestCase):
+    def test_nested_values_are_read_only(self):
+        rec = freeze({"name": "Loft", "amenity_ids": ["a1"], "meta": {"k": 1}})
+        self.assertIsInstance(rec, FrozenRecord)
+        self.assertIsInstance(rec["amenity_ids"], FrozenList)
+        self.assertIsInstance(rec["meta"], FrozenRecord)
+        for mutate in (
+            lambda: rec.__setitem__("name", "x"),
+            lambda: rec.pop("name"),
+            lambda: rec.update(name="x"),
+            lambda: rec["amenity_ids"].append("a2"),
+            lambda: rec["meta"].setdefault("j", 2),
+        ):
+            with self.assertRaises(TypeError):
+                mutate()
+
+    def test_behaves_like_plain_containers(self):
+        src = {"name": "Loft", "amenity_ids": ["a1"]}
+        rec = freeze(src)
+        self.assertEqual(rec, src)
+        self.assertEqual(json.loads(json.dumps(rec)), src)
+        self.assertIs(freeze(rec), rec)
+        self.assertIs(copy.deepcopy(rec), rec)
+        self.assertEqual(pickle.loads(pickle.dumps(rec)), rec)
+        changed = dict(rec, name="Flat")
+        changed["amenity_ids"] = list(rec["amenity_ids"]) + ["a2"]
+        self.assertEqual(rec["name"], "Loft")
+        self.assertEqual(rec["amenity_ids"], ["a1"])
+
+
+class InMemoryRecordsTest(unittest.TestCase):
+    def test_reads_share_the_stored_record(self):
+        repo = InMemoryRepository()
+        payload = {"name": "Loft", "amenity_ids": ["a1"]}
+        created = repo.create("Place", payload)
+        payload["amenity_ids"].append("a2")
+        self.assertEqual(created["amenity_ids"], ["a1"])
+        self.assertIs(repo.get("Place", created["id"]), created)
+        self.assertIs(repo.list("Place")[0], created)
+        self.assertIs(repo.find_by("Place", name="Loft")[0], created)
+
+        updated = repo.update("Place", created["id"], {"name": "Flat"})
+        self.assertIsNot(updated, created)
+        self.assertEqual(created["name"], "Loft")
+        self.assertIs(repo.get("Place", created["id"]), updated)
+
+
+class SQLAlchemyRecordsTest(unittest.TestCase):
+    def test_returned_objects_are_read_only(self):
+        repo = SQLAlchemyRepository(database_uri="sqlite:///:memory:")
+        Base.metadata.create_all(repo._engine)
+        created = repo.create("Place", {"name": "Loft", "amenity_ids": ["a1"]})
+        for obj in (
+            created,
+            repo.get("Place", created["id"]),
+            repo.update("Place", created["id"], {"name": "Flat"}),
+        ):
+            with self.assertRaises(TypeError):
+                obj["name"] = "x"
+            with self.assertRaises(TypeError):
+                obj["amenity_ids"].append("a2")
+        self.assertEqual(repo.get("Place", created["id"])["name"], "Flat")
+
+
+if __name__ == "__main__":
+    unittest.main()
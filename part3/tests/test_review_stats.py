@@ -0,0 +1,168 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+from unittest import mock
+
+from backends import for_each_backend, make_repository
+from hbnb import create_app
+from hbnb.business.facade import HBNBFacade
+from hbnb.business.review_stats import STATS_CLASS, ReviewStats, summary
+from hbnb.persistence import InMemoryRepository
+
+
+class ReviewStatsTests:
+    def setUp(self):
+        self.repo = make_repository(self.backend, self)
+        self.facade = HBNBFacade(self.repo)
+        self.place = self.facade.create("Place", {"name": "Loft"})
+
+    def stats(self):
+        return summary(self.facade.review_stats([self.place["id"]])[self.place["id"]])
+
+    def add_review(self, text="Nice"):
+        return self.facade.create(
+            "Review", {"place_id": self.place["id"], "user_id": "u1", "text": text}
+        )
+
+    def test_counts_follow_review_writes(self):
+        self.assertEqual(self.stats()["review_count"], 0)
+        first = self.add_review()
+        second = self.add_review()
+        stats = self.stats()
+        self.assertEqual(stats["review_count"], 2)
+        self.assertEqual(stats["last_review_at"], second["created_at"])
+        self.assertIsNone(stats["rating_avg"])
+
+        self.facade.update("Review", first["id"], {"text": "Changed"})
+        self.assertEqual(self.stats()["review_count"], 2)
+
+        self.facade.delete("Review", second["id"])
+        stats = self.stats()
+        self.assertEqual(stats["review_count"], 1)
+        self.assertEqual(stats["last_review_at"], first["created_at"])
+        self.facade.delete("Review", first["id"])
+        self.assertEqual(self.stats()["review_count"], 0)
+
+    def test_listing_reads_one_record_per_place(self):
+        self.add_review()
+        with mock.patch.object(self.repo, "find_in", wraps=self.repo.find_in) as find:
+            self.facade.review_stats([self.place["id"]])
+        self.assertEqual([c.args[0] for c in find.call_args_list], [STATS_CLASS])
+
+    def test_missing_records_are_computed_and_rebuilt(self):
+        self.repo.create("Review", {"place_id": self.place["id"], "rating": 4})
+        self.repo.create("Review", {"place_id": self.place["id"], "rating": 5})
+        for stored in self.repo.find_by(STATS_CLASS, place_id=self.place["id"]):
+            self.repo.delete(STATS_CLASS, stored["id"])
+        self.assertEqual(self.stats()["review_count"], 2)
+        self.assertEqual(self.stats()["rating_avg"], 4.5)
+        self.assertEqual(self.facade.rebuild_review_stats(), 1)
+        self.assertEqual(len(self.repo.find_by(STATS_CLASS)), 1)
+        self.assertEqual(self.stats()["review_count"], 2)
+
+    def test_place_delete_drops_its_record(self):
+        self.facade.delete("Place", self.place["id"])
+        self.assertEqual(self.repo.find_by(STATS_CLASS), [])
+
+    def test_list_all_hides_the_records(self):
+        self.add_review()
+        listed = self.facade.list_all()
+        self.assertIn("Review", listed)
+        self.assertNotIn(STATS_CLASS, listed)
+
+
+# the typed reviews table has no rating column to average
+for_each_backend(ReviewStatsTests, globals(), backends=("memory", "objects"))
+
+
+class ConcurrentReviewWritesTests:
+    WRITERS = 8
+    PER_WRITER = 10
+
+    def setUp(self):
+        self.repo = make_repository(self.backend, self)
+        self.facade = HBNBFacade(self.repo)
+        self.place = self.facade.create("Place", {"name": "Loft"})
+        # switch threads as often as possible to interleave the writers
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+    def run_writers(self, write):
+        with ThreadPoolExecutor(self.WRITERS) as pool:
+            list(pool.map(write, range(self.WRITERS * self.PER_WRITER)))
+
+    def stats(self):
+        place_id = self.place["id"]
+        return summary(self.facade.review_stats([place_id])[place_id])
+
+    def test_no_update_is_lost(self):
+        created = []
+
+        def add(i):
+            created.append(
+                self.facade.create(
+                    "Review", {"place_id": self.place["id"], "text": str(i)}
+                )
+            )
+
+        self.run_writers(add)
+        self.assertEqual(self.stats()["review_count"], self.WRITERS * self.PER_WRITER)
+
+        self.run_writers(lambda i: self.facade.delete("Review", created[i]["id"]))
+        self.assertEqual(self.stats()["review_count"], 0)
+
+
+for_each_backend(ConcurrentReviewWritesTests, globals())
+
+
+class ReviewRatingsTest(unittest.TestCase):
+    def test_ratings_are_averaged_incrementally(self):
+        repo = InMemoryRepository()
+        stats = ReviewStats(repo)
+        stats.place_created({"id": "p1"})
+        reviews = []
+        for rating in (5, 3, None):
+            review = repo.create("Review", {"place_id": "p1", "rating": rating})
+            stats.review_added(review)
+            reviews.append(review)
+        self.assertEqual(summary(stats.for_places(["p1"])["p1"])["rating_avg"], 4.0)
+        changed = repo.update("Review", reviews[1]["id"], {"rating": 4})
+        stats.review_changed(reviews[1], changed)
+        self.assertEqual(summary(stats.for_places(["p1"])["p1"])["rating_avg"], 4.5)
+        repo.delete("Review", reviews[0]["id"])
+        stats.review_removed(reviews[0])
+        result = summary(stats.for_places(["p1"])["p1"])
+        self.assertEqual(result["review_count"], 2)
+        self.assertEqual(result["rating_avg"], 4.0)
+
+
+class ReviewStatsApiTest(unittest.TestCase):
+    def test_place_payloads_carry_the_aggregates(self):
+        app = create_app({"TESTING": True})
+        client = app.test_client()
+        user = client.post(
+            "/api/v1/users", json={"email": "r@example.com", "password": "pw"}
+        ).get_json()
+        place = client.post(
+            "/api/v1/places", json={"name": "Loft", "user_id": user["id"]}
+        ).get_json()
+        client.post(
+            "/api/v1/reviews",
+            json={"place_id": place["id"], "user_id": user["id"], "text": "Hi"},
+        )
+        body = client.get(f"/api/v1/places/{place['id']}").get_json()
+        self.assertEqual(body["review_count"], 1)
+        self.assertIsNone(body["rating_avg"])
+
+        facade = app.extensions["hbnb_facade"]
+        with mock.patch.object(facade, "find_in", wraps=facade.find_in) as find:
+            listed = client.get("/api/v1/places?fields=name,review_count").get_json()
+        self.assertEqual(
+            listed, [{"id": place["id"], "name": "Loft", "review_count": 1}]
+        )
+        find.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
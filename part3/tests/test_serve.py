@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import serve
+from hbnb.persistence.engine import dispose_engines, get_engine, pool_status
+
+
+class ServerOptionsTest(unittest.TestCase):
+    def test_defaults_use_every_cpu(self):
+        options = serve.server_options(serve._parse_args([]))
+        self.assertEqual(options["workers"], os.cpu_count() or 1)
+        self.assertEqual(options["worker_class"], "sync")
+        self.assertFalse(options["preload_app"])
+        self.assertIs(options["post_fork"], serve.post_fork)
+
+    def test_threads_switch_to_threaded_workers(self):
+        args = serve._parse_args(["-w", "3", "--threads", "8", "--preload"])
+        options = serve.server_options(args)
+        self.assertEqual(
+            (options["workers"], options["threads"], options["worker_class"]),
+            (3, 8, "gthread"),
+        )
+        self.assertTrue(options["preload_app"])
+
+
+class PostForkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = "sqlite:///" + os.path.join(self.tmpdir.name, "hbnb.db")
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def test_engines_stay_registered_with_a_new_pool(self):
+        engine = get_engine(self.uri)
+        with engine.connect():
+            pass
+        pool = engine.pool
+        serve.post_fork(None, None)
+        self.assertIsNot(engine.pool, pool)
+        self.assertIs(get_engine(self.uri), engine)
+        self.assertEqual(len(pool_status()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
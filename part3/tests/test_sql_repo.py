@@ -1,5 +1,8 @@
 import unittest
 
+from sqlalchemy import event
+
+from hbnb.business.facade import HBNBFacade
 from hbnb.persistence.sqlalchemy_repository import SQLAlchemyRepository, Base
 
 
@@ -54,6 +57,65 @@ class SQLAlchemyRepositoryIntegrationTest(unittest.TestCase):
         self.assertEqual(self.repo.count("A"), 0)
         self.assertEqual(self.repo.count("B"), 0)
 
+    def test_bulk_lookups(self):
+        a = self.repo.create("Review", {"place_id": "p1", "text": "a"})
+        b = self.repo.create("Review", {"place_id": "p2", "text": "b"})
+        self.repo.create("Review", {"place_id": "p3", "text": "c"})
+        self.repo.create("Other", {"place_id": "p1"})
+
+        got = self.repo.get_many("Review", [a["id"], b["id"], "missing"])
+        self.assertEqual({g["id"] for g in got}, {a["id"], b["id"]})
+
+        found = self.repo.find_in("Review", "place_id", ["p1", "p2"])
+        self.assertEqual({f["id"] for f in found}, {a["id"], b["id"]})
+        self.assertEqual(self.repo.find_in("Review", "place_id", []), [])
+
+    def test_count_with_criteria_runs_in_sql(self):
+        for place_id, rating in (("p1", 5), ("p1", 3), ("p2", 5)):
+            self.repo.create("Review", {"place_id": place_id, "rating": rating})
+        statements = []
+
+        @event.listens_for(self.repo._engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        self.assertEqual(self.repo.count("Review"), 3)
+        self.assertEqual(self.repo.count("Review", place_id="p1"), 2)
+        self.assertEqual(self.repo.count("Review", place_id="p1", rating=5), 1)
+        self.assertEqual(self.repo.count("Review", place_id="nope"), 0)
+        self.assertEqual(len(statements), 4)
+        self.assertTrue(all("count(" in s.lower() for s in statements))
+
+    def test_keyset_pagination(self):
+        ids = sorted(self.repo.create("Item", {"n": i})["id"] for i in range(5))
+        self.repo.create("Other", {})
+        page = self.repo.list("Item", limit=2)
+        self.assertEqual([p["id"] for p in page], ids[:2])
+        page = self.repo.list("Item", limit=2, after=ids[1])
+        self.assertEqual([p["id"] for p in page], ids[2:4])
+        self.assertEqual(
+            [p["id"] for p in self.repo.list("Item", after=ids[3])], ids[4:]
+        )
+
+    def test_email_lookup_uses_expression_index(self):
+        u = self.repo.create("User", {"email": "a@example.com", "password": "x"})
+        self.repo.create("User", {"email": "b@example.com", "password": "x"})
+        statements = []
+
+        @event.listens_for(self.repo._engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, params, context, executemany):
+            statements.append((statement, params))
+
+        facade = HBNBFacade(self.repo)
+        self.assertEqual(facade.get_user_by_email("a@example.com")["id"], u["id"])
+        self.assertIsNone(facade.get_user_by_email("missing@example.com"))
+
+        statement, params = statements[0]
+        with self.repo._engine.connect() as conn:
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params)
+            details = " ".join(row[-1] for row in plan)
+        self.assertIn("ix_objects_email", details)
+
 
 if __name__ == "__main__":
     unittest.main()
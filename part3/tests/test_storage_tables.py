@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+
+from hbnb import create_app
+from hbnb.business.facade import HBNBFacade
+from hbnb.persistence.engine import dispose_engines
+from hbnb.persistence.object_migration import migrate_objects_to_tables
+from hbnb.persistence.sqlalchemy_repository import (
+    SQLAlchemyRepository,
+    create_object_store_schema,
+)
+
+
+class TablesStorageModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = "sqlite:///" + os.path.join(self.tmpdir.name, "hbnb.db")
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmpdir.cleanup()
+
+    def post_json(self, client, path, payload):
+        return client.post(
+            path, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_api_round_trip_on_typed_tables(self):
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": self.uri, "STORAGE_MODE": "tables"}
+        )
+        client = app.test_client()
+        uid = self.post_json(
+            client, "/api/v1/users", {"email": "t@example.com", "password": "pw"}
+        ).get_json()["id"]
+        aid = self.post_json(client, "/api/v1/amenities", {"name": "Wifi"}).get_json()[
+            "id"
+        ]
+        r = self.post_json(
+            client,
+            "/api/v1/places",
+            {
+                "name": "Typed",
+                "user_id": uid,
+                "country": "Chile",
+                "amenity_ids": [aid],
+                "image": "images/place_cabin.jpg",
+            },
+        )
+        self.assertEqual(r.status_code, 201)
+        pid = r.get_json()["id"]
+        r = self.post_json(
+            client, "/api/v1/reviews", {"user_id": uid, "place_id": pid, "text": "ok"}
+        )
+        self.assertEqual(r.status_code, 201)
+
+        place = client.get(f"/api/v1/places/{pid}").get_json()
+        self.assertEqual(place["country"], "Chile")
+        self.assertEqual(place["image"], "images/place_cabin.jpg")
+        self.assertEqual([a["id"] for a in place["amenities"]], [aid])
+        self.assertEqual(place["owner"]["id"], uid)
+        self.assertEqual(len(place["reviews"]), 1)
+
+        r = client.put(
+            f"/api/v1/places/{pid}",
+            data=json.dumps({"amenity_ids": []}),
+            content_type="application/json",
+        )
+        self.assertEqual(r.get_json()["amenity_ids"], [])
+
+    def test_migrate_objects_to_tables(self):
+        engine = create_engine(self.uri, future=True)
+        legacy = SQLAlchemyRepository(self.uri)
+        create_object_store_schema(legacy._engine)
+        user = legacy.create("User", {"email": "m@example.com", "password": "h"})
+        amenity = legacy.create("Amenity", {"name": "Pool"})
+        place = legacy.create(
+            "Place",
+            {"name": "Old", "user_id": user["id"], "amenity_ids": [amenity["id"]]},
+        )
+        legacy.create("Review", {"user_id": user["id"], "place_id": place["id"]})
+        legacy.create("Review", {"user_id": user["id"], "place_id": "gone"})
+
+        report = migrate_objects_to_tables(engine, delete_source=True)
+        self.assertEqual(report["Place"]["migrated"], 1)
+        self.assertEqual(report["Review"]["migrated"], 1)
+        self.assertEqual(report["Review"]["skipped_invalid"], 1)
+        # only the invalid review is left behind
+        self.assertEqual(len(legacy.list_all().get("Review", [])), 1)
+        self.assertEqual(legacy.count("Place"), 0)
+
+        # running it again is a no-op
+        report = migrate_objects_to_tables(engine)
+        self.assertEqual(report["Place"]["migrated"], 0)
+        self.assertEqual(report["Place"]["skipped_existing"], 0)
+
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": self.uri, "STORAGE_MODE": "tables"}
+        )
+        facade: HBNBFacade = app.extensions["hbnb_facade"]
+        migrated = facade.get("Place", place["id"])
+        self.assertEqual(migrated["amenity_ids"], [amenity["id"]])
+        self.assertEqual(facade.get_user_by_email("m@example.com")["id"], user["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
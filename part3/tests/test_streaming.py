@@ -0,0 +1,85 @@
+import json
+import unittest
+from unittest import mock
+
+from hbnb import create_app
+from hbnb.persistence import InMemoryRepository
+from hbnb.persistence.sqlalchemy_repository import Base, SQLAlchemyRepository
+
+
+class RepositoryStreamTest(unittest.TestCase):
+    def check(self, repo):
+        for i in range(7):
+            repo.create("Amenity", {"name": str(i)})
+        streamed = list(repo.stream("Amenity", batch_size=3))
+        expected = sorted(repo.list("Amenity"), key=lambda o: o["id"])
+        self.assertEqual(streamed, expected)
+
+    def test_in_memory(self):
+        self.check(InMemoryRepository())
+
+    def test_sql(self):
+        repo = SQLAlchemyRepository(database_uri="sqlite:///:memory:")
+        Base.metadata.create_all(repo._engine)
+        self.check(repo)
+
+
+class StreamedListTest(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({"TESTING": True, "STREAM_BATCH_SIZE": 2})
+        self.client = self.app.test_client()
+        self.facade = self.app.extensions["hbnb_facade"]
+        user = self.client.post(
+            "/api/v1/users", json={"email": "s@example.com", "password": "pw"}
+        ).get_json()
+        self.user_id = user["id"]
+        for i in range(5):
+            self.client.post(
+                "/api/v1/places", json={"name": f"P{i}", "user_id": self.user_id}
+            )
+
+    def test_json_array_matches_the_plain_list(self):
+        plain = self.client.get("/api/v1/places").get_json()
+        r = self.client.get("/api/v1/places?stream=json")
+        self.assertTrue(r.is_streamed)
+        self.assertEqual(r.mimetype, "application/json")
+        streamed = json.loads(r.get_data())
+        key = lambda p: p["id"]  # noqa: E731
+        self.assertEqual(sorted(streamed, key=key), sorted(plain, key=key))
+        self.assertEqual(streamed[0]["owner"]["email"], "s@example.com")
+
+    def test_ndjson_with_fields(self):
+        r = self.client.get(
+            "/api/v1/users?fields=email",
+            headers={"Accept": "application/x-ndjson"},
+        )
+        self.assertEqual(r.mimetype, "application/x-ndjson")
+        lines = r.get_data(as_text=True).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"id": self.user_id, "email": "s@example.com"}],
+        )
+
+    def test_first_batch_is_sent_before_the_rows_run_out(self):
+        fetched = []
+
+        def rows(cls_name, batch_size):
+            for obj in self.facade.list(cls_name):
+                fetched.append(obj["id"])
+                yield obj
+
+        with mock.patch.object(self.facade, "stream", side_effect=rows):
+            r = self.client.get("/api/v1/places?stream=ndjson", buffered=False)
+            chunks = iter(r.response)
+            first = next(chunks)
+            self.assertEqual(len(first.splitlines()), 2)
+            self.assertLess(len(fetched), 5)
+            r.close()
+
+    def test_stream_rejects_pagination(self):
+        r = self.client.get("/api/v1/places?stream=json&limit=2")
+        self.assertEqual(r.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -133,18 +133,50 @@ async function setupIndexPage(placesList, token) {
 
     const countryFilter = document.getElementById('country-filter');
     const feedback = document.getElementById('places-feedback');
+    const loadMoreButton = document.getElementById('load-more-places');
+
+    // one page at a time; the cursor of the current listing loads the next
+    let filters = {};
+    let cursor = null;
+
+    async function showPlaces(after) {
+        const page = await fetchPlacesPage(token, filters, after);
+        cursor = page.cursor;
+        renderPlaces(placesList, page.places, Boolean(after));
+        populateCountryFilter(countryFilter, page.places);
+        filterPlaces(placesList, countryFilter ? countryFilter.value : 'all', feedback);
+        if (loadMoreButton) {
+            loadMoreButton.hidden = !cursor;
+        }
+    }
 
     if (countryFilter) {
-        countryFilter.addEventListener('change', () => {
-            filterPlaces(placesList, countryFilter.value, feedback);
+        countryFilter.addEventListener('change', async () => {
+            const country = countryFilter.value;
+            filters = normalizeCountry(country) === 'all' ? {} : { country };
+            try {
+                await showPlaces(null);
+            } catch (error) {
+                showFormFeedback(feedback, error.message || 'Unable to load places right now.', 'error');
+            }
+        });
+    }
+
+    if (loadMoreButton) {
+        loadMoreButton.addEventListener('click', async () => {
+            setButtonSubmitting(loadMoreButton, true, 'Loading...');
+            try {
+                await showPlaces(cursor);
+            } catch (error) {
+                showFormFeedback(feedback, error.message || 'Unable to load more places right now.', 'error');
+            } finally {
+                setButtonSubmitting(loadMoreButton, false, 'Load more stays');
+            }
         });
     }
 
     try {
-        const places = await fetchPlaces(token);
-        renderPlaces(placesList, places);
-        populateCountryFilter(countryFilter, places);
-        filterPlaces(placesList, countryFilter ? countryFilter.value : 'all', feedback);
+        await showPlaces(null);
     } catch (error) {
         placesList.innerHTML = '';
         showFormFeedback(feedback, error.message || 'Unable to load places right now.', 'error');
@@ -170,7 +202,7 @@ async function setupPlacePage(token) {
 
     if (!placeId) {
         try {
-            const places = await fetchPlaces(token);
+            const { places } = await fetchPlacesPage(token, {}, null, 'id', 1);
             if (places.length) {
                 placeId = places[0].id;
                 window.location.replace(buildPageUrl('place.html', { id: placeId }));
@@ -220,7 +252,7 @@ async function setupReviewPage(reviewForm, token) {
     }
 
     try {
-        const places = await fetchPlaces(token);
+        const places = await fetchAllPlaces(token, 'id,name');
         if (!places.length) {
             throw new Error('No places are available to review yet.');
         }
@@ -282,9 +314,29 @@ async function setupReviewPage(reviewForm, token) {
     });
 }
 
-async function fetchPlaces(token) {
+// the fields the listing cards render; the reviews themselves are not requested
+const PLACE_LIST_FIELDS = 'id,name,description,price_by_night,image,country,owner,amenities,review_count';
+const PLACE_PAGE_SIZE = 20;
+
+// One page of places and the cursor of the next one (null on the last page).
+// Without filters the plain listing is used, so its ETag can be revalidated.
+async function fetchPlacesPage(token, filters, after, fields = PLACE_LIST_FIELDS, limit = PLACE_PAGE_SIZE) {
+    const params = new URLSearchParams();
+    Object.entries(filters || {}).forEach(([key, value]) => {
+        if (value !== undefined && value !== null && value !== '') {
+            params.set(key, value);
+        }
+    });
+    const path = params.toString() ? 'places/search' : 'places';
+    params.set('limit', String(limit));
+    params.set('fields', fields);
+    if (after) {
+        params.set('after', after);
+    }
+
     const headers = buildAuthHeaders(token);
-    const response = await fetch(`${getApiBaseUrl()}/places`, { headers });
+    // revalidate with the stored ETag; unchanged places come back as 304
+    const response = await fetch(`${getApiBaseUrl()}/${path}?${params.toString()}`, { headers, cache: 'no-cache' });
     const data = await parseResponse(response);
 
     if (!response.ok) {
@@ -296,12 +348,27 @@ async function fetchPlaces(token) {
         throw new Error('Unexpected places response from the API.');
     }
 
-    return data;
+    return { places: data, cursor: response.headers.get('X-Next-Cursor') };
+}
+
+// Every place, page by page, with only `fields`.
+async function fetchAllPlaces(token, fields) {
+    const places = [];
+    let cursor = null;
+    do {
+        const page = await fetchPlacesPage(token, {}, cursor, fields, 100);
+        places.push(...page.places);
+        cursor = page.cursor;
+    } while (cursor);
+    return places;
 }
 
 async function fetchPlaceDetails(token, placeId) {
     const headers = buildAuthHeaders(token);
-    const response = await fetch(`${getApiBaseUrl()}/places/${encodeURIComponent(placeId)}`, { headers });
+    const response = await fetch(`${getApiBaseUrl()}/places/${encodeURIComponent(placeId)}`, {
+        headers,
+        cache: 'no-cache',
+    });
     const data = await parseResponse(response);
 
     if (!response.ok) {
@@ -348,8 +415,10 @@ function buildAuthHeaders(token) {
     return headers;
 }
 
-function renderPlaces(placesList, places) {
-    placesList.innerHTML = '';
+function renderPlaces(placesList, places, append = false) {
+    if (!append) {
+        placesList.innerHTML = '';
+    }
 
     if (!places.length) {
         return;
@@ -362,6 +431,7 @@ function renderPlaces(placesList, places) {
         const ownerEmail = place.owner && place.owner.email ? place.owner.email : 'Unknown host';
         const description = place.description || 'A full description has not been added for this stay yet.';
         const image = place.image || '';
+        const reviewCount = Number(place.review_count) || 0;
 
         card.className = 'place-card';
         card.dataset.country = normalizeCountry(country);
@@ -377,6 +447,7 @@ function renderPlaces(placesList, places) {
                     <span>Host: ${escapeHtml(ownerEmail)}</span>
                     <span>Country: ${escapeHtml(country)}</span>
                     <span>${Array.isArray(place.amenities) ? place.amenities.length : 0} amenities</span>
+                    <span>${reviewCount} review${reviewCount === 1 ? '' : 's'}</span>
                 </div>
                 <p>${escapeHtml(description)}</p>
                 <div class="card-actions">
@@ -512,14 +583,20 @@ function populateCountryFilter(countryFilter, places) {
         return;
     }
 
+    // countries of the pages loaded so far; the selection is kept
+    const selected = countryFilter.value || 'all';
+    const known = Array.from(countryFilter.options)
+        .map((option) => option.value)
+        .filter((value) => value !== 'all');
     const countries = Array.from(
         new Set(
-            places
-                .map((place) => getPlaceCountry(place))
-                .filter((country) => country && country !== 'Unknown')
-                .sort((left, right) => left.localeCompare(right))
+            known.concat(
+                places
+                    .map((place) => getPlaceCountry(place))
+                    .filter((country) => country && country !== 'Unknown')
+            )
         )
-    );
+    ).sort((left, right) => left.localeCompare(right));
 
     countryFilter.innerHTML = '<option value="all">All</option>';
 
@@ -529,6 +606,8 @@ function populateCountryFilter(countryFilter, places) {
         option.textContent = country;
         countryFilter.appendChild(option);
     });
+
+    countryFilter.value = selected;
 }
 
 function getMediaClass(index) {